@@ -1,36 +1,225 @@
 from __future__ import annotations
 
+import json
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, validator
 
 
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class DecodePreset(BaseModel):
+    """A named speed/quality trade-off that requests select with ``preset``."""
+
+    beam_size: int = Field(default=5, ge=1)
+    best_of: int = Field(default=5, ge=1)
+    temperatures: List[float] = Field(default_factory=lambda: [0.0, 0.2, 0.4, 0.6, 0.8, 1.0])
+    condition_on_previous_text: bool = Field(default=True)
+    vad_filter: bool = Field(default=False)
+    compute_type: Optional[str] = Field(default=None)
+
+
+def _default_presets() -> Dict[str, DecodePreset]:
+    return {
+        # Greedy, no fallback or cross-window conditioning, silence skipped by VAD.
+        "fast": DecodePreset(
+            beam_size=1, best_of=1, temperatures=[0.0], condition_on_previous_text=False, vad_filter=True
+        ),
+        # Faster-Whisper's defaults; what every job used before presets existed.
+        "balanced": DecodePreset(),
+        "accurate": DecodePreset(beam_size=10, best_of=10),
+    }
+
+
+def _parse_presets(value: str) -> Dict[str, DecodePreset]:
+    presets = _default_presets()
+    if value:
+        presets.update({name: DecodePreset(**spec) for name, spec in json.loads(value).items()})
+    return presets
+
+
 class Settings(BaseModel):
     """Application configuration sourced from environment variables."""
 
     api_prefix: str = Field(default="/api")
     upload_dir: str = Field(default="tmp/uploads")
     output_dir: str = Field(default="tmp/transcripts")
+    output_max_mb: int = Field(default=0, ge=0)
+    storage_backend: Literal["local", "s3"] = Field(default="local")
+    s3_bucket: str = Field(default="")
+    s3_prefix: str = Field(default="")
+    s3_endpoint_url: str = Field(default="")
+    s3_region: str = Field(default="")
     max_upload_mb: int = Field(default=200, ge=1)
+    ingest_decode_pcm: bool = Field(default=False)
+    decode_workers: int = Field(default=1, ge=0)
     allowed_origins: List[str] = Field(default_factory=lambda: ["*"])
     model_size: str = Field(default="medium")
+    model_language: Optional[str] = Field(default=None)
+    allowed_models: List[str] = Field(
+        default_factory=lambda: ["tiny", "base", "small", "medium", "medium.en", "large-v2", "large-v3"]
+    )
+    allowed_compute_types: List[str] = Field(
+        default_factory=lambda: ["int8", "int8_float16", "int8_float32", "float16", "float32"]
+    )
+    max_loaded_models: int = Field(default=2, ge=1)
+    model_memory_budget_mb: int = Field(default=0, ge=0)
+    warmup_models: List[str] = Field(default_factory=list)
+    inference_workers: int = Field(default=1, ge=1)
+    max_queue_size: int = Field(default=32, ge=1)
+    batch_max_size: int = Field(default=1, ge=1)
+    batch_max_wait_ms: int = Field(default=50, ge=0)
+    batch_max_clip_seconds: float = Field(default=30.0, gt=0, le=30.0)
+    long_audio_workers: int = Field(default=0, ge=0)
+    long_audio_chunk_seconds: float = Field(default=600.0, gt=0)
+    job_store_backend: Literal["memory", "sqlite"] = Field(default="memory")
+    job_store_path: str = Field(default="tmp/jobs.db")
+    job_retention_hours: float = Field(default=24.0, gt=0)
+    retention_sweep_seconds: float = Field(default=300.0, gt=0)
+    broker_backend: Literal["none", "sqlite", "redis"] = Field(default="none")
+    broker_url: str = Field(default="")
+    worker_heartbeat_seconds: float = Field(default=10.0, gt=0)
+    worker_stale_seconds: float = Field(default=60.0, gt=0)
+    worker_max_attempts: int = Field(default=3, ge=1)
+    worker_metrics_port: int = Field(default=0, ge=0)
+    cache_dir: str = Field(default="tmp/cache")
+    cache_enabled: bool = Field(default=True)
+    cache_max_mb: int = Field(default=1024, ge=1)
+    cache_max_age_hours: float = Field(default=168.0, gt=0)
+    precompress_outputs: bool = Field(default=True)
+    precompress_min_bytes: int = Field(default=1024, ge=0)
+    search_enabled: bool = Field(default=True)
+    search_index_path: str = Field(default="tmp/search.db")
+    decode_presets: Dict[str, DecodePreset] = Field(default_factory=_default_presets)
+    default_preset: str = Field(default="balanced")
+    client_id_header: str = Field(default="X-API-Key")
+    client_priorities: Dict[str, str] = Field(default_factory=dict)
+    client_weights: Dict[str, float] = Field(default_factory=dict)
+    client_max_concurrent: int = Field(default=0, ge=0)
+    client_quota_audio_minutes: float = Field(default=0.0, ge=0)
+    client_quota_window_hours: float = Field(default=24.0, gt=0)
+    live_max_sessions: int = Field(default=2, ge=0)
+    live_window_seconds: float = Field(default=15.0, gt=0, le=30.0)
+    live_step_ms: int = Field(default=1000, ge=100)
+    live_flush_silence_ms: int = Field(default=600, ge=0)
+    live_vad_threshold: float = Field(default=0.01, ge=0)
+    live_max_session_minutes: float = Field(default=60.0, gt=0)
+    status_max_wait_seconds: float = Field(default=60.0, ge=0)
+    webhook_max_attempts: int = Field(default=5, ge=1)
+    webhook_backoff_seconds: float = Field(default=2.0, gt=0)
+    webhook_timeout_seconds: float = Field(default=10.0, gt=0)
+    webhook_secret: str = Field(default="")
+    webhook_workers: int = Field(default=4, ge=1)
+    webhook_allowed_hosts: List[str] = Field(default_factory=list)
 
-    @validator("upload_dir", "output_dir", pre=True)
+    @validator("upload_dir", "output_dir", "cache_dir", "job_store_path", "search_index_path", pre=True)
     def _normalize_dir(cls, value: str) -> str:
         return value.replace("\\", "/") if value else value
 
+    @validator("s3_bucket", always=True)
+    def _bucket_for_s3(cls, value: str, values: Dict[str, object]) -> str:
+        if values.get("storage_backend") == "s3" and not value:
+            raise ValueError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return value
+
+    @validator("default_preset")
+    def _known_preset(cls, value: str, values: Dict[str, object]) -> str:
+        presets = values.get("decode_presets") or {}
+        if value not in presets:
+            raise ValueError(f"default_preset {value!r} is not one of {sorted(presets)}")
+        return value
+
+    @validator("client_priorities")
+    def _known_priorities(cls, value: Dict[str, str]) -> Dict[str, str]:
+        unknown = sorted(set(value.values()) - {"high", "normal", "low"})
+        if unknown:
+            raise ValueError(f"Unknown priority classes {unknown}")
+        return value
+
+    @validator("client_weights")
+    def _positive_weights(cls, value: Dict[str, float]) -> Dict[str, float]:
+        if any(weight <= 0 for weight in value.values()):
+            raise ValueError("Client weights must be positive")
+        return value
+
     @classmethod
     def from_env(cls) -> "Settings":
         return cls(
             api_prefix=os.getenv("API_PREFIX", "/api"),
             upload_dir=os.getenv("UPLOAD_DIR", "tmp/uploads"),
             output_dir=os.getenv("OUTPUT_DIR", "tmp/transcripts"),
+            output_max_mb=int(os.getenv("OUTPUT_MAX_MB", "0")),
+            storage_backend=os.getenv("STORAGE_BACKEND", "local"),
+            s3_bucket=os.getenv("S3_BUCKET", ""),
+            s3_prefix=os.getenv("S3_PREFIX", ""),
+            s3_endpoint_url=os.getenv("S3_ENDPOINT_URL", ""),
+            s3_region=os.getenv("S3_REGION", ""),
             max_upload_mb=int(os.getenv("MAX_UPLOAD_MB", "200")),
-            allowed_origins=[origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",")],
+            ingest_decode_pcm=os.getenv("INGEST_DECODE_PCM", "false").lower() in ("1", "true", "yes"),
+            decode_workers=int(os.getenv("DECODE_WORKERS", "1")),
+            allowed_origins=_split_list(os.getenv("ALLOWED_ORIGINS", "*")),
             model_size=os.getenv("MODEL_SIZE", "medium"),
+            model_language=os.getenv("MODEL_LANGUAGE", "").strip().lower() or None,
+            allowed_models=_split_list(
+                os.getenv("ALLOWED_MODELS", "tiny,base,small,medium,medium.en,large-v2,large-v3")
+            ),
+            allowed_compute_types=_split_list(
+                os.getenv("ALLOWED_COMPUTE_TYPES", "int8,int8_float16,int8_float32,float16,float32")
+            ),
+            max_loaded_models=int(os.getenv("MAX_LOADED_MODELS", "2")),
+            model_memory_budget_mb=int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0")),
+            warmup_models=_split_list(os.getenv("WARMUP_MODELS", os.getenv("MODEL_SIZE", "medium"))),
+            inference_workers=int(os.getenv("INFERENCE_WORKERS", "1")),
+            max_queue_size=int(os.getenv("MAX_QUEUE_SIZE", "32")),
+            batch_max_size=int(os.getenv("BATCH_MAX_SIZE", "1")),
+            batch_max_wait_ms=int(os.getenv("BATCH_MAX_WAIT_MS", "50")),
+            batch_max_clip_seconds=float(os.getenv("BATCH_MAX_CLIP_SECONDS", "30")),
+            long_audio_workers=int(os.getenv("LONG_AUDIO_WORKERS", "0")),
+            long_audio_chunk_seconds=float(os.getenv("LONG_AUDIO_CHUNK_SECONDS", "600")),
+            job_store_backend=os.getenv("JOB_STORE_BACKEND", "memory"),
+            job_store_path=os.getenv("JOB_STORE_PATH", "tmp/jobs.db"),
+            job_retention_hours=float(os.getenv("JOB_RETENTION_HOURS", "24")),
+            retention_sweep_seconds=float(os.getenv("RETENTION_SWEEP_SECONDS", "300")),
+            broker_backend=os.getenv("BROKER_BACKEND", "none"),
+            broker_url=os.getenv("BROKER_URL", ""),
+            worker_heartbeat_seconds=float(os.getenv("WORKER_HEARTBEAT_SECONDS", "10")),
+            worker_stale_seconds=float(os.getenv("WORKER_STALE_SECONDS", "60")),
+            worker_max_attempts=int(os.getenv("WORKER_MAX_ATTEMPTS", "3")),
+            worker_metrics_port=int(os.getenv("WORKER_METRICS_PORT", "0")),
+            cache_dir=os.getenv("CACHE_DIR", "tmp/cache"),
+            cache_enabled=os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+            cache_max_mb=int(os.getenv("CACHE_MAX_MB", "1024")),
+            cache_max_age_hours=float(os.getenv("CACHE_MAX_AGE_HOURS", "168")),
+            precompress_outputs=os.getenv("PRECOMPRESS_OUTPUTS", "true").lower() in ("1", "true", "yes"),
+            precompress_min_bytes=int(os.getenv("PRECOMPRESS_MIN_BYTES", "1024")),
+            search_enabled=os.getenv("SEARCH_ENABLED", "true").lower() in ("1", "true", "yes"),
+            search_index_path=os.getenv("SEARCH_INDEX_PATH", "tmp/search.db"),
+            decode_presets=_parse_presets(os.getenv("DECODE_PRESETS", "")),
+            default_preset=os.getenv("DEFAULT_PRESET", "balanced"),
+            client_id_header=os.getenv("CLIENT_ID_HEADER", "X-API-Key"),
+            client_priorities=json.loads(os.getenv("CLIENT_PRIORITIES", "{}")),
+            client_weights=json.loads(os.getenv("CLIENT_WEIGHTS", "{}")),
+            client_max_concurrent=int(os.getenv("CLIENT_MAX_CONCURRENT", "0")),
+            client_quota_audio_minutes=float(os.getenv("CLIENT_QUOTA_AUDIO_MINUTES", "0")),
+            client_quota_window_hours=float(os.getenv("CLIENT_QUOTA_WINDOW_HOURS", "24")),
+            live_max_sessions=int(os.getenv("LIVE_MAX_SESSIONS", "2")),
+            live_window_seconds=float(os.getenv("LIVE_WINDOW_SECONDS", "15")),
+            live_step_ms=int(os.getenv("LIVE_STEP_MS", "1000")),
+            live_flush_silence_ms=int(os.getenv("LIVE_FLUSH_SILENCE_MS", "600")),
+            live_vad_threshold=float(os.getenv("LIVE_VAD_THRESHOLD", "0.01")),
+            live_max_session_minutes=float(os.getenv("LIVE_MAX_SESSION_MINUTES", "60")),
+            status_max_wait_seconds=float(os.getenv("STATUS_MAX_WAIT_SECONDS", "60")),
+            webhook_max_attempts=int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5")),
+            webhook_backoff_seconds=float(os.getenv("WEBHOOK_BACKOFF_SECONDS", "2")),
+            webhook_timeout_seconds=float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10")),
+            webhook_secret=os.getenv("WEBHOOK_SECRET", ""),
+            webhook_workers=int(os.getenv("WEBHOOK_WORKERS", "4")),
+            webhook_allowed_hosts=_split_list(os.getenv("WEBHOOK_ALLOWED_HOSTS", "")),
         )
 
     def ensure_directories(self) -> None:
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Union
+
+from app.inference.whisper_runner import SAMPLE_RATE
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Raw little-endian float32 samples at ``SAMPLE_RATE`` Hz, mono, no header.
+PCM_SUFFIX = ".pcm"
+PCM_DTYPE = "<f4"
+
+
+def is_pcm(path: Union[str, Path]) -> bool:
+    return Path(path).suffix == PCM_SUFFIX
+
+
+def pcm_path_for(source: Union[str, Path]) -> Path:
+    return Path(source).with_suffix(PCM_SUFFIX)
+
+
+def decode_to_pcm(source: Union[str, Path], destination: Union[str, Path]) -> float:
+    """Decode any ffmpeg-readable file to a raw PCM file and return its duration in seconds."""
+
+    from faster_whisper import decode_audio  # type: ignore[import-not-found]
+
+    audio = decode_audio(str(source), sampling_rate=SAMPLE_RATE)
+    destination = Path(destination)
+    tmp_path = destination.with_name(destination.name + ".part")
+    audio.astype(PCM_DTYPE, copy=False).tofile(tmp_path)
+    os.replace(tmp_path, destination)
+    return len(audio) / SAMPLE_RATE
+
+
+def load_pcm(path: Union[str, Path]) -> "np.ndarray":
+    """Memory-map a PCM file read-only; slices are views backed by the page cache, not copies."""
+
+    import numpy as np
+
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=PCM_DTYPE)
+    return np.memmap(str(path), dtype=PCM_DTYPE, mode="r")
+
+
+class DecodePool:
+    """Decodes uploads to PCM files in dedicated processes, ahead of inference.
+
+    ``prefetch`` starts decoding as soon as a job is queued, so ffmpeg work for the next job
+    overlaps with inference on the current one; ``decoded`` waits for (or starts) the decode
+    and returns the PCM path. At most ``max_pending`` decodes are kept in flight or unclaimed
+    so a deep queue does not fill the disk with PCM; beyond that, decoding happens on demand.
+    """
+
+    def __init__(self, workers: int, *, max_pending: int) -> None:
+        self.max_pending = max(1, max_pending)
+        self._executor = ProcessPoolExecutor(
+            max_workers=max(1, workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, source: Path) -> None:
+        if is_pcm(source):
+            return
+        with self._lock:
+            if str(source) in self._pending or len(self._pending) >= self.max_pending:
+                return
+            self._pending[str(source)] = self._executor.submit(decode_to_pcm, str(source), str(pcm_path_for(source)))
+
+    def decoded(self, source: Path) -> Path:
+        if is_pcm(source):
+            return source
+        with self._lock:
+            future = self._pending.pop(str(source), None)
+            if future is None:
+                future = self._executor.submit(decode_to_pcm, str(source), str(pcm_path_for(source)))
+        future.result()
+        return pcm_path_for(source)
+
+    def discard(self, source: Path) -> None:
+        """Drop a prefetched decode (e.g. after a cache hit) and remove its PCM file."""
+
+        with self._lock:
+            future = self._pending.pop(str(source), None)
+        if future is not None and not future.cancel():
+            try:
+                future.result()
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Discarded decode of %s failed", source, exc_info=True)
+        if not is_pcm(source):
+            pcm_path_for(source).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, List, Optional
+
+from app.config import Settings
+from app.inference.whisper_runner import DecodeOptions, TranscriptionResult, WhisperRunner
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np  # type: ignore[import-not-found]
+
+logger = logging.getLogger(__name__)
+
+# BatchedInferencePipeline windows are at most 30 s, so longer clips are not batchable.
+MAX_BATCH_CLIP_SECONDS = 30.0
+
+
+@dataclass
+class _Pending:
+    runner: WhisperRunner
+    options: DecodeOptions
+    audio: "np.ndarray"
+    future: "Future[TranscriptionResult]"
+
+    def same_batch(self, other: "_Pending") -> bool:
+        return self.runner is other.runner and self.options == other.options
+
+
+class BatchScheduler:
+    """Collects short clips from concurrent jobs and decodes them in shared batches.
+
+    A batch is dispatched once ``max_batch_size`` clips for the same runner and resolved
+    ``DecodeOptions`` are pending or ``max_wait_seconds`` has passed since the first one
+    arrived, trading that much latency for fewer, larger encoder passes. Grouping by options
+    keeps each job's language hint and preset, so jobs only share a batch when they would
+    have decoded identically on their own.
+    """
+
+    def __init__(self, *, max_batch_size: int, max_wait_seconds: float, max_clip_seconds: float) -> None:
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self.max_clip_seconds = min(max_clip_seconds, MAX_BATCH_CLIP_SECONDS)
+        self._pending: Deque[_Pending] = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def accepts(self, runner: object, duration_seconds: float, options: Optional[DecodeOptions] = None) -> bool:
+        """Whether a clip of ``duration_seconds`` on ``runner`` can go through the batched path.
+
+        The language is shared across a batch, so it must be fixed by the options (a hint or
+        the runner's language) or by an English-only model. Batches are cut into explicit clip
+        windows instead of VAD segments, so clips asking for ``vad_filter`` are not batched.
+        """
+
+        if not isinstance(runner, WhisperRunner) or duration_seconds > self.max_clip_seconds:
+            return False
+        resolved = runner.resolve_options(options)
+        if resolved.vad_filter:
+            return False
+        return resolved.language is not None or runner.model_size.endswith(".en")
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name="batch-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(
+        self, runner: WhisperRunner, audio: "np.ndarray", options: Optional[DecodeOptions] = None
+    ) -> "Future[TranscriptionResult]":
+        future: "Future[TranscriptionResult]" = Future()
+        pending = _Pending(runner=runner, options=runner.resolve_options(options), audio=audio, future=future)
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Batch scheduler is stopped")
+            self._pending.append(pending)
+            self._cond.notify_all()
+        return future
+
+    def _next_batch(self) -> List[_Pending]:
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if not self._pending:
+                return []
+            deadline = time.monotonic() + self.max_wait_seconds
+            while not self._stopped:
+                head = self._pending[0]
+                ready = sum(1 for item in self._pending if item.same_batch(head))
+                remaining = deadline - time.monotonic()
+                if ready >= self.max_batch_size or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            head = self._pending[0]
+            batch: List[_Pending] = []
+            rest: Deque[_Pending] = deque()
+            while self._pending:
+                item = self._pending.popleft()
+                if item.same_batch(head) and len(batch) < self.max_batch_size:
+                    batch.append(item)
+                else:
+                    rest.append(item)
+            self._pending = rest
+            return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                results = batch[0].runner.run_batch([item.audio for item in batch], options=batch[0].options)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("Batched inference failed for %d clips", len(batch))
+                for item in batch:
+                    item.future.set_exception(exc)
+                continue
+            for item, result in zip(batch, results):
+                item.future.set_result(result)
+
+
+def build_batch_scheduler(settings: Settings) -> Optional[BatchScheduler]:
+    if settings.batch_max_size <= 1:
+        return None
+    return BatchScheduler(
+        max_batch_size=settings.batch_max_size,
+        max_wait_seconds=settings.batch_max_wait_ms / 1000,
+        max_clip_seconds=settings.batch_max_clip_seconds,
+    )
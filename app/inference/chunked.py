@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import replace
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np  # type: ignore[import-not-found]
+from faster_whisper import WhisperModel  # type: ignore[import-not-found]
+from faster_whisper.audio import decode_audio  # type: ignore[import-not-found]
+
+from app.inference.audio import load_pcm
+from app.inference.whisper_runner import (
+    SAMPLE_RATE,
+    AudioInput,
+    DecodeOptions,
+    Segment,
+    TranscriptionResult,
+    TranscriptionStream,
+    WhisperRunner,
+    Word,
+    to_segment,
+)
+
+FRAME_SECONDS = 0.03
+EDGE_TOLERANCE_SECONDS = 0.2
+
+_NORMALIZE = re.compile(r"[^\w]+")
+
+# (PCM file path, start sample, end sample) of a chunk that pool processes map themselves.
+PcmSlice = Tuple[str, int, int]
+
+_worker_model: Optional[WhisperModel] = None
+
+
+def plan_chunks(
+    audio: "np.ndarray",
+    *,
+    chunk_seconds: float,
+    search_seconds: float = 15.0,
+) -> List[Tuple[int, int]]:
+    """Split ``audio`` into ``(start, end)`` sample ranges of roughly ``chunk_seconds``.
+
+    Each cut is placed in the quietest 30 ms frame within ``search_seconds`` of the target
+    boundary, so chunks end in pauses rather than mid-word.
+    """
+
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLE_RATE)
+    if total <= chunk:
+        return [(0, total)]
+
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    usable = total - total % frame
+    energy = np.sqrt(np.mean(np.square(audio[:usable].reshape(-1, frame), dtype=np.float32), axis=1))
+    search = int(search_seconds / FRAME_SECONDS)
+
+    bounds: List[Tuple[int, int]] = []
+    start = 0
+    while total - start > chunk:
+        target = (start + chunk) // frame
+        low = max(start // frame + 1, target - search)
+        high = min(len(energy), target + search + 1)
+        cut = (low + int(np.argmin(energy[low:high]))) * frame if high > low else start + chunk
+        bounds.append((start, cut))
+        start = cut
+    bounds.append((start, total))
+    return bounds
+
+
+def stitch_segments(chunks: Iterable[Tuple[float, Sequence[Segment]]]) -> Iterator[Segment]:
+    """Shift per-chunk segments by their chunk offset and drop duplicates at the seams.
+
+    Only the leading segments of each chunk after the first are checked, up to the first one
+    that starts past the previous chunk's last segment: there, a segment lying within that
+    segment or repeating its text is discarded, and a start overlapping its end is clamped.
+    Everything else is kept as decoded, however short.
+    """
+
+    last_end = 0.0
+    last_text = ""
+    for index, (offset, segments) in enumerate(chunks):
+        at_seam = index > 0
+        for seg in segments:
+            start, end = seg.start + offset, seg.end + offset
+            normalized = _NORMALIZE.sub(" ", seg.text.lower()).strip()
+            if at_seam and start < last_end + EDGE_TOLERANCE_SECONDS:
+                inside = start < last_end and end <= last_end + EDGE_TOLERANCE_SECONDS
+                if inside or (normalized and normalized == last_text):
+                    continue
+                start = max(start, last_end)
+            at_seam = False
+            last_end, last_text = end, normalized
+            words = None
+            if seg.words:
+                words = [
+                    Word(start=w.start + offset, end=w.end + offset, word=w.word, probability=w.probability)
+                    for w in seg.words
+                ]
+            yield Segment(start=start, end=end, text=seg.text, words=words)
+
+
+def _init_worker(model_size: str, device: str, compute_type: str, cpu_threads: int) -> None:
+    global _worker_model  # pylint: disable=global-statement
+    _worker_model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+
+def _transcribe_chunk(
+    audio: Union["np.ndarray", PcmSlice], options: DecodeOptions, word_timestamps: bool
+) -> Tuple[List[Segment], str, float]:
+    assert _worker_model is not None, "worker model not initialised"
+    if isinstance(audio, tuple):
+        path, start, end = audio
+        audio = load_pcm(path)[start:end]
+    segments, info = _worker_model.transcribe(audio, word_timestamps=word_timestamps, **options.transcribe_kwargs())
+    data = [to_segment(s) for s in segments]
+    return data, info.language, getattr(info, "language_probability", 0.0)
+
+
+class ChunkedWhisperRunner:
+    """Long-audio runner that transcribes silence-aligned chunks across a process pool.
+
+    Audio shorter than one chunk goes straight to the wrapped ``WhisperRunner``. Each pool
+    process loads its own ``WhisperModel`` once, with CPU threads split evenly between them.
+    """
+
+    def __init__(self, runner: WhisperRunner, *, workers: int, chunk_seconds: float) -> None:
+        self.runner = runner
+        self.model_size = runner.model_size
+        self.beam_size = runner.beam_size
+        self.language = runner.language
+        self.device = runner.device
+        self.chunk_seconds = chunk_seconds
+        cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(runner.model_size, runner.device, runner.compute_type, cpu_threads),
+        )
+
+    @property
+    def default_options(self) -> DecodeOptions:
+        return self.runner.default_options
+
+    def resolve_options(self, options: Optional[DecodeOptions]) -> DecodeOptions:
+        return self.runner.resolve_options(options)
+
+    def run(
+        self, audio_path: AudioInput, *, word_timestamps: bool = False, options: Optional[DecodeOptions] = None
+    ) -> TranscriptionResult:
+        stream = self.stream(audio_path, word_timestamps=word_timestamps, options=options)
+        return TranscriptionResult(
+            segments=list(stream.segments),
+            language=stream.language,
+            language_probability=stream.language_probability,
+            duration_seconds=stream.duration_seconds,
+        )
+
+    def stream(
+        self, audio_path: AudioInput, *, word_timestamps: bool = False, options: Optional[DecodeOptions] = None
+    ) -> TranscriptionStream:
+        audio = decode_audio(audio_path, sampling_rate=SAMPLE_RATE) if isinstance(audio_path, str) else audio_path
+        bounds = plan_chunks(audio, chunk_seconds=self.chunk_seconds)
+        if len(bounds) == 1:
+            return self.runner.stream(audio, word_timestamps=word_timestamps, options=options)
+        options = self.resolve_options(options)
+        # Detect the language once so every chunk decodes in the same language; left to the
+        # pool, each chunk would detect on its own first 30 s and could disagree.
+        probability = 1.0
+        if not options.language:
+            language, probability = self.runner.detect_language(audio[bounds[0][0] : bounds[0][1]])
+            options = replace(options, language=language)
+
+        # A memory-mapped PCM file is shared with the pool by path and sample range, so each
+        # process maps only its chunk instead of receiving a pickled copy of the samples.
+        source = getattr(audio, "filename", None)
+        futures: List[Future] = [
+            self._pool.submit(
+                _transcribe_chunk,
+                (source, start, end) if source else audio[start:end],
+                options,
+                word_timestamps,
+            )
+            for start, end in bounds
+        ]
+        first_segments = futures[0].result()[0]
+
+        def ordered() -> Iterator[Tuple[float, Sequence[Segment]]]:
+            yield 0.0, first_segments
+            for (start, _), future in zip(bounds[1:], futures[1:]):
+                yield start / SAMPLE_RATE, future.result()[0]
+
+        return TranscriptionStream(
+            segments=stitch_segments(ordered()),
+            language=options.language,
+            language_probability=probability,
+            duration_seconds=len(audio) / SAMPLE_RATE,
+        )
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import Settings
+from app.inference.whisper_runner import WhisperRunner
+
+logger = logging.getLogger(__name__)
+
+# Approximate resident size of each checkpoint, used to enforce the memory budget.
+MODEL_MEMORY_MB: Dict[str, int] = {
+    "tiny": 150,
+    "base": 300,
+    "small": 800,
+    "medium": 2100,
+    "large-v1": 4000,
+    "large-v2": 4000,
+    "large-v3": 4000,
+}
+
+RunnerKey = Tuple[str, Optional[str]]
+RunnerFactory = Callable[[str, Optional[str]], WhisperRunner]
+
+
+def estimate_memory_mb(model_size: str) -> int:
+    base = model_size.split(".", 1)[0]
+    return MODEL_MEMORY_MB.get(base, MODEL_MEMORY_MB["large-v2"])
+
+
+class ModelRegistry:
+    """Lazily loads Whisper runners and keeps the most recently used ones resident.
+
+    At most ``max_models`` runners stay loaded, and their estimated footprint stays within
+    ``memory_budget_mb`` (0 disables the budget). Loads of the same key are serialized, so
+    concurrent requests for a cold model load it once.
+
+    Jobs hold runners through ``lease``. Eviction only drops a runner from the LRU; a runner
+    that is still leased is closed when its last lease is released, so evicting a model never
+    cancels a job that is using it.
+    """
+
+    def __init__(
+        self,
+        factory: RunnerFactory,
+        *,
+        default_model: str,
+        max_models: int,
+        memory_budget_mb: int = 0,
+    ) -> None:
+        self.factory = factory
+        self.default_model = default_model
+        self.max_models = max(1, max_models)
+        self.memory_budget_mb = memory_budget_mb
+        self._runners: "OrderedDict[RunnerKey, WhisperRunner]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[RunnerKey, threading.Lock] = {}
+        # Lease counts by ``id(runner)``, and evicted runners waiting for their last lease.
+        self._leases: Dict[int, int] = {}
+        self._retired: Dict[int, WhisperRunner] = {}
+
+    @classmethod
+    def from_settings(cls, settings: Settings, *, factory: Optional[RunnerFactory] = None) -> "ModelRegistry":
+        """Build the registry for ``settings``; ``factory`` replaces the Whisper loader (e.g. in benchmarks)."""
+
+        def default_factory(model_size: str, compute_type: Optional[str]) -> WhisperRunner:
+            runner = WhisperRunner(model_size, language=settings.model_language, compute_type=compute_type)
+            if settings.long_audio_workers > 1:
+                from app.inference.chunked import ChunkedWhisperRunner
+
+                return ChunkedWhisperRunner(
+                    runner,
+                    workers=settings.long_audio_workers,
+                    chunk_seconds=settings.long_audio_chunk_seconds,
+                )
+            return runner
+
+        return cls(
+            factory or default_factory,
+            default_model=settings.model_size,
+            max_models=settings.max_loaded_models,
+            memory_budget_mb=settings.model_memory_budget_mb,
+        )
+
+    def get(self, model_size: Optional[str] = None, compute_type: Optional[str] = None) -> WhisperRunner:
+        """Return a loaded runner without leasing it (e.g. for warm-up); jobs should use ``lease``."""
+
+        return self._checkout((model_size or self.default_model, compute_type), leased=False)
+
+    def acquire(self, model_size: Optional[str] = None, compute_type: Optional[str] = None) -> WhisperRunner:
+        """Lease a runner: it is not closed until the matching ``release``, even if evicted."""
+
+        return self._checkout((model_size or self.default_model, compute_type), leased=True)
+
+    @contextmanager
+    def lease(self, model_size: Optional[str] = None, compute_type: Optional[str] = None) -> Iterator[WhisperRunner]:
+        """``acquire`` for the duration of the block."""
+
+        runner = self.acquire(model_size, compute_type)
+        try:
+            yield runner
+        finally:
+            self.release(runner)
+
+    def _checkout(self, key: RunnerKey, *, leased: bool) -> WhisperRunner:
+        with self._lock:
+            runner = self._take(key, leased)
+            if runner is not None:
+                return runner
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                runner = self._take(key, leased)
+                if runner is not None:
+                    return runner
+            logger.info("Loading Whisper model %s (compute_type=%s)", key[0], key[1] or "auto")
+            runner = self.factory(key[0], key[1])
+            with self._lock:
+                self._runners[key] = runner
+                if leased:
+                    self._leases[id(runner)] = self._leases.get(id(runner), 0) + 1
+                evicted = self._evict(keep=key)
+        self._close_all(evicted)
+        return runner
+
+    def _take(self, key: RunnerKey, leased: bool) -> Optional[WhisperRunner]:
+        runner = self._runners.get(key)
+        if runner is not None:
+            self._runners.move_to_end(key)
+            if leased:
+                self._leases[id(runner)] = self._leases.get(id(runner), 0) + 1
+        return runner
+
+    def release(self, runner: WhisperRunner) -> None:
+        with self._lock:
+            remaining = self._leases.get(id(runner), 1) - 1
+            if remaining > 0:
+                self._leases[id(runner)] = remaining
+                return
+            self._leases.pop(id(runner), None)
+            retired = self._retired.pop(id(runner), None)
+        if retired is not None:
+            self._close_runner(retired)
+
+    def loaded(self) -> Iterable[RunnerKey]:
+        with self._lock:
+            return list(self._runners)
+
+    def is_loaded(self, model_size: Optional[str] = None, compute_type: Optional[str] = None) -> bool:
+        with self._lock:
+            return (model_size or self.default_model, compute_type) in self._runners
+
+    def warm_up(self, model_sizes: Iterable[str]) -> threading.Thread:
+        """Preload ``model_sizes`` on a background thread and return it."""
+
+        def _load() -> None:
+            for model_size in model_sizes:
+                try:
+                    self.get(model_size)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Failed to warm up model %s", model_size)
+
+        thread = threading.Thread(target=_load, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        with self._lock:
+            runners = list(self._runners.values())
+            self._runners.clear()
+            idle = self._retire(runners)
+        self._close_all(idle)
+
+    def _evict(self, keep: RunnerKey) -> List[WhisperRunner]:
+        """Drop runners from the LRU until within limits; returns the idle ones to close."""
+
+        def over_budget() -> bool:
+            if len(self._runners) > self.max_models:
+                return True
+            if self.memory_budget_mb <= 0:
+                return False
+            used = sum(estimate_memory_mb(model_size) for model_size, _ in self._runners)
+            return used > self.memory_budget_mb
+
+        victims: List[WhisperRunner] = []
+        while over_budget():
+            victim = next((key for key in self._runners if key != keep), None)
+            if victim is None:
+                break
+            logger.info("Evicting Whisper model %s (compute_type=%s)", victim[0], victim[1] or "auto")
+            victims.append(self._runners.pop(victim))
+        return self._retire(victims)
+
+    def _retire(self, runners: List[WhisperRunner]) -> List[WhisperRunner]:
+        # Leased runners are parked until ``release``; the rest can be closed right away.
+        idle = []
+        for runner in runners:
+            if self._leases.get(id(runner)):
+                self._retired[id(runner)] = runner
+            else:
+                idle.append(runner)
+        return idle
+
+    def _close_all(self, runners: List[WhisperRunner]) -> None:
+        for runner in runners:
+            self._close_runner(runner)
+
+    @staticmethod
+    def _close_runner(runner: WhisperRunner) -> None:
+        close = getattr(runner, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.inference.whisper_runner import SAMPLE_RATE, WhisperRunner, Word
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+LIVE_ENCODINGS = ("pcm_s16le", "pcm_f32le", "opus")
+
+# Energy VAD frame length; Whisper's own feature hop is 10 ms, so 30 ms keeps the mask cheap.
+VAD_FRAME_SECONDS = 0.03
+# Silence kept in front of the window after a flush so the next onset is not clipped.
+LEAD_IN_SECONDS = 0.2
+# Words may restart slightly before the last committed word ended.
+COMMIT_OVERLAP_SECONDS = 0.1
+# Longest run of committed words checked when dropping a repeated hypothesis prefix.
+MAX_REPEAT_WORDS = 5
+
+
+def speech_frames(samples: "np.ndarray", threshold: float) -> "np.ndarray":
+    """Per-frame speech mask: RMS energy of each ``VAD_FRAME_SECONDS`` frame against ``threshold``."""
+
+    import numpy as np  # type: ignore[import-not-found]
+
+    frame = int(SAMPLE_RATE * VAD_FRAME_SECONDS)
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, dtype=bool)
+    frames = np.asarray(samples[: count * frame], dtype=np.float32).reshape(count, frame)
+    return np.sqrt(np.mean(np.square(frames), axis=1)) >= threshold
+
+
+def trailing_silence_seconds(mask: "np.ndarray") -> float:
+    speech = mask.nonzero()[0]
+    silent = len(mask) - (int(speech[-1]) + 1 if len(speech) else 0)
+    return silent * VAD_FRAME_SECONDS
+
+
+class FrameDecoder:
+    """Turns WebSocket audio frames into 16 kHz mono float32 samples.
+
+    Raw PCM must already be 16 kHz mono; a sample split across two frames is carried over.
+    Opus packets are decoded and resampled with PyAV (installed with Faster-Whisper).
+    """
+
+    def __init__(self, encoding: str, sample_rate: int = SAMPLE_RATE) -> None:
+        if encoding not in LIVE_ENCODINGS:
+            raise ValueError(f"Unsupported encoding {encoding!r}")
+        if encoding != "opus" and sample_rate != SAMPLE_RATE:
+            raise ValueError(f"PCM input must be {SAMPLE_RATE} Hz mono")
+        self.encoding = encoding
+        self._pending = b""
+        self._codec: Any = None
+        self._resampler: Any = None
+        if encoding == "opus":
+            import av  # type: ignore[import-not-found]
+
+            self._codec = av.CodecContext.create("opus", "r")
+            self._codec.sample_rate = sample_rate
+            self._resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+
+    def decode(self, data: bytes) -> "np.ndarray":
+        import numpy as np  # type: ignore[import-not-found]
+
+        if self._codec is not None:
+            return self._decode_opus(data)
+        width = 2 if self.encoding == "pcm_s16le" else 4
+        data = self._pending + data
+        usable = len(data) - len(data) % width
+        self._pending = data[usable:]
+        if self.encoding == "pcm_s16le":
+            return np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+        return np.frombuffer(data[:usable], dtype="<f4").astype(np.float32)
+
+    def _decode_opus(self, data: bytes) -> "np.ndarray":
+        import av  # type: ignore[import-not-found]
+        import numpy as np  # type: ignore[import-not-found]
+
+        chunks = [
+            resampled.to_ndarray().reshape(-1)
+            for frame in self._codec.decode(av.Packet(data))
+            for resampled in self._resampler.resample(frame)
+        ]
+        return np.concatenate(chunks).astype(np.float32, copy=False) if chunks else np.zeros(0, dtype=np.float32)
+
+
+@dataclass
+class LiveEvent:
+    """A ``final`` (never revised) or ``partial`` (may be revised) stretch of live transcript."""
+
+    type: str
+    start: float
+    end: float
+    text: str
+    words: Optional[List[Word]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "type": self.type,
+            "start": round(self.start, 3),
+            "end": round(self.end, 3),
+            "text": self.text,
+        }
+        if self.words is not None:
+            payload["words"] = [
+                {"start": round(w.start, 3), "end": round(w.end, 3), "word": w.word, "probability": w.probability}
+                for w in self.words
+            ]
+        return payload
+
+
+class StreamingDecoder:
+    """Incremental transcription of a live 16 kHz mono stream over a sliding window.
+
+    ``feed`` appends audio as it arrives; ``step`` re-decodes the current window with the
+    shared runner and splits the hypothesis into committed words, the prefix on which the last
+    two hypotheses agree (LocalAgreement-2), and a tentative tail that the next step may revise.
+    Committed words are emitted once as ``final`` events and the tentative tail as a ``partial``.
+
+    An energy VAD gates the work: windows without speech are not decoded, and once
+    ``flush_silence_seconds`` of silence follows speech the whole hypothesis is committed and
+    the window restarts. A window that grows past ``window_seconds`` without agreement commits
+    its older half, so decode cost per step and latency stay bounded. Timestamps are seconds
+    since the start of the stream.
+    """
+
+    def __init__(
+        self,
+        runner: WhisperRunner,
+        *,
+        window_seconds: float,
+        step_seconds: float,
+        flush_silence_seconds: float,
+        vad_threshold: float,
+        word_timestamps: bool = False,
+    ) -> None:
+        import numpy as np  # type: ignore[import-not-found]
+
+        self.runner = runner
+        self.window_seconds = window_seconds
+        self.step_seconds = step_seconds
+        self.flush_silence_seconds = flush_silence_seconds
+        self.vad_threshold = vad_threshold
+        self.word_timestamps = word_timestamps
+        # ``_buffer`` holds samples from absolute index ``_start``; it is replaced, never mutated,
+        # so ``step`` can decode a snapshot while ``feed`` keeps appending.
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._start = 0
+        self._decoded = 0
+        self._lock = threading.Lock()
+        self._tentative: List[Word] = []
+        self._committed: List[str] = []
+        self._committed_until = 0.0
+
+    @property
+    def received_seconds(self) -> float:
+        with self._lock:
+            return (self._start + len(self._buffer)) / SAMPLE_RATE
+
+    def feed(self, samples: "np.ndarray") -> None:
+        import numpy as np  # type: ignore[import-not-found]
+
+        if len(samples) == 0:
+            return
+        with self._lock:
+            self._buffer = np.concatenate((self._buffer, samples))
+
+    def due(self) -> bool:
+        """True once ``step_seconds`` of audio arrived since the last decode."""
+
+        with self._lock:
+            return self._start + len(self._buffer) - self._decoded >= self.step_seconds * SAMPLE_RATE
+
+    def step(self) -> List[LiveEvent]:
+        with self._lock:
+            audio, start = self._buffer, self._start
+            self._decoded = start + len(audio)
+        start_seconds = start / SAMPLE_RATE
+        end_seconds = start_seconds + len(audio) / SAMPLE_RATE
+        mask = speech_frames(audio, self.vad_threshold)
+        if not mask.any():
+            self._tentative = []
+            self._trim(end_seconds - LEAD_IN_SECONDS)
+            return []
+
+        words = self._hypothesis(audio, start_seconds)
+        if trailing_silence_seconds(mask) >= self.flush_silence_seconds:
+            events = self._commit(words)
+            self._tentative = []
+            self._trim(end_seconds - LEAD_IN_SECONDS)
+            return events
+
+        agreed = 0
+        while (
+            agreed < min(len(words), len(self._tentative))
+            and _normalize(words[agreed].word) == _normalize(self._tentative[agreed].word)
+        ):
+            agreed += 1
+        events = self._commit(words[:agreed])
+        tentative = words[agreed:]
+        if end_seconds - start_seconds > self.window_seconds:
+            if self._committed_until - start_seconds < self.window_seconds / 2:
+                horizon = end_seconds - self.window_seconds / 2
+                forced = [word for word in tentative if word.end <= horizon]
+                events.extend(self._commit(forced))
+                tentative = tentative[len(forced) :]
+                cut = max(self._committed_until, horizon)
+            else:
+                cut = self._committed_until
+            tentative = [word for word in tentative if word.start >= cut]
+            self._trim(cut)
+        self._tentative = tentative
+        if tentative:
+            events.append(LiveEvent("partial", tentative[0].start, tentative[-1].end, _join(tentative)))
+        return events
+
+    def finish(self) -> List[LiveEvent]:
+        """Commit whatever is still buffered; call once the client stops sending."""
+
+        with self._lock:
+            audio, start = self._buffer, self._start
+            self._decoded = start + len(audio)
+        if not speech_frames(audio, self.vad_threshold).any():
+            return []
+        events = self._commit(self._hypothesis(audio, start / SAMPLE_RATE))
+        self._tentative = []
+        return events
+
+    def _hypothesis(self, audio: "np.ndarray", offset: float) -> List[Word]:
+        stream = self.runner.stream(audio, word_timestamps=True)
+        words: List[Word] = []
+        for segment in stream.segments:
+            # Runners without word timestamps agree on whole segments instead.
+            units = segment.words or [Word(segment.start, segment.end, f" {segment.text}", 1.0)]
+            words.extend(Word(w.start + offset, w.end + offset, w.word, w.probability) for w in units)
+        words = [word for word in words if word.start >= self._committed_until - COMMIT_OVERLAP_SECONDS]
+        # Whisper often repeats the last committed words at the start of the new window.
+        texts = [_normalize(word.word) for word in words]
+        for size in range(min(MAX_REPEAT_WORDS, len(self._committed), len(words)), 0, -1):
+            if texts[:size] == self._committed[-size:]:
+                return words[size:]
+        return words
+
+    def _commit(self, words: List[Word]) -> List[LiveEvent]:
+        if not words:
+            return []
+        self._committed_until = words[-1].end
+        self._committed = (self._committed + [_normalize(word.word) for word in words])[-MAX_REPEAT_WORDS:]
+        return [
+            LiveEvent(
+                "final",
+                words[0].start,
+                words[-1].end,
+                _join(words),
+                words=list(words) if self.word_timestamps else None,
+            )
+        ]
+
+    def _trim(self, seconds: float) -> None:
+        with self._lock:
+            drop = min(max(int(seconds * SAMPLE_RATE) - self._start, 0), len(self._buffer))
+            self._buffer = self._buffer[drop:]
+            self._start += drop
+
+
+def _normalize(word: str) -> str:
+    return word.strip().strip(".,!?;:\"'").lower()
+
+
+def _join(words: List[Word]) -> str:
+    return "".join(word.word for word in words).strip()
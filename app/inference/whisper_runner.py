@@ -1,48 +1,515 @@
 from __future__ import annotations
 
 import importlib.util
-from dataclasses import dataclass
-from typing import List
+import json
+import os
+import struct
+import threading
+import uuid
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from faster_whisper import WhisperModel  # type: ignore[import-not-found]
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np  # type: ignore[import-not-found]
 
+SAMPLE_RATE = 16000
 
-@dataclass
+# A file path, or 16 kHz mono float32 samples as produced by ``faster_whisper.decode_audio``.
+AudioInput = Union[str, "np.ndarray"]
+
+
+@dataclass(slots=True)
+class Word:
+    start: float
+    end: float
+    word: str
+    probability: float
+
+
+@dataclass(slots=True)
 class Segment:
     start: float
     end: float
     text: str
+    words: Optional[List[Word]] = None
+
+
+class TextColumn(Sequence[str]):
+    """UTF-8 strings packed into one buffer; ``offsets[i]:offsets[i + 1]`` delimits item ``i``.
+
+    Items are decoded on access, and slices decode their byte range in one copy.
+    """
+
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self, buffer: "np.ndarray", offsets: "np.ndarray") -> None:
+        self.buffer = buffer
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if start >= stop:
+                return []
+            bounds = self.offsets[start : stop + 1].tolist()
+            region = self.buffer[bounds[0] : bounds[-1]].tobytes()
+            base = bounds[0]
+            return [region[a - base : b - base].decode("utf-8") for a, b in zip(bounds, bounds[1:])]
+        if index < 0:
+            index += len(self)
+        a, b = self.offsets[index : index + 2].tolist()
+        return self.buffer[a:b].tobytes().decode("utf-8")
+
+
+class SegmentTable(Sequence[Segment]):
+    """Array-backed segments: float64 start/end columns and one text buffer instead of objects.
+
+    Timestamps stay float64 so millisecond rendering is exact for long recordings. Word
+    timestamps, when present, use the same layout with ``word_index`` delimiting each
+    segment's words. ``Segment`` objects are only built on indexing or iteration.
+    """
+
+    def __init__(
+        self,
+        starts: "np.ndarray",
+        ends: "np.ndarray",
+        texts: TextColumn,
+        words: Optional[Tuple["np.ndarray", "np.ndarray", "np.ndarray", TextColumn, "np.ndarray"]] = None,
+    ) -> None:
+        self.starts = starts
+        self.ends = ends
+        self.texts = texts
+        # (starts, ends, probabilities, texts, word_index) or None without word timestamps.
+        self.words = words
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[Segment]) -> "SegmentTable":
+        if isinstance(segments, SegmentTable):
+            return segments
+        builder = SegmentTableBuilder()
+        for segment in segments:
+            builder.append(segment)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        words = None
+        if self.words is not None:
+            w_starts, w_ends, w_probs, w_texts, w_index = self.words
+            first, last = w_index[index : index + 2].tolist()
+            words = [
+                Word(start=start, end=end, word=text, probability=probability)
+                for start, end, probability, text in zip(
+                    w_starts[first:last].tolist(),
+                    w_ends[first:last].tolist(),
+                    w_probs[first:last].tolist(),
+                    w_texts[first:last],
+                )
+            ] or None  # like ``to_segment``, a segment without words carries ``None``
+        return Segment(start=float(self.starts[index]), end=float(self.ends[index]), text=self.texts[index], words=words)
+
+    def __iter__(self) -> Iterator[Segment]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class SegmentTableBuilder:
+    """Accumulates segments into flat columns as they stream in, without keeping the objects."""
+
+    def __init__(self) -> None:
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._text = bytearray()
+        self._text_offsets: List[int] = [0]
+        self._has_words = False
+        self._word_starts: List[float] = []
+        self._word_ends: List[float] = []
+        self._word_probs: List[float] = []
+        self._word_text = bytearray()
+        self._word_text_offsets: List[int] = [0]
+        self._word_index: List[int] = [0]
+
+    def append(self, segment: Segment) -> None:
+        self._starts.append(segment.start)
+        self._ends.append(segment.end)
+        self._text += segment.text.encode("utf-8")
+        self._text_offsets.append(len(self._text))
+        for word in segment.words or ():
+            self._has_words = True
+            self._word_starts.append(word.start)
+            self._word_ends.append(word.end)
+            self._word_probs.append(word.probability)
+            self._word_text += word.word.encode("utf-8")
+            self._word_text_offsets.append(len(self._word_text))
+        self._word_index.append(len(self._word_starts))
+
+    def build(self) -> SegmentTable:
+        import numpy as np  # type: ignore[import-not-found]
+
+        words = None
+        if self._has_words:
+            words = (
+                np.array(self._word_starts, dtype=np.float64),
+                np.array(self._word_ends, dtype=np.float64),
+                np.array(self._word_probs, dtype=np.float64),
+                TextColumn(np.frombuffer(bytes(self._word_text), dtype=np.uint8), np.array(self._word_text_offsets, dtype=np.int64)),
+                np.array(self._word_index, dtype=np.int64),
+            )
+        return SegmentTable(
+            np.array(self._starts, dtype=np.float64),
+            np.array(self._ends, dtype=np.float64),
+            TextColumn(np.frombuffer(bytes(self._text), dtype=np.uint8), np.array(self._text_offsets, dtype=np.int64)),
+            words,
+        )
+
+
+# Faster-Whisper's default fallback schedule: retry at higher temperatures when a window fails.
+TEMPERATURE_FALLBACK: Tuple[float, ...] = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+
+@dataclass(frozen=True)
+class DecodeOptions:
+    """Per-call decoding settings handed to ``WhisperModel.transcribe``.
+
+    The defaults match Faster-Whisper's. A ``language`` skips language detection, which costs
+    an extra encoder pass; ``beam_size=1`` with a single temperature is greedy decoding.
+    """
+
+    beam_size: int = 5
+    best_of: int = 5
+    temperature: Tuple[float, ...] = TEMPERATURE_FALLBACK
+    condition_on_previous_text: bool = True
+    vad_filter: bool = False
+    language: Optional[str] = None
+
+    def transcribe_kwargs(self) -> Dict[str, Any]:
+        kwargs = asdict(self)
+        kwargs["temperature"] = list(self.temperature)
+        return kwargs
+
+    def cache_token(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
 
 
 @dataclass
 class TranscriptionResult:
-    segments: List[Segment]
+    segments: Sequence[Segment]
     language: str
     language_probability: float
     duration_seconds: float
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TranscriptionResult":
+        segments = []
+        for seg in data["segments"]:
+            words = seg.get("words")
+            segments.append(
+                Segment(
+                    start=seg["start"],
+                    end=seg["end"],
+                    text=seg["text"],
+                    words=[Word(**word) for word in words] if words is not None else None,
+                )
+            )
+        return cls(
+            segments=segments,
+            language=data["language"],
+            language_probability=data["language_probability"],
+            duration_seconds=data["duration_seconds"],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form used by the JSON output; ``words`` is omitted when not recorded."""
+
+        segments = []
+        for seg in self.segments:
+            item: Dict[str, Any] = {"start": seg.start, "end": seg.end, "text": seg.text}
+            if seg.words is not None:
+                item["words"] = [
+                    {"start": w.start, "end": w.end, "word": w.word, "probability": w.probability} for w in seg.words
+                ]
+            segments.append(item)
+        return {
+            "segments": segments,
+            "language": self.language,
+            "language_probability": self.language_probability,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+# Binary result file: MAGIC, uint32 header length, JSON header, then 64-byte aligned raw arrays.
+RESULT_MAGIC = b"STTSEG01"
+RESULT_SUFFIX = ".seg"
+_ALIGNMENT = 64
+
+
+def save_result(path: Union[str, Path], result: TranscriptionResult) -> None:
+    """Write ``result`` in the binary segment format (atomically)."""
+
+    path = Path(path)
+    # Private temp name: processes sharing a cache directory may save the same key at once.
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.part")
+    try:
+        with tmp_path.open("wb") as handle:
+            write_result(handle, result)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_result(handle: BinaryIO, result: TranscriptionResult) -> None:
+    """Write ``result`` in the binary segment format to a seekable binary ``handle``."""
+
+    table = SegmentTable.from_segments(result.segments)
+    arrays: Dict[str, "np.ndarray"] = {
+        "starts": table.starts,
+        "ends": table.ends,
+        "text": table.texts.buffer,
+        "text_offsets": table.texts.offsets,
+    }
+    if table.words is not None:
+        w_starts, w_ends, w_probs, w_texts, w_index = table.words
+        arrays.update(
+            word_starts=w_starts,
+            word_ends=w_ends,
+            word_probs=w_probs,
+            word_text=w_texts.buffer,
+            word_text_offsets=w_texts.offsets,
+            word_index=w_index,
+        )
+    layout: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "offset": offset, "length": int(array.size)}
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps(
+        {
+            "language": result.language,
+            "language_probability": result.language_probability,
+            "duration_seconds": result.duration_seconds,
+            "arrays": layout,
+        }
+    ).encode("utf-8")
+    data_start = -(-(len(RESULT_MAGIC) + 4 + len(header)) // _ALIGNMENT) * _ALIGNMENT
+    handle.write(RESULT_MAGIC + struct.pack("<I", len(header)) + header)
+    for name, array in arrays.items():
+        handle.seek(data_start + layout[name]["offset"])
+        handle.write(array.tobytes())
+    handle.truncate(data_start + offset)
+
+
+def load_result(path: Union[str, Path], *, mmap: bool = True) -> TranscriptionResult:
+    """Read a binary result; with ``mmap`` the columns are views of the file, not copies."""
+
+    import numpy as np  # type: ignore[import-not-found]
+
+    with open(path, "rb") as handle:
+        if handle.read(len(RESULT_MAGIC)) != RESULT_MAGIC:
+            raise ValueError(f"{path} is not a segment file")
+        (header_length,) = struct.unpack("<I", handle.read(4))
+        header = json.loads(handle.read(header_length))
+    data_start = -(-(len(RESULT_MAGIC) + 4 + header_length) // _ALIGNMENT) * _ALIGNMENT
+    raw = np.memmap(str(path), dtype=np.uint8, mode="r") if mmap else np.fromfile(str(path), dtype=np.uint8)
+
+    def column(name: str) -> "np.ndarray":
+        spec = header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        start = data_start + spec["offset"]
+        return raw[start : start + spec["length"] * dtype.itemsize].view(dtype)
+
+    words = None
+    if "word_index" in header["arrays"]:
+        words = (
+            column("word_starts"),
+            column("word_ends"),
+            column("word_probs"),
+            TextColumn(column("word_text"), column("word_text_offsets")),
+            column("word_index"),
+        )
+    table = SegmentTable(column("starts"), column("ends"), TextColumn(column("text"), column("text_offsets")), words)
+    return TranscriptionResult(
+        segments=table,
+        language=header["language"],
+        language_probability=header["language_probability"],
+        duration_seconds=header["duration_seconds"],
+    )
+
+
+@dataclass
+class TranscriptionStream:
+    """Lazily decoded transcription; ``segments`` yields as the model decodes."""
+
+    segments: Iterator[Segment]
+    language: str
+    language_probability: float
+    duration_seconds: float
+
+
+def to_segment(raw: Any, offset: float = 0.0) -> Segment:
+    """Convert a Faster-Whisper segment, shifting its timestamps by ``offset`` seconds."""
+
+    words = getattr(raw, "words", None)
+    return Segment(
+        start=raw.start + offset,
+        end=raw.end + offset,
+        text=raw.text.strip(),
+        words=[
+            Word(start=w.start + offset, end=w.end + offset, word=w.word, probability=w.probability)
+            for w in words
+        ]
+        if words
+        else None,
+    )
+
 
 class WhisperRunner:
-    """Thin wrapper around Faster-Whisper for reuse across requests."""
+    """Thin wrapper around Faster-Whisper for reuse across requests.
 
-    def __init__(self, model_size: str) -> None:
+    ``faster_whisper`` is imported on construction so that importing this module stays cheap.
+    """
+
+    def __init__(
+        self,
+        model_size: str,
+        *,
+        beam_size: int = 5,
+        language: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        cpu_threads: int = 0,
+    ) -> None:
+        self.model_size = model_size
+        self.beam_size = beam_size
+        self.language = language
         self.device = self._resolve_device()
-        compute_type = "int8_float16" if self.device == "cuda" else "float32"
-        self.model = WhisperModel(model_size, device=self.device, compute_type=compute_type)
+        self.compute_type = compute_type or self._compute_type(self.device)
+        from faster_whisper import WhisperModel  # type: ignore[import-not-found]
+
+        self.model = WhisperModel(
+            model_size, device=self.device, compute_type=self.compute_type, cpu_threads=cpu_threads
+        )
+        self._batched: Optional[Any] = None
+        self._batched_lock = threading.Lock()
+
+    @property
+    def default_options(self) -> DecodeOptions:
+        return DecodeOptions(beam_size=self.beam_size, language=self.language)
+
+    def resolve_options(self, options: Optional[DecodeOptions]) -> DecodeOptions:
+        """``options`` with the runner's language filled in; the runner defaults when ``None``."""
+
+        if options is None:
+            return self.default_options
+        return options if options.language else replace(options, language=self.language)
 
-    def run(self, audio_path: str) -> TranscriptionResult:
-        segments, info = self.model.transcribe(audio_path, beam_size=5)
-        data = [Segment(start=s.start, end=s.end, text=s.text.strip()) for s in segments]
-        duration = getattr(info, "duration", data[-1].end if data else 0.0)
+    def run(
+        self, audio_path: AudioInput, *, word_timestamps: bool = False, options: Optional[DecodeOptions] = None
+    ) -> TranscriptionResult:
+        stream = self.stream(audio_path, word_timestamps=word_timestamps, options=options)
+        data = list(stream.segments)
+        duration = stream.duration_seconds or (data[-1].end if data else 0.0)
         return TranscriptionResult(
             segments=data,
+            language=stream.language,
+            language_probability=stream.language_probability,
+            duration_seconds=duration,
+        )
+
+    def stream(
+        self, audio_path: AudioInput, *, word_timestamps: bool = False, options: Optional[DecodeOptions] = None
+    ) -> TranscriptionStream:
+        segments, info = self.model.transcribe(
+            audio_path, word_timestamps=word_timestamps, **self.resolve_options(options).transcribe_kwargs()
+        )
+        return TranscriptionStream(
+            segments=(to_segment(s) for s in segments),
             language=info.language,
             language_probability=getattr(info, "language_probability", 0.0),
-            duration_seconds=duration,
+            duration_seconds=getattr(info, "duration", 0.0),
         )
 
+    def detect_language(self, audio: "np.ndarray") -> Tuple[str, float]:
+        """Language of the first 30 s of ``audio`` and its probability."""
+
+        language, probability, _ = self.model.detect_language(audio[: 30 * SAMPLE_RATE])
+        return language, probability
+
+    def run_batch(
+        self, audios: Sequence["np.ndarray"], *, options: Optional[DecodeOptions] = None
+    ) -> List[TranscriptionResult]:
+        """Transcribe several short clips with shared, batched encoder/decoder passes.
+
+        Clips are laid end to end in one buffer and handed to ``BatchedInferencePipeline`` as
+        explicit clip windows (each at most 30 s), so every clip is one batch item. Segments are
+        mapped back to their clip by offset. ``options`` apply to every clip, including the
+        language, so callers should only batch when a language is fixed. Each clip is a single
+        window, so ``condition_on_previous_text`` has no effect, and ``vad_filter`` is ignored.
+        """
+
+        import numpy as np  # type: ignore[import-not-found]
+        from faster_whisper import BatchedInferencePipeline  # type: ignore[import-not-found]
+
+        with self._batched_lock:
+            if self._batched is None:
+                self._batched = BatchedInferencePipeline(model=self.model)
+
+        offsets: List[int] = []
+        clips = []
+        cursor = 0
+        for audio in audios:
+            offsets.append(cursor)
+            clips.append({"start": cursor, "end": cursor + len(audio)})
+            cursor += len(audio)
+        buffer = np.concatenate(audios) if audios else np.zeros(0, dtype=np.float32)
+
+        options = self.resolve_options(options)
+        segments, info = self._batched.transcribe(
+            buffer,
+            beam_size=options.beam_size,
+            best_of=options.best_of,
+            temperature=list(options.temperature),
+            language=options.language,
+            vad_filter=False,
+            clip_timestamps=clips,
+            batch_size=len(audios),
+        )
+        grouped: List[List[Segment]] = [[] for _ in audios]
+        for seg in segments:
+            sample = int(seg.start * SAMPLE_RATE)
+            index = max(i for i, offset in enumerate(offsets) if offset <= sample)
+            grouped[index].append(to_segment(seg, -offsets[index] / SAMPLE_RATE))
+        return [
+            TranscriptionResult(
+                segments=group,
+                language=info.language,
+                language_probability=getattr(info, "language_probability", 0.0),
+                duration_seconds=len(audio) / SAMPLE_RATE,
+            )
+            for group, audio in zip(grouped, audios)
+        ]
+
     @staticmethod
     def _resolve_device() -> str:
+        # CTranslate2 ships with faster-whisper and reports CUDA devices without importing torch.
+        if importlib.util.find_spec("ctranslate2") is not None:
+            try:
+                import ctranslate2  # type: ignore[import-not-found]
+
+                return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            except Exception:  # pragma: no cover - fall through to torch probing
+                pass
         spec = importlib.util.find_spec("torch")
         if spec is not None:
             try:
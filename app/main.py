@@ -1,17 +1,33 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.inference.whisper_runner import WhisperRunner
-from app.routers import transcription
-from app.services.job_store import JobStore
+from app.inference.audio import DecodePool
+from app.inference.batching import build_batch_scheduler
+from app.inference.model_registry import ModelRegistry, RunnerFactory
+from app.routers import health, live, metrics, search, transcription
+from app.services.broker import build_broker
+from app.services.job_queue import JobQueue
+from app.services.job_store import ABANDONED_JOB_ERROR, build_job_store
+from app.services.live_sessions import LiveSessionManager
+from app.services.metrics import PipelineMetrics
+from app.services.retention import RetentionSweeper
+from app.services.search_index import SearchIndex
 from app.services.transcriber import TranscriberService
-from app.storage.local import LocalStorage
+from app.services.transcript_cache import build_transcript_cache
+from app.services.webhooks import build_webhook_dispatcher
+from app.storage.local import build_storage
+from app.utils.body_limit import BodySizeLimitMiddleware
+
+# Headroom for multipart boundaries and form fields on top of the file itself.
+FORM_OVERHEAD_BYTES = 1024 * 1024
 
 
-def create_app() -> FastAPI:
+def create_app(*, runner_factory: Optional[RunnerFactory] = None) -> FastAPI:
     settings = get_settings()
 
     app = FastAPI(
@@ -20,6 +36,12 @@ def create_app() -> FastAPI:
         description="REST API for the speech transcription web application",
     )
 
+    # Middleware added last runs first: CORS wraps the size limit, so a 413 carries CORS headers
+    # and browsers can read it instead of reporting a network error.
+    app.add_middleware(
+        BodySizeLimitMiddleware,
+        max_bytes=settings.max_upload_mb * 1024 * 1024 + FORM_OVERHEAD_BYTES,
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.allowed_origins,
@@ -29,19 +51,140 @@ def create_app() -> FastAPI:
     )
 
     app.state.settings = settings
-    app.state.job_store = JobStore()
-    storage = LocalStorage(settings.upload_dir, settings.output_dir)
-    runner = WhisperRunner(settings.model_size)
+    app.state.broker = build_broker(settings)
+    app.state.job_store = app.state.broker.job_store() if app.state.broker else build_job_store(settings)
+    app.state.storage = build_storage(settings)
+    app.state.model_registry = ModelRegistry.from_settings(settings, factory=runner_factory)
+    app.state.job_queue = (
+        JobQueue(
+            workers=settings.inference_workers,
+            max_size=settings.max_queue_size,
+            client_max_concurrent=settings.client_max_concurrent,
+        )
+        if app.state.broker is None
+        else None
+    )
+    # Behind a broker, jobs run (and hit the cache and batch scheduler) in the worker processes.
+    local_inference = app.state.broker is None
+    app.state.transcript_cache = build_transcript_cache(settings) if local_inference else None
+    app.state.batch_scheduler = build_batch_scheduler(settings) if local_inference else None
+    app.state.decode_pool = (
+        DecodePool(settings.decode_workers, max_pending=settings.inference_workers * 2)
+        if settings.decode_workers > 0 and app.state.job_queue is not None
+        else None
+    )
+    app.state.metrics = PipelineMetrics()
+    app.state.search_index = SearchIndex(settings.search_index_path) if settings.search_enabled else None
+    app.state.webhooks = build_webhook_dispatcher(settings, metrics=app.state.metrics)
     app.state.transcriber_service = TranscriberService(
         settings=settings,
         job_store=app.state.job_store,
-        storage=storage,
-        runner=runner,
+        storage=app.state.storage,
+        registry=app.state.model_registry,
+        job_queue=app.state.job_queue,
+        broker=app.state.broker,
+        cache=app.state.transcript_cache,
+        batcher=app.state.batch_scheduler,
+        decoder=app.state.decode_pool,
+        metrics=app.state.metrics,
+        search_index=app.state.search_index,
+        webhooks=app.state.webhooks,
+    )
+    # Live sessions need a local model, so API nodes in front of a broker do not serve them.
+    app.state.live_sessions = (
+        LiveSessionManager(settings, app.state.model_registry)
+        if settings.live_max_sessions > 0 and app.state.broker is None
+        else None
     )
+    _register_gauges(app)
+
+    app.state.retention_sweeper = RetentionSweeper(
+        app.state.transcriber_service.purge_expired,
+        interval_seconds=settings.retention_sweep_seconds,
+    )
+
+    # A SQLite store may be shared with other API processes: keep our jobs marked live and fail
+    # the ones left behind by processes that stopped heartbeating.
+    app.state.job_store_keeper = None
+    if app.state.broker is None and settings.job_store_backend == "sqlite":
+        store = app.state.job_store
 
+        def keep_alive() -> int:
+            store.heartbeat()
+            return store.fail_unfinished(ABANDONED_JOB_ERROR, stale_seconds=settings.worker_stale_seconds)
+
+        app.state.job_store_keeper = RetentionSweeper(
+            keep_alive, interval_seconds=settings.worker_heartbeat_seconds, name="job-store-heartbeat"
+        )
+
+    @app.on_event("startup")
+    def _start_workers() -> None:
+        if app.state.batch_scheduler is not None:
+            app.state.batch_scheduler.start()
+        app.state.retention_sweeper.start()
+        if app.state.job_store_keeper is not None:
+            app.state.job_store_keeper.start()
+        app.state.webhooks.start()
+        if app.state.job_queue is not None:
+            app.state.job_queue.start()
+            app.state.model_registry.warm_up(settings.warmup_models)
+
+    @app.on_event("shutdown")
+    def _stop_workers() -> None:
+        app.state.retention_sweeper.stop(timeout=5.0)
+        if app.state.job_store_keeper is not None:
+            app.state.job_store_keeper.stop(timeout=5.0)
+        if app.state.job_queue is not None:
+            app.state.job_queue.stop(timeout=5.0)
+        if app.state.batch_scheduler is not None:
+            app.state.batch_scheduler.stop(timeout=5.0)
+        if app.state.decode_pool is not None:
+            app.state.decode_pool.close()
+        app.state.webhooks.stop(timeout=5.0)
+        app.state.model_registry.close()
+
+    app.include_router(health.router, tags=["health"])
+    app.include_router(metrics.router, tags=["metrics"])
     app.include_router(transcription.router, prefix=settings.api_prefix, tags=["transcription"])
+    app.include_router(search.router, prefix=settings.api_prefix, tags=["search"])
+    app.include_router(live.router, prefix=settings.api_prefix, tags=["live"])
 
     return app
 
 
+def _register_gauges(app: FastAPI) -> None:
+    state = app.state
+    gauges = state.metrics
+
+    def queue_depth() -> float:
+        if state.broker is not None:
+            return state.broker.depth()
+        return state.job_queue.depth
+
+    gauges.gauge("stt_queue_depth", "Jobs waiting for an inference worker.", queue_depth)
+    if state.job_queue is not None:
+        gauges.gauge("stt_active_workers", "Inference workers currently running a job.", lambda: state.job_queue.active_workers)
+    gauges.gauge("stt_job_store_size", "Jobs held by the job store.", lambda: len(state.job_store))
+    gauges.gauge(
+        "stt_status_waiters", "Long-poll and SSE requests waiting on a job.", lambda: state.transcriber_service.events.waiting
+    )
+    gauges.gauge("stt_webhooks_pending", "Webhook deliveries queued or awaiting a retry.", lambda: state.webhooks.pending)
+    gauges.gauge("stt_loaded_models", "Whisper runners resident in memory.", lambda: len(list(state.model_registry.loaded())))
+    if state.live_sessions is not None:
+        gauges.gauge("stt_live_sessions", "Live WebSocket sessions in progress.", lambda: state.live_sessions.active)
+    if state.settings.output_max_mb > 0:
+        gauges.gauge(
+            "stt_output_bytes",
+            "Output bytes on local disk, as tracked by the quota.",
+            lambda: state.storage.usage_bytes or 0,
+        )
+    if state.search_index is not None:
+        gauges.gauge("stt_search_transcripts", "Transcripts in the search index.", lambda: len(state.search_index))
+    if state.transcript_cache is not None:
+        cache = state.transcript_cache
+        gauges.gauge("stt_cache_hit_rate", "Transcript cache hits per lookup.", lambda: cache.hit_rate)
+        gauges.gauge("stt_cache_hits", "Transcript cache hits since start.", lambda: cache.hits)
+        gauges.gauge("stt_cache_misses", "Transcript cache misses since start.", lambda: cache.misses)
+
+
 app = create_app()
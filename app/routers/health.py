@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Request, Response, status
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+def liveness() -> dict:
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def readiness(request: Request, response: Response) -> dict:
+    if getattr(request.app.state, "broker", None) is not None:
+        # Inference runs on separate worker nodes; this API node never loads a model.
+        return {"status": "ready"}
+    registry = getattr(request.app.state, "model_registry", None)
+    ready = registry is not None and registry.is_loaded()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if ready else "loading"}
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, WebSocket
+
+from app.services.live_sessions import CLOSE_TRY_AGAIN_LATER
+
+router = APIRouter()
+
+
+@router.websocket("/live")
+async def live_transcription(websocket: WebSocket) -> None:
+    """Live transcription of streamed audio; see ``LiveSessionManager`` for the protocol."""
+
+    manager = getattr(websocket.app.state, "live_sessions", None)
+    if manager is None:
+        await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason="LIVE_DISABLED")
+        return
+    await manager.serve(websocket)
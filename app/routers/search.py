@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from app.routers.transcription import get_service
+from app.schemas import ErrorResponse, SearchResponse
+from app.services.transcriber import TranscriberService
+
+router = APIRouter()
+
+
+@router.get(
+    "/search",
+    response_model=SearchResponse,
+    responses={400: {"model": ErrorResponse}, 503: {"model": ErrorResponse}},
+)
+def search_transcripts(
+    q: str = Query(..., min_length=1, max_length=512, description='Terms, "quoted phrases" and prefix* terms; all must match'),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    order: Literal["recent", "relevance"] = Query("recent", description="Newest transcripts first, or BM25 rank"),
+    service: TranscriberService = Depends(get_service),
+) -> SearchResponse:
+    return service.search(q, limit=limit, offset=offset, order=order)
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import FileResponse
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 
 from app.schemas import ErrorResponse, OutputMode, TranscriptionAcceptedResponse, TranscriptionStatusResponse
+from app.services import formatters
 from app.services.transcriber import TranscriberService
+from app.utils import http_files
 
 router = APIRouter()
 
@@ -22,16 +26,45 @@ def get_service(request: Request) -> TranscriberService:
     response_model=TranscriptionAcceptedResponse,
     responses={
         400: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
         415: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
 async def transcribe_audio(
+    request: Request,
     file: UploadFile = File(..., description="Audio file to transcribe"),
     mode: OutputMode = Form(OutputMode.txt, description="Desired output format"),
+    formats: Optional[str] = Form(None, description="Comma-separated output formats; overrides mode"),
+    word_timestamps: bool = Form(False, description="Include word-level timestamps in the JSON output"),
+    model: Optional[str] = Form(None, description="Whisper model size; defaults to MODEL_SIZE"),
+    compute_type: Optional[str] = Form(None, description="CTranslate2 compute type override"),
+    preset: Optional[str] = Form(None, description="Decoding preset (e.g. fast, balanced, accurate)"),
+    language: Optional[str] = Form(None, description="Language code; skips language detection"),
+    priority: Optional[str] = Form(None, description="Priority class: high, normal or low"),
+    callback_url: Optional[str] = Form(None, description="URL to POST the final status to when the job finishes"),
     service: TranscriberService = Depends(get_service),
 ) -> TranscriptionAcceptedResponse:
-    return await service.transcribe(file, mode)
+    modes = [mode]
+    if formats:
+        try:
+            modes = [OutputMode(item.strip()) for item in formats.split(",") if item.strip()]
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="INVALID_MODE") from exc
+    return await service.transcribe(
+        file,
+        modes,
+        model=model,
+        compute_type=compute_type,
+        word_timestamps=word_timestamps,
+        preset=preset,
+        language=language,
+        priority=priority,
+        api_key=request.headers.get(service.settings.client_id_header),
+        client_host=request.client.host if request.client else None,
+        callback_url=callback_url,
+    )
 
 
 @router.get(
@@ -39,8 +72,30 @@ async def transcribe_audio(
     response_model=TranscriptionStatusResponse,
     responses={404: {"model": ErrorResponse}},
 )
-def get_status(transcription_id: str, service: TranscriberService = Depends(get_service)) -> TranscriptionStatusResponse:
-    return service.get_status(transcription_id)
+async def get_status(
+    transcription_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to hold the request until the status changes"),
+    service: TranscriberService = Depends(get_service),
+) -> TranscriptionStatusResponse:
+    return await service.wait_status(transcription_id, wait=wait)
+
+
+@router.get(
+    "/stream/{transcription_id}",
+    responses={404: {"model": ErrorResponse}},
+)
+def stream_transcription(transcription_id: str, service: TranscriberService = Depends(get_service)) -> StreamingResponse:
+    events = service.stream_segments(transcription_id)
+    return StreamingResponse(events, media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get(
+    "/progress/{transcription_id}",
+    responses={404: {"model": ErrorResponse}},
+)
+def stream_progress(transcription_id: str, service: TranscriberService = Depends(get_service)) -> StreamingResponse:
+    events = service.stream_progress(transcription_id)
+    return StreamingResponse(events, media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @router.get(
@@ -48,12 +103,12 @@ def get_status(transcription_id: str, service: TranscriberService = Depends(get_
     responses={
         404: {"model": ErrorResponse},
         409: {"model": ErrorResponse},
+        416: {"description": "Requested range not satisfiable"},
     },
 )
-def download_transcript(filename: str, service: TranscriberService = Depends(get_service)) -> FileResponse:
-    service.ensure_file_available(filename)
-    path = service.resolve_output_path(filename)
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
-    media_type = "application/x-subrip" if filename.endswith(".srt") else "text/plain"
-    return FileResponse(path, media_type=media_type, filename=filename)
+def download_transcript(
+    filename: str, request: Request, service: TranscriberService = Depends(get_service)
+) -> Response:
+    path, stat = service.resolve_download(filename)
+    media_type = formatters.MEDIA_TYPES.get(path.suffix.lstrip("."), "text/plain")
+    return http_files.build_file_response(request, path, stat, media_type=media_type, filename=filename)
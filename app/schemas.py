@@ -2,33 +2,65 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
 
+JobStatus = Literal["queued", "processing", "completed", "failed"]
+
+
 class OutputMode(str, Enum):
     txt = "txt"
     srt = "srt"
+    vtt = "vtt"
+    json = "json"
+    tsv = "tsv"
 
 
 class TranscriptionAcceptedResponse(BaseModel):
     transcription_id: str = Field(..., description="Unique identifier for the transcription job")
-    status: Literal["processing", "completed", "failed"] = "processing"
+    status: JobStatus = "queued"
     started_at: datetime
     output_type: OutputMode
+    output_types: List[OutputMode] = Field(default_factory=list)
     input_filename: str
 
 
 class TranscriptionStatusResponse(BaseModel):
     transcription_id: str
-    status: Literal["processing", "completed", "failed"]
+    status: JobStatus
     created_at: datetime
     updated_at: datetime
     duration_seconds: Optional[float] = None
+    progress_percent: Optional[float] = Field(None, description="Percent of the audio decoded so far")
     output_type: Optional[OutputMode] = None
+    model_size: Optional[str] = None
+    preset: Optional[str] = None
+    language: Optional[str] = None
+    priority: Optional[str] = None
+    queue_position: Optional[int] = Field(None, description="1-based position among queued jobs; 0 while running")
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds until the job completes")
     download_url: Optional[str] = None
+    download_urls: Dict[str, str] = Field(default_factory=dict)
     error: Optional[str] = None
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+
+class SearchHitResponse(BaseModel):
+    transcription_id: str
+    start: float = Field(..., description="Segment start in seconds")
+    end: float = Field(..., description="Segment end in seconds")
+    text: str
+    highlighted: str = Field(..., description="HTML-escaped segment text with matches wrapped in <mark> tags")
+    input_filename: Optional[str] = None
+    download_url: Optional[str] = None
+
+
+class SearchResponse(BaseModel):
+    query: str
+    hits: List[SearchHitResponse] = Field(default_factory=list)
+    next_offset: Optional[int] = Field(None, description="Offset of the next page; null on the last page")
 
 
 class ErrorResponse(BaseModel):
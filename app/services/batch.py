@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from app.inference.whisper_runner import WhisperRunner
+from app.services import formatters
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".flac", ".ogg", ".opus", ".aac", ".webm", ".mp4")
+
+RENDERERS = formatters.RENDERERS
+
+MANIFEST_NAME = "manifest.jsonl"
+
+_worker_runner: Optional[WhisperRunner] = None
+
+
+@dataclass
+class BatchStats:
+    files: int = 0
+    skipped: int = 0
+    failed: int = 0
+    audio_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def realtime_factor(self) -> float:
+        """Audio seconds transcribed per wall-clock second."""
+
+        return self.audio_seconds / self.wall_seconds if self.wall_seconds else 0.0
+
+
+def discover_audio(inputs: Iterable[str]) -> List[Path]:
+    """Expand directories (recursively) and glob patterns into a sorted, de-duplicated file list."""
+
+    found: Dict[str, Path] = {}
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates: Iterable[Path] = (p for p in path.rglob("*") if p.suffix.lower() in AUDIO_EXTENSIONS)
+        else:
+            candidates = (Path(match) for match in glob.glob(item, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file():
+                found.setdefault(str(candidate.resolve()), candidate)
+    return [found[key] for key in sorted(found)]
+
+
+def _fingerprint(path: Path) -> str:
+    stat = path.stat()
+    return f"{path.resolve()}|{stat.st_size}|{int(stat.st_mtime)}"
+
+
+def _output_stem(path: Path, duplicates: AbstractSet[str]) -> str:
+    if path.stem not in duplicates:
+        return path.stem
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:8]
+    return f"{path.stem}-{digest}"
+
+
+def _init_worker(model_size: str, compute_type: Optional[str], beam_size: int, language: Optional[str], cpu_threads: int) -> None:
+    global _worker_runner  # pylint: disable=global-statement
+    _worker_runner = WhisperRunner(
+        model_size, beam_size=beam_size, language=language, compute_type=compute_type, cpu_threads=cpu_threads
+    )
+
+
+def _transcribe_file(audio_path: str, output_dir: str, stem: str, formats: Sequence[str]) -> Dict[str, object]:
+    assert _worker_runner is not None, "worker runner not initialised"
+    result = _worker_runner.run(audio_path)
+    outputs = []
+    for fmt in formats:
+        target = Path(output_dir) / f"{stem}.{fmt}"
+        tmp = target.with_suffix(target.suffix + ".part")
+        with tmp.open("w", encoding="utf-8") as handle:
+            formatters.write_transcript(handle, fmt, result)
+        os.replace(tmp, target)
+        outputs.append(str(target))
+    return {"duration_seconds": result.duration_seconds, "language": result.language, "outputs": outputs}
+
+
+class BatchTranscriber:
+    """Transcribes many files with a pool of model processes, resuming from a manifest.
+
+    Each file is decoded once and rendered to every requested format. Finished files are
+    appended to ``manifest.jsonl`` in the output directory (keyed by path, size and mtime),
+    so an interrupted run picks up where it stopped.
+    """
+
+    def __init__(
+        self,
+        *,
+        output_dir: str,
+        model_size: str,
+        workers: int,
+        formats: Sequence[str],
+        compute_type: Optional[str] = None,
+        beam_size: int = 5,
+        language: Optional[str] = None,
+    ) -> None:
+        unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+        if unknown:
+            raise ValueError(f"Unsupported formats: {', '.join(unknown)}")
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.model_size = model_size
+        self.workers = max(1, workers)
+        self.formats = list(formats)
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.language = language
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+
+    def _manifest_entries(self) -> Iterator[dict]:
+        if not self.manifest_path.exists():
+            return
+        with self.manifest_path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted run
+
+    def load_manifest(self) -> Dict[str, dict]:
+        done: Dict[str, dict] = {}
+        for entry in self._manifest_entries():
+            if set(self.formats) <= set(entry.get("formats", [])):
+                done[entry["fingerprint"]] = entry
+        return done
+
+    def _duplicate_stems(self, files: Sequence[Path]) -> AbstractSet[str]:
+        """Stems that need a path digest: shared within ``files`` or already written for another file.
+
+        Computed over every input, not just the pending ones, so a file's output name does not
+        depend on how far an earlier run got.
+        """
+
+        counts = Counter(path.stem for path in files)
+        duplicates = {stem for stem, count in counts.items() if count > 1}
+        written: Dict[str, str] = {}
+        for entry in self._manifest_entries():
+            for output in entry.get("outputs", []):
+                written.setdefault(Path(output).stem, str(Path(entry["path"]).resolve()))
+        for path in files:
+            owner = written.get(path.stem)
+            if owner is not None and owner != str(path.resolve()):
+                duplicates.add(path.stem)
+        return duplicates
+
+    def run(self, files: Sequence[Path]) -> BatchStats:
+        stats = BatchStats()
+        done = self.load_manifest()
+        pending = []
+        for path in files:
+            fingerprint = _fingerprint(path)
+            if fingerprint in done:
+                stats.skipped += 1
+            else:
+                pending.append((path, fingerprint))
+        duplicates = self._duplicate_stems(files)
+
+        started = time.perf_counter()
+        if pending:
+            cpu_threads = max(1, (os.cpu_count() or 1) // self.workers)
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_size, self.compute_type, self.beam_size, self.language, cpu_threads),
+            ) as pool, self.manifest_path.open("a", encoding="utf-8") as manifest:
+                futures = {
+                    pool.submit(
+                        _transcribe_file, str(path), str(self.output_dir), _output_stem(path, duplicates), self.formats
+                    ): (path, fingerprint)
+                    for path, fingerprint in pending
+                }
+                for future in as_completed(futures):
+                    path, fingerprint = futures[future]
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:  # pylint: disable=broad-except
+                        logger.error("Failed to transcribe %s: %s", path, exc)
+                        stats.failed += 1
+                        stats.failures.append(str(path))
+                        continue
+                    stats.files += 1
+                    stats.audio_seconds += float(outcome["duration_seconds"])
+                    entry = {"fingerprint": fingerprint, "path": str(path), "formats": self.formats, **outcome}
+                    manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                    manifest.flush()
+                    logger.info("Transcribed %s (%.1fs audio)", path, outcome["duration_seconds"])
+        stats.wall_seconds = time.perf_counter() - started
+        return stats
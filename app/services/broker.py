@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from app.config import Settings
+from app.services.job_queue import QueueFullError
+from app.services.job_store import BaseJobStore
+
+
+class ClaimLostError(RuntimeError):
+    """A worker's claim on a job went stale and the job was requeued or failed without it."""
+
+
+@dataclass
+class BrokerJob:
+    """Work item handed from API nodes to inference workers."""
+
+    transcription_id: str
+    upload_path: str
+    audio_sha256: str
+    attempts: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "BrokerJob":
+        return cls(**json.loads(raw))
+
+
+class Broker(ABC):
+    """Shared job queue plus job state, so API nodes and inference workers can scale apart.
+
+    Workers ``claim`` jobs, ``heartbeat`` while processing and ``ack`` when done; claims whose
+    heartbeat goes stale (crashed worker) are put back on the queue by ``requeue_stale``. A slow
+    worker can lose its claim that way, so it checks ``owns`` before committing results, and
+    ``ack`` only succeeds for the worker that still holds the claim.
+    """
+
+    @abstractmethod
+    def job_store(self) -> BaseJobStore:
+        ...
+
+    @abstractmethod
+    def enqueue(self, job: BrokerJob, *, max_depth: int) -> None:
+        """Queue ``job``; raises ``QueueFullError`` when ``max_depth`` jobs are already waiting."""
+
+    @abstractmethod
+    def claim(self, worker_id: str, timeout: float) -> Optional[BrokerJob]:
+        ...
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str, transcription_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def owns(self, worker_id: str, transcription_id: str) -> bool:
+        """Whether ``worker_id`` still holds the claim on ``transcription_id``."""
+
+    @abstractmethod
+    def ack(self, worker_id: str, transcription_id: str) -> bool:
+        """Remove the finished job; returns ``False`` when ``worker_id`` no longer holds its claim."""
+
+    @abstractmethod
+    def requeue_stale(self, stale_after: float, *, max_attempts: int) -> List[BrokerJob]:
+        """Requeue claims without a recent heartbeat; returns jobs that ran out of attempts."""
+
+    @abstractmethod
+    def depth(self) -> int:
+        ...
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS broker_queue (
+    transcription_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    worker_id TEXT,
+    enqueued_at REAL NOT NULL,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS broker_queue_pending ON broker_queue (worker_id, enqueued_at);
+CREATE INDEX IF NOT EXISTS broker_queue_heartbeat ON broker_queue (heartbeat_at);
+"""
+
+
+class SQLiteBroker(Broker):
+    """Single-host broker backed by a SQLite file shared between processes."""
+
+    POLL_SECONDS = 0.25
+
+    def __init__(self, path: str) -> None:
+        from app.services.sqlite_job_store import SQLiteJobStore
+
+        self.path = Path(path)
+        self._store = SQLiteJobStore(path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def job_store(self) -> BaseJobStore:
+        return self._store
+
+    def enqueue(self, job: BrokerJob, *, max_depth: int) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            (waiting,) = conn.execute("SELECT COUNT(*) FROM broker_queue WHERE worker_id IS NULL").fetchone()
+            if waiting >= max_depth:
+                raise QueueFullError("Job queue is full")
+            conn.execute(
+                "INSERT OR REPLACE INTO broker_queue (transcription_id, payload, worker_id, enqueued_at, heartbeat_at) "
+                "VALUES (?, ?, NULL, ?, NULL)",
+                (job.transcription_id, job.to_json(), time.time()),
+            )
+
+    def claim(self, worker_id: str, timeout: float) -> Optional[BrokerJob]:
+        deadline = time.monotonic() + timeout
+        while True:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT transcription_id, payload FROM broker_queue WHERE worker_id IS NULL "
+                    "ORDER BY enqueued_at LIMIT 1"
+                ).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE broker_queue SET worker_id = ?, heartbeat_at = ? WHERE transcription_id = ?",
+                        (worker_id, time.time(), row[0]),
+                    )
+                    return BrokerJob.from_json(row[1])
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.POLL_SECONDS)
+
+    def heartbeat(self, worker_id: str, transcription_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE broker_queue SET heartbeat_at = ? WHERE transcription_id = ? AND worker_id = ?",
+                (time.time(), transcription_id, worker_id),
+            )
+
+    def owns(self, worker_id: str, transcription_id: str) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM broker_queue WHERE transcription_id = ? AND worker_id = ?", (transcription_id, worker_id)
+        ).fetchone()
+        return row is not None
+
+    def ack(self, worker_id: str, transcription_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM broker_queue WHERE transcription_id = ? AND worker_id = ?", (transcription_id, worker_id)
+            )
+        return cursor.rowcount > 0
+
+    def requeue_stale(self, stale_after: float, *, max_attempts: int) -> List[BrokerJob]:
+        exhausted: List[BrokerJob] = []
+        requeued: List[str] = []
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT transcription_id, payload FROM broker_queue WHERE worker_id IS NOT NULL AND heartbeat_at < ?",
+                (time.time() - stale_after,),
+            ).fetchall()
+            for transcription_id, payload in rows:
+                job = BrokerJob.from_json(payload)
+                job.attempts += 1
+                if job.attempts >= max_attempts:
+                    conn.execute("DELETE FROM broker_queue WHERE transcription_id = ?", (transcription_id,))
+                    exhausted.append(job)
+                    continue
+                conn.execute(
+                    "UPDATE broker_queue SET worker_id = NULL, heartbeat_at = NULL, payload = ? "
+                    "WHERE transcription_id = ?",
+                    (job.to_json(), transcription_id),
+                )
+                requeued.append(transcription_id)
+        for job in exhausted:
+            self._store.update(job.transcription_id, status="failed", error="Inference worker lost")
+        for transcription_id in requeued:
+            self._store.update(transcription_id, status="queued")
+        return exhausted
+
+    def depth(self) -> int:
+        (waiting,) = self._connect().execute(
+            "SELECT COUNT(*) FROM broker_queue WHERE worker_id IS NULL"
+        ).fetchone()
+        return waiting
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+
+def build_broker(settings: Settings) -> Optional[Broker]:
+    if settings.broker_backend == "sqlite":
+        return SQLiteBroker(settings.broker_url or settings.job_store_path)
+    if settings.broker_backend == "redis":
+        from app.services.redis_broker import RedisBroker
+
+        return RedisBroker(settings.broker_url or "redis://localhost:6379/0")
+    return None
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Sequence, TextIO, Tuple
+
+from app.inference.whisper_runner import Segment, SegmentTable, TranscriptionResult
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+# Segments formatted per write; bounds peak memory independently of transcript length.
+CHUNK_SEGMENTS = 4096
+
+# (index of the first row, start seconds, end seconds, texts) -> one rendered block per segment.
+RowFormatter = Callable[[int, "np.ndarray", "np.ndarray", Sequence[str]], List[str]]
+
+
+@dataclass
+class SegmentColumns:
+    """Columnar view of a transcript: float64 start/end arrays plus the texts."""
+
+    starts: "np.ndarray"
+    ends: "np.ndarray"
+    texts: Sequence[str]
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[Segment]) -> "SegmentColumns":
+        if isinstance(segments, SegmentTable):
+            return cls(starts=segments.starts, ends=segments.ends, texts=segments.texts)
+        import numpy as np  # type: ignore[import-not-found]
+
+        count = len(segments)
+        return cls(
+            starts=np.fromiter((seg.start for seg in segments), dtype=np.float64, count=count),
+            ends=np.fromiter((seg.end for seg in segments), dtype=np.float64, count=count),
+            texts=[seg.text for seg in segments],
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def slice(self, start: int, stop: int) -> "SegmentColumns":
+        return SegmentColumns(self.starts[start:stop], self.ends[start:stop], self.texts[start:stop])
+
+
+def to_milliseconds(seconds: "np.ndarray") -> "np.ndarray":
+    """Round to the nearest millisecond (1.001 s -> 1001 ms), clamping negatives to zero."""
+
+    import numpy as np  # type: ignore[import-not-found]
+
+    return np.maximum(np.rint(np.asarray(seconds, dtype=np.float64) * 1000), 0).astype(np.int64)
+
+
+def split_clock(seconds: "np.ndarray") -> Tuple[List[int], List[int], List[int], List[int]]:
+    """Hours, minutes, seconds and milliseconds columns for ``HH:MM:SS,mmm`` timestamps."""
+
+    import numpy as np  # type: ignore[import-not-found]
+
+    hours, rest = np.divmod(to_milliseconds(seconds), 3_600_000)
+    minutes, rest = np.divmod(rest, 60_000)
+    secs, millis = np.divmod(rest, 1000)
+    return hours.tolist(), minutes.tolist(), secs.tolist(), millis.tolist()
+
+
+def text_rows(first: int, starts: "np.ndarray", ends: "np.ndarray", texts: Sequence[str]) -> List[str]:
+    return ["[%.2f - %.2f] %s" % row for row in zip(starts.tolist(), ends.tolist(), texts)]
+
+
+def srt_rows(first: int, starts: "np.ndarray", ends: "np.ndarray", texts: Sequence[str]) -> List[str]:
+    template = "%d\n%02d:%02d:%02d,%03d --> %02d:%02d:%02d,%03d\n%s\n"
+    indices = range(first, first + len(texts))
+    return [template % row for row in zip(indices, *split_clock(starts), *split_clock(ends), texts)]
+
+
+def vtt_rows(first: int, starts: "np.ndarray", ends: "np.ndarray", texts: Sequence[str]) -> List[str]:
+    template = "%02d:%02d:%02d.%03d --> %02d:%02d:%02d.%03d\n%s\n"
+    return [template % row for row in zip(*split_clock(starts), *split_clock(ends), texts)]
+
+
+def tsv_rows(first: int, starts: "np.ndarray", ends: "np.ndarray", texts: Sequence[str]) -> List[str]:
+    return [
+        "%d\t%d\t%s\n" % (start, end, text.replace("\t", " "))
+        for start, end, text in zip(to_milliseconds(starts).tolist(), to_milliseconds(ends).tolist(), texts)
+    ]
+
+
+@dataclass(frozen=True)
+class StreamFormat:
+    """A text format rendered as ``header`` + blocks joined by ``separator``.
+
+    Whole transcripts are formatted column-wise in chunks of ``CHUNK_SEGMENTS`` and written
+    as they are produced; ``block`` renders a single segment through the same row formatter,
+    so live and batch output are byte-identical.
+    """
+
+    rows: RowFormatter
+    header: str = ""
+    separator: str = "\n"
+
+    def block(self, index: int, seg: Segment) -> str:
+        import numpy as np  # type: ignore[import-not-found]
+
+        return self.rows(index, np.array([seg.start]), np.array([seg.end]), [seg.text])[0]
+
+    def iter_chunks(self, columns: SegmentColumns, *, chunk_segments: int = CHUNK_SEGMENTS) -> Iterator[str]:
+        if self.header:
+            yield self.header
+        for offset in range(0, len(columns), chunk_segments):
+            part = columns.slice(offset, offset + chunk_segments)
+            rows = self.rows(offset + 1, part.starts, part.ends, part.texts)
+            yield (self.separator if offset else "") + self.separator.join(rows)
+
+    def write(self, handle: TextIO, columns: SegmentColumns) -> None:
+        for chunk in self.iter_chunks(columns):
+            handle.write(chunk)
+
+    def render(self, result: TranscriptionResult) -> str:
+        return "".join(self.iter_chunks(SegmentColumns.from_segments(result.segments)))
+
+
+def format_text_line(index: int, seg: Segment) -> str:
+    return STREAM_FORMATS["txt"].block(index, seg)
+
+
+def format_srt_block(index: int, seg: Segment) -> str:
+    return STREAM_FORMATS["srt"].block(index, seg)
+
+
+def format_vtt_block(index: int, seg: Segment) -> str:
+    return STREAM_FORMATS["vtt"].block(index, seg)
+
+
+def format_tsv_line(index: int, seg: Segment) -> str:
+    return STREAM_FORMATS["tsv"].block(index, seg)
+
+
+STREAM_FORMATS: Dict[str, StreamFormat] = {
+    "txt": StreamFormat(rows=text_rows),
+    "srt": StreamFormat(rows=srt_rows),
+    "vtt": StreamFormat(rows=vtt_rows, header="WEBVTT\n\n"),
+    "tsv": StreamFormat(rows=tsv_rows, header="start\tend\ttext\n", separator=""),
+}
+
+MEDIA_TYPES: Dict[str, str] = {
+    "txt": "text/plain",
+    "srt": "application/x-subrip",
+    "vtt": "text/vtt",
+    "tsv": "text/tab-separated-values",
+    "json": "application/json",
+}
+
+
+def segments_to_text(result: TranscriptionResult) -> str:
+    return STREAM_FORMATS["txt"].render(result)
+
+
+def segments_to_srt(result: TranscriptionResult) -> str:
+    return STREAM_FORMATS["srt"].render(result)
+
+
+def segments_to_vtt(result: TranscriptionResult) -> str:
+    return STREAM_FORMATS["vtt"].render(result)
+
+
+def segments_to_tsv(result: TranscriptionResult) -> str:
+    return STREAM_FORMATS["tsv"].render(result)
+
+
+def segments_to_json(result: TranscriptionResult) -> str:
+    """Segments plus metadata; ``words`` is only present when word timestamps were requested."""
+
+    return json.dumps(result.to_dict(), ensure_ascii=False)
+
+
+def write_transcript(handle: TextIO, fmt: str, result: TranscriptionResult) -> None:
+    """Render ``result`` as ``fmt`` straight into ``handle`` without building the whole payload."""
+
+    if fmt in STREAM_FORMATS:
+        STREAM_FORMATS[fmt].write(handle, SegmentColumns.from_segments(result.segments))
+        return
+    if fmt != "json":
+        raise KeyError(fmt)
+    for chunk in json.JSONEncoder(ensure_ascii=False).iterencode(result.to_dict()):
+        handle.write(chunk)
+
+
+RENDERERS: Dict[str, Callable[[TranscriptionResult], str]] = {
+    "txt": segments_to_text,
+    "srt": segments_to_srt,
+    "vtt": segments_to_vtt,
+    "tsv": segments_to_tsv,
+    "json": segments_to_json,
+}
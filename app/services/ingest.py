@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.inference.audio import PCM_SUFFIX, decode_to_pcm
+from app.storage.base import AtomicWriter, Storage
+
+logger = logging.getLogger(__name__)
+
+# Bytes kept from the start of the upload for sniffing and header parsing.
+HEAD_BYTES = 4096
+MIN_SNIFF_BYTES = 12
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds ``max_upload_mb``."""
+
+
+class UnsupportedMediaError(ValueError):
+    """Raised when an upload is not a recognised, decodable audio container."""
+
+
+@dataclass
+class IngestedUpload:
+    path: Path
+    sha256: str
+    size_bytes: int
+    container: str
+    duration_seconds: Optional[float] = None
+
+
+def sniff_container(head: bytes) -> Optional[str]:
+    """Identify the audio container from its leading magic bytes."""
+
+    if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+        return "aiff"
+    if head[:4] == b"caff":
+        return "caf"
+    if head[:5] == b"#!AMR":
+        return "amr"
+    if head[:8] == b"\x30\x26\xb2\x75\x8e\x66\xcf\x11":
+        return "asf"
+    if head[:3] == b"ID3":
+        return "mp3"
+    if len(head) >= 2 and head[0] == 0xFF:
+        if head[1] & 0xF6 == 0xF0:
+            return "aac"
+        if head[1] & 0xE0 == 0xE0:
+            return "mp3"
+    return None
+
+
+def wav_duration(head: bytes, size_bytes: int) -> Optional[float]:
+    """Read the duration from a RIFF/WAVE header without decoding any samples."""
+
+    offset = 12
+    byte_rate = 0
+    while offset + 8 <= len(head):
+        chunk_id = head[offset : offset + 4]
+        chunk_size = int.from_bytes(head[offset + 4 : offset + 8], "little")
+        if chunk_id == b"fmt " and offset + 20 <= len(head):
+            byte_rate = int.from_bytes(head[offset + 16 : offset + 20], "little")
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            data_size = min(chunk_size, size_bytes - offset - 8)
+            return max(0, data_size) / byte_rate
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+def probe_duration(path: Path) -> Optional[float]:
+    """Read the container duration with PyAV (installed with Faster-Whisper) without decoding.
+
+    Raises ``UnsupportedMediaError`` when ffmpeg cannot open the file or finds no audio stream.
+    """
+
+    try:
+        import av  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    try:
+        with av.open(str(path), metadata_errors="ignore") as container:
+            if not container.streams.audio:
+                raise UnsupportedMediaError("No audio stream")
+            if container.duration is None:
+                return None
+            return container.duration / av.time_base
+    except av.error.FFmpegError as exc:
+        raise UnsupportedMediaError(str(exc)) from exc
+
+
+class UploadIngestor:
+    """Streams uploads to storage while enforcing the size limit, sniffing and hashing them.
+
+    The container is identified from the first bytes, so non-audio uploads are rejected
+    before the rest of the body is written. With ``decode_pcm`` the upload is decoded once to
+    raw 16 kHz PCM and the compressed original is dropped, so inference skips ffmpeg.
+    Hashing and disk writes run on the thread pool, so large uploads never stall the event loop.
+    """
+
+    CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, storage: Storage, *, max_bytes: int, decode_pcm: bool = False) -> None:
+        self.storage = storage
+        self.max_bytes = max_bytes
+        self.decode_pcm = decode_pcm
+
+    async def ingest(self, upload: UploadFile, filename: str) -> IngestedUpload:
+        destination = self.storage.resolve_upload_path(filename)
+        hasher = hashlib.sha256()
+        head = b""
+        size = 0
+        container: Optional[str] = None
+        try:
+            buffer = await run_in_threadpool(self.storage.open_upload, filename)
+            try:
+                while True:
+                    chunk = await upload.read(self.CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadTooLargeError(f"Upload exceeds {self.max_bytes} bytes")
+                    if len(head) < HEAD_BYTES:
+                        head += chunk[: HEAD_BYTES - len(head)]
+                    if container is None and len(head) >= MIN_SNIFF_BYTES:
+                        container = self._sniff(head)
+                    await run_in_threadpool(_write_chunk, buffer, hasher, chunk)
+            except BaseException:
+                # Cleanup stays inline: under a cancelled scope a further await would not run.
+                buffer.discard()
+                raise
+            await run_in_threadpool(buffer.commit)
+            if container is None:
+                container = self._sniff(head)
+            duration = wav_duration(head, size) if container == "wav" else None
+            if duration is None:
+                duration = await run_in_threadpool(probe_duration, destination)
+            path = destination
+            if self.decode_pcm:
+                path = destination.with_suffix(PCM_SUFFIX)
+                duration = await run_in_threadpool(self._decode, destination, path)
+        except BaseException:
+            self.storage.delete_file(destination)
+            raise
+        return IngestedUpload(
+            path=path,
+            sha256=hasher.hexdigest(),
+            size_bytes=size,
+            container=container,
+            duration_seconds=duration,
+        )
+
+    @staticmethod
+    def _sniff(head: bytes) -> str:
+        container = sniff_container(head)
+        if container is None:
+            raise UnsupportedMediaError("Unrecognised audio container")
+        return container
+
+    def _decode(self, source: Path, destination: Path) -> float:
+        try:
+            return decode_to_pcm(source, destination)
+        except Exception as exc:  # pylint: disable=broad-except
+            # PyAV raises its own error hierarchy for corrupt or truncated streams.
+            self.storage.delete_file(destination)
+            raise UnsupportedMediaError(str(exc)) from exc
+        finally:
+            self.storage.delete_file(source)
+
+
+def _write_chunk(buffer: AtomicWriter, hasher: "hashlib._Hash", chunk: bytes) -> None:
+    # hashlib releases the GIL on large buffers, so hashing overlaps other requests too.
+    hasher.update(chunk)
+    buffer.write(chunk)
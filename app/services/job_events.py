@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Dict, List, Tuple
+
+
+class JobEvents:
+    """Wakes async waiters when a job changes.
+
+    Jobs change on inference threads; every waiter is a future on its own event loop, resolved
+    with ``call_soon_threadsafe``, so a waiting request holds no thread. Only changes made in
+    this process are seen: waiters in front of a broker also re-check the job store on a timer.
+    Subscribe before reading the job, so a change between the read and the wait is not lost.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, transcription_id: str) -> "asyncio.Future[None]":
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        with self._lock:
+            self._waiters.setdefault(transcription_id, []).append((loop, future))
+        return future
+
+    def unsubscribe(self, transcription_id: str, future: "asyncio.Future[None]") -> None:
+        with self._lock:
+            waiters = self._waiters.get(transcription_id)
+            if waiters is None:
+                return
+            waiters[:] = [item for item in waiters if item[1] is not future]
+            if not waiters:
+                del self._waiters[transcription_id]
+
+    def notify(self, transcription_id: str) -> None:
+        with self._lock:
+            waiters = self._waiters.pop(transcription_id, [])
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # the waiter's loop has closed
+
+    async def wait(self, transcription_id: str, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for the next change; True if one happened."""
+
+        future = self.subscribe(transcription_id)
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.unsubscribe(transcription_id, future)
+
+    @property
+    def waiting(self) -> int:
+        with self._lock:
+            return sum(len(waiters) for waiters in self._waiters.values())
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
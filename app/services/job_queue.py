@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds of expected cost forgiven per second spent waiting, so long jobs are not starved.
+AGING_RATE = 1.0
+# Floor for cost estimates, so jobs of unknown length still advance a client's virtual time.
+MIN_COST_SECONDS = 1.0
+
+_sequence = itertools.count()
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class QueuedJob:
+    transcription_id: str
+    handler: Callable[[], None]
+    client_id: str = "anonymous"
+    # Index into ``scheduling.PRIORITY_CLASSES``; lower runs first.
+    priority: int = 1
+    # Expected inference wall seconds (``scheduling.CostModel``).
+    cost_seconds: float = 0.0
+    weight: float = 1.0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    sequence: int = field(default_factory=lambda: next(_sequence))
+
+    @property
+    def cost(self) -> float:
+        return max(self.cost_seconds, MIN_COST_SECONDS)
+
+
+@dataclass
+class _Running:
+    job: QueuedJob
+    started_at: float
+
+
+class JobQueue:
+    """Bounded job queue drained by a fixed pool of inference workers, ordered by expected cost.
+
+    Priority classes are strict. Within a class, clients share the workers by weighted fair
+    queuing on expected cost: a client's next job gets the virtual finish tag
+    ``max(virtual time, client's last tag) + cost / weight`` and the smallest tag runs first,
+    so a client with a 4-hour upload cannot hold back another client's 30-second clips. A
+    client's own jobs run shortest-expected-first, with ``AGING_RATE`` crediting waiting time.
+    Clients at ``client_max_concurrent`` running jobs are skipped until one finishes.
+    """
+
+    def __init__(self, *, workers: int, max_size: int, client_max_concurrent: int = 0) -> None:
+        self.workers = max(1, workers)
+        self.max_size = max(1, max_size)
+        self.client_max_concurrent = client_max_concurrent
+        self._pending: List[QueuedJob] = []
+        self._running: Dict[str, _Running] = {}
+        self._client_running: Dict[str, int] = {}
+        self._finish_tags: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._cond = threading.Condition()
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping = False
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"inference-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Let workers finish the queued jobs, then exit."""
+
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, job: QueuedJob) -> None:
+        with self._cond:
+            if len(self._pending) >= self.max_size:
+                raise QueueFullError("Job queue is full")
+            self._pending.append(job)
+            self._cond.notify()
+
+    @property
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    @property
+    def active_workers(self) -> int:
+        with self._cond:
+            return len(self._running)
+
+    def estimate(self, transcription_id: str) -> Optional[Tuple[int, float]]:
+        """``(queue position, seconds until done)`` for a queued or running job, else ``None``.
+
+        Position 0 means running. The wait is the expected work ahead of the job plus what is
+        left of the running jobs, spread over the workers, plus the job's own cost.
+        """
+
+        now = time.monotonic()
+        with self._cond:
+            backlog = sum(max(item.job.cost - (now - item.started_at), 0.0) for item in self._running.values())
+            running = self._running.get(transcription_id)
+            if running is not None:
+                return 0, max(running.job.cost - (now - running.started_at), 0.0)
+            pending = list(self._pending)
+            tags = dict(self._finish_tags)
+            virtual_time = self._virtual_time
+            ahead = 0.0
+            position = 0
+            while pending:
+                job, start, finish = _pick(pending, virtual_time, tags, now)
+                position += 1
+                if job.transcription_id == transcription_id:
+                    return position, (ahead + backlog) / self.workers + job.cost
+                ahead += job.cost
+                pending.remove(job)
+                tags[job.client_id] = finish
+                virtual_time = start
+        return None
+
+    def _next_job(self) -> Optional[QueuedJob]:
+        with self._cond:
+            while True:
+                eligible = [job for job in self._pending if self._has_capacity(job.client_id)]
+                if eligible:
+                    job, start, finish = _pick(eligible, self._virtual_time, self._finish_tags, time.monotonic())
+                    self._pending.remove(job)
+                    self._finish_tags[job.client_id] = finish
+                    self._virtual_time = start
+                    self._client_running[job.client_id] = self._client_running.get(job.client_id, 0) + 1
+                    self._running[job.transcription_id] = _Running(job, time.monotonic())
+                    return job
+                if self._stopping and not self._pending:
+                    return None
+                self._cond.wait()
+
+    def _has_capacity(self, client_id: str) -> bool:
+        limit = self.client_max_concurrent
+        return limit <= 0 or self._client_running.get(client_id, 0) < limit
+
+    def _finished(self, job: QueuedJob) -> None:
+        with self._cond:
+            self._running.pop(job.transcription_id, None)
+            remaining = self._client_running.get(job.client_id, 0) - 1
+            if remaining > 0:
+                self._client_running[job.client_id] = remaining
+            else:
+                self._client_running.pop(job.client_id, None)
+            # Idle clients restart from the current virtual time anyway; drop their tags.
+            busy = {item.client_id for item in self._pending} | set(self._client_running)
+            for client_id in [key for key in self._finish_tags if key not in busy]:
+                if self._finish_tags[client_id] <= self._virtual_time:
+                    del self._finish_tags[client_id]
+            self._cond.notify_all()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                job.handler()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Unhandled error in job %s", job.transcription_id)
+            finally:
+                self._finished(job)
+
+
+def _pick(
+    pending: List[QueuedJob], virtual_time: float, finish_tags: Dict[str, float], now: float
+) -> Tuple[QueuedJob, float, float]:
+    """The next job to run, with its virtual start and finish tags."""
+
+    top = min(job.priority for job in pending)
+    heads: Dict[str, QueuedJob] = {}
+    for job in pending:
+        if job.priority != top:
+            continue
+        head = heads.get(job.client_id)
+        if head is None or _urgency(job, now) < _urgency(head, now):
+            heads[job.client_id] = job
+    best: Optional[Tuple[float, int, QueuedJob, float]] = None
+    for client_id, job in heads.items():
+        start = max(virtual_time, finish_tags.get(client_id, 0.0))
+        finish = start + job.cost / job.weight
+        if best is None or (finish, job.sequence) < best[:2]:
+            best = (finish, job.sequence, job, start)
+    assert best is not None
+    return best[2], best[3], best[0]
+
+
+def _urgency(job: QueuedJob, now: float) -> Tuple[float, int]:
+    return job.cost - AGING_RATE * (now - job.enqueued_at), job.sequence
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone
 from threading import Lock
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
+from app.config import Settings
 from app.schemas import OutputMode
 
+TERMINAL_STATUSES = ("completed", "failed")
+ABANDONED_JOB_ERROR = "Server restarted before the job finished"
+
 
 @dataclass
 class JobRecord:
@@ -14,66 +19,196 @@ class JobRecord:
     status: str
     input_filename: str
     output_type: OutputMode
+    formats: List[str] = field(default_factory=list)
+    word_timestamps: bool = False
+    model_size: Optional[str] = None
+    compute_type: Optional[str] = None
+    # Decoding preset name (``Settings.decode_presets``) and the client's language hint, if any.
+    preset: Optional[str] = None
+    language: Optional[str] = None
+    # Scheduling: ``scheduling.client_label`` of the submitter and its priority class.
+    client_id: Optional[str] = None
+    priority: Optional[str] = None
+    # Where to POST the finished job (``services.webhooks``).
+    callback_url: Optional[str] = None
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     duration_seconds: Optional[float] = None
+    # Share of the audio decoded so far: last segment end over duration.
+    progress_percent: Optional[float] = None
     output_filename: Optional[str] = None
     download_url: Optional[str] = None
     error: Optional[str] = None
+    # Wall seconds per pipeline stage (see ``services.metrics.STAGES``).
+    timings: Dict[str, float] = field(default_factory=dict)
 
     def touch(self) -> None:
         self.updated_at = datetime.now(timezone.utc)
 
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for item in fields(self):
+            value = getattr(self, item.name)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, OutputMode):
+                value = value.value
+            data[item.name] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobRecord":
+        known = {item.name for item in fields(cls)}
+        values = {key: value for key, value in data.items() if key in known}
+        values["output_type"] = OutputMode(values["output_type"])
+        for key in ("created_at", "updated_at"):
+            if isinstance(values.get(key), str):
+                values[key] = datetime.fromisoformat(values[key])
+        return cls(**values)
+
+
+class BaseJobStore(ABC):
+    """Interface shared by the job store backends."""
+
+    def update(
+        self,
+        transcription_id: str,
+        *,
+        status: Optional[str] = None,
+        duration_seconds: Optional[float] = None,
+        progress_percent: Optional[float] = None,
+        output_filename: Optional[str] = None,
+        download_url: Optional[str] = None,
+        error: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> Optional[JobRecord]:
+        changes = {
+            "status": status or None,
+            "duration_seconds": duration_seconds,
+            "progress_percent": progress_percent,
+            "output_filename": output_filename,
+            "download_url": download_url,
+            "error": error,
+            "timings": timings,
+        }
+        return self._update(transcription_id, {key: value for key, value in changes.items() if value is not None})
+
+    @abstractmethod
+    def create(self, job: JobRecord) -> JobRecord:
+        ...
+
+    @abstractmethod
+    def get(self, transcription_id: str) -> Optional[JobRecord]:
+        ...
+
+    @abstractmethod
+    def _update(self, transcription_id: str, changes: Dict[str, Any]) -> Optional[JobRecord]:
+        ...
+
+    @abstractmethod
+    def delete(self, transcription_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def find_by_output_filename(self, filename: str) -> Optional[JobRecord]:
+        ...
+
+    @abstractmethod
+    def purge_finished_before(self, cutoff: datetime) -> List[JobRecord]:
+        """Remove completed/failed jobs last updated before ``cutoff`` and return them."""
 
-class JobStore:
+    @abstractmethod
+    def fail_unfinished(self, error: str, *, stale_seconds: Optional[float] = None) -> int:
+        """Mark queued/processing jobs as failed, e.g. after a restart; returns how many.
+
+        With ``stale_seconds``, stores shared between processes only fail jobs whose owning
+        process has not heartbeated for that long.
+        """
+
+    def heartbeat(self) -> None:
+        """Record that this process is alive and still running the jobs it created."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class JobStore(BaseJobStore):
     """Thread-safe in-memory registry for transcription jobs."""
 
     def __init__(self) -> None:
         self._jobs: Dict[str, JobRecord] = {}
+        self._by_output: Dict[str, str] = {}
         self._lock = Lock()
 
     def create(self, job: JobRecord) -> JobRecord:
         with self._lock:
             self._jobs[job.transcription_id] = job
+            if job.output_filename:
+                self._by_output[job.output_filename] = job.transcription_id
         return job
 
     def get(self, transcription_id: str) -> Optional[JobRecord]:
         return self._jobs.get(transcription_id)
 
-    def update(
-        self,
-        transcription_id: str,
-        *,
-        status: Optional[str] = None,
-        duration_seconds: Optional[float] = None,
-        output_filename: Optional[str] = None,
-        download_url: Optional[str] = None,
-        error: Optional[str] = None,
-    ) -> Optional[JobRecord]:
+    def _update(self, transcription_id: str, changes: Dict[str, Any]) -> Optional[JobRecord]:
         with self._lock:
             job = self._jobs.get(transcription_id)
             if not job:
                 return None
-            if status:
-                job.status = status
-            if duration_seconds is not None:
-                job.duration_seconds = duration_seconds
-            if output_filename is not None:
-                job.output_filename = output_filename
-            if download_url is not None:
-                job.download_url = download_url
-            if error is not None:
-                job.error = error
+            if "output_filename" in changes and job.output_filename:
+                self._by_output.pop(job.output_filename, None)
+            for key, value in changes.items():
+                setattr(job, key, value)
+            if job.output_filename:
+                self._by_output[job.output_filename] = transcription_id
             job.touch()
             return job
 
     def delete(self, transcription_id: str) -> None:
         with self._lock:
-            self._jobs.pop(transcription_id, None)
+            job = self._jobs.pop(transcription_id, None)
+            if job and job.output_filename:
+                self._by_output.pop(job.output_filename, None)
 
     def find_by_output_filename(self, filename: str) -> Optional[JobRecord]:
+        transcription_id = self._by_output.get(filename)
+        return self._jobs.get(transcription_id) if transcription_id else None
+
+    def purge_finished_before(self, cutoff: datetime) -> List[JobRecord]:
+        with self._lock:
+            expired = [
+                job
+                for job in self._jobs.values()
+                if job.status in TERMINAL_STATUSES and job.updated_at < cutoff
+            ]
+            for job in expired:
+                self._jobs.pop(job.transcription_id, None)
+                if job.output_filename:
+                    self._by_output.pop(job.output_filename, None)
+        return expired
+
+    def fail_unfinished(self, error: str, *, stale_seconds: Optional[float] = None) -> int:
+        # Process-local: every job here belongs to this process.
         with self._lock:
-            for job in self._jobs.values():
-                if job.output_filename == filename:
-                    return job
-        return None
+            unfinished = [job for job in self._jobs.values() if job.status not in TERMINAL_STATUSES]
+            for job in unfinished:
+                job.status = "failed"
+                job.error = error
+                job.touch()
+        return len(unfinished)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+def build_job_store(settings: Settings) -> BaseJobStore:
+    if settings.job_store_backend == "sqlite":
+        from app.services.sqlite_job_store import SQLiteJobStore
+
+        store: BaseJobStore = SQLiteJobStore(settings.job_store_path)
+        # Other uvicorn workers or nodes may share the file: leave jobs of live owners alone.
+        store.heartbeat()
+        store.fail_unfinished(ABANDONED_JOB_ERROR, stale_seconds=settings.worker_stale_seconds)
+        return store
+    return JobStore()
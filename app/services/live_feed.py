@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from itertools import islice
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.inference.whisper_runner import Segment
+
+
+@dataclass
+class _Feed:
+    segments: Deque[Segment]
+    # Absolute index of ``segments[0]``: how many segments have fallen out of the ring.
+    first: int = 0
+    done: bool = False
+    closed_at: float = 0.0
+
+
+class LiveFeed:
+    """Thread-safe ring buffers of the most recent partial segments of jobs still decoding.
+
+    Each job keeps at most ``max_segments`` segments, so memory does not grow with transcript
+    length; a subscriber that falls further behind skips ahead to the oldest buffered segment
+    (the complete transcript is always available via download). Finished feeds linger for
+    ``linger_seconds`` so subscribers can drain the tail, then are dropped.
+    """
+
+    def __init__(self, max_segments: int = 256, linger_seconds: float = 30.0) -> None:
+        self._feeds: Dict[str, _Feed] = {}
+        self._closed: "OrderedDict[str, None]" = OrderedDict()
+        self._max_segments = max(1, max_segments)
+        self._linger_seconds = linger_seconds
+        self._lock = Lock()
+
+    def open(self, transcription_id: str) -> None:
+        with self._lock:
+            self._expire()
+            self._feeds[transcription_id] = _Feed(segments=deque(maxlen=self._max_segments))
+
+    def publish(self, transcription_id: str, segment: Segment) -> None:
+        with self._lock:
+            feed = self._feeds.get(transcription_id)
+            if feed is not None and not feed.done:
+                if len(feed.segments) == self._max_segments:
+                    feed.first += 1
+                feed.segments.append(segment)
+
+    def close(self, transcription_id: str) -> None:
+        with self._lock:
+            feed = self._feeds.get(transcription_id)
+            if feed is None:
+                return
+            feed.done = True
+            feed.closed_at = time.monotonic()
+            self._closed[transcription_id] = None
+            self._expire()
+
+    def read(self, transcription_id: str, offset: int) -> Optional[Tuple[int, List[Segment], bool]]:
+        """Return ``(start, segments, pending)``: buffered segments from index ``start`` on.
+
+        ``start`` is ``offset`` unless the reader fell behind the ring buffer; ``pending``
+        says whether more may follow.
+        Returns ``None`` when no feed is known for the job.
+        """
+
+        with self._lock:
+            feed = self._feeds.get(transcription_id)
+            if feed is None:
+                return None
+            start = max(offset, feed.first)
+            return start, list(islice(feed.segments, start - feed.first, None)), not feed.done
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self._linger_seconds
+        while self._closed:
+            oldest = next(iter(self._closed))
+            feed = self._feeds.get(oldest)
+            if feed is not None and feed.closed_at > cutoff:
+                break
+            self._closed.popitem(last=False)
+            self._feeds.pop(oldest, None)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import uuid
+from typing import Any, Dict
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from app.config import Settings
+from app.inference.model_registry import ModelRegistry
+from app.inference.streaming import LIVE_ENCODINGS, FrameDecoder, StreamingDecoder
+from app.inference.whisper_runner import SAMPLE_RATE, WhisperRunner
+
+logger = logging.getLogger(__name__)
+
+# RFC 6455 close codes.
+CLOSE_NORMAL = 1000
+CLOSE_UNSUPPORTED_DATA = 1003
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class LiveSessionManager:
+    """Serves live transcription sessions over WebSockets on the shared Whisper runner.
+
+    At most ``LIVE_MAX_SESSIONS`` sessions run at once; each keeps at most one decode in
+    flight, so live traffic adds a bounded number of concurrent inference calls next to the
+    ``INFERENCE_WORKERS`` batch workers. Audio received while a decode runs is picked up by the
+    next step, so a slow decode widens the next step instead of building a backlog.
+
+    Protocol: an optional ``{"type": "start", "encoding": ..., "sample_rate": ...,
+    "word_timestamps": ...}`` text message, then binary audio frames, then ``{"type": "stop"}``.
+    The server replies with ``ready``, then ``partial``/``final`` events, and ``end``.
+    """
+
+    def __init__(self, settings: Settings, registry: ModelRegistry) -> None:
+        self.settings = settings
+        self.registry = registry
+        self.max_sessions = settings.live_max_sessions
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        with self._lock:
+            return self._active
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._active >= self.max_sessions:
+                return False
+            self._active += 1
+            return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    async def serve(self, websocket: WebSocket) -> None:
+        await websocket.accept()
+        if not self._acquire():
+            await _reject(websocket, CLOSE_TRY_AGAIN_LATER, "LIVE_CAPACITY_EXCEEDED")
+            return
+        try:
+            await self._run(websocket)
+        except WebSocketDisconnect:
+            logger.info("Live session client disconnected")
+        finally:
+            self._release()
+
+    async def _run(self, websocket: WebSocket) -> None:
+        config: Dict[str, Any] = {}
+        first = await websocket.receive()
+        if first["type"] == "websocket.disconnect":
+            return
+        if first.get("text") is not None:
+            try:
+                config = json.loads(first["text"])
+            except ValueError:
+                await _reject(websocket, CLOSE_UNSUPPORTED_DATA, "INVALID_START_MESSAGE")
+                return
+        try:
+            frames = FrameDecoder(
+                str(config.get("encoding", "pcm_s16le")), int(config.get("sample_rate", SAMPLE_RATE))
+            )
+        except (ValueError, TypeError, ImportError):
+            await _reject(websocket, CLOSE_UNSUPPORTED_DATA, "UNSUPPORTED_ENCODING")
+            return
+
+        # The lease keeps the runner open for the whole session even if the model is evicted.
+        runner = await run_in_threadpool(self.registry.acquire)
+        try:
+            await self._run_session(websocket, runner, config, frames, first)
+        finally:
+            self.registry.release(runner)
+
+    async def _run_session(
+        self,
+        websocket: WebSocket,
+        runner: WhisperRunner,
+        config: Dict[str, Any],
+        frames: FrameDecoder,
+        first: Dict[str, Any],
+    ) -> None:
+        decoder = StreamingDecoder(
+            runner,
+            window_seconds=self.settings.live_window_seconds,
+            step_seconds=self.settings.live_step_ms / 1000,
+            flush_silence_seconds=self.settings.live_flush_silence_ms / 1000,
+            vad_threshold=self.settings.live_vad_threshold,
+            word_timestamps=bool(config.get("word_timestamps", False)),
+        )
+        session_id = str(uuid.uuid4())
+        await websocket.send_json(
+            {"type": "ready", "session_id": session_id, "sample_rate": SAMPLE_RATE, "encodings": list(LIVE_ENCODINGS)}
+        )
+        if first.get("bytes"):
+            decoder.feed(frames.decode(first["bytes"]))
+
+        wake = asyncio.Event()
+        stopping = False
+
+        async def decode_loop() -> None:
+            while not stopping:
+                await wake.wait()
+                wake.clear()
+                while decoder.due():
+                    for event in await run_in_threadpool(decoder.step):
+                        await websocket.send_json(event.to_dict())
+
+        loop_task = asyncio.create_task(decode_loop())
+        max_seconds = self.settings.live_max_session_minutes * 60
+        reason = "stop"
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", CLOSE_NORMAL))
+                if message.get("bytes"):
+                    decoder.feed(frames.decode(message["bytes"]))
+                    if decoder.received_seconds >= max_seconds:
+                        reason = "max_duration"
+                        break
+                    wake.set()
+                elif message.get("text") is not None and _is_stop(message["text"]):
+                    break
+                if loop_task.done():
+                    loop_task.result()  # surface decode errors
+        except BaseException:
+            loop_task.cancel()
+            raise
+        stopping = True
+        wake.set()
+        await loop_task
+        for event in await run_in_threadpool(decoder.finish):
+            await websocket.send_json(event.to_dict())
+        await websocket.send_json(
+            {"type": "end", "session_id": session_id, "reason": reason, "duration_seconds": decoder.received_seconds}
+        )
+        await websocket.close(code=CLOSE_NORMAL)
+
+
+def _is_stop(text: str) -> bool:
+    try:
+        return json.loads(text).get("type") == "stop"
+    except (ValueError, AttributeError):
+        return False
+
+
+async def _reject(websocket: WebSocket, code: int, detail: str) -> None:
+    await websocket.send_json({"type": "error", "detail": detail})
+    await websocket.close(code=code, reason=detail)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+STAGES = ("save_upload", "decode", "inference", "render", "write_output")
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+RTF_BUCKETS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (non-cumulative, last slot is +Inf), sum, count.
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            totals[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, totals) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {totals[0]}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class StageTimer:
+    """Accumulates wall time per pipeline stage for one job."""
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def rounded(self) -> Dict[str, float]:
+        return {name: round(value, 4) for name, value in self.seconds.items()}
+
+
+class PipelineMetrics:
+    """Process-local metrics rendered in the Prometheus text exposition format.
+
+    Histograms and counters are fed by ``TranscriberService``; gauges are callbacks read at
+    scrape time, so they always reflect the live queue, store and cache.
+    """
+
+    def __init__(self) -> None:
+        self.stage_seconds = Histogram(
+            "stt_stage_duration_seconds", "Wall time spent per pipeline stage.", ("stage", "model")
+        )
+        self.realtime_factor = Histogram(
+            "stt_realtime_factor",
+            "Inference seconds per second of audio (lower is faster).",
+            ("model", "device"),
+            RTF_BUCKETS,
+        )
+        self.audio_seconds = Counter("stt_audio_seconds_total", "Audio seconds transcribed.", ("model",))
+        self.jobs = Counter("stt_jobs_total", "Jobs finished, by outcome.", ("status",))
+        self.webhooks = Counter("stt_webhook_deliveries_total", "Webhook delivery attempts, by outcome.", ("outcome",))
+        self._gauges: List[Tuple[str, str, Callable[[], Optional[float]]]] = []
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], Optional[float]]) -> None:
+        self._gauges.append((name, documentation, read))
+
+    def observe_job(self, timings: Dict[str, float], *, model: str, device: str, audio_seconds: float) -> None:
+        for stage, seconds in timings.items():
+            self.stage_seconds.observe(seconds, stage=stage, model=model)
+        inference = timings.get("inference")
+        if inference is not None and audio_seconds > 0:
+            self.realtime_factor.observe(inference / audio_seconds, model=model, device=device)
+            self.audio_seconds.inc(audio_seconds, model=model)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (self.stage_seconds, self.realtime_factor, self.audio_seconds, self.jobs, self.webhooks):
+            lines.extend(metric.render())
+        for name, documentation, read in self._gauges:
+            value = read()
+            if value is None:
+                continue
+            lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {float(value)}"])
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.services.broker import Broker, BrokerJob
+from app.services.job_queue import QueueFullError
+from app.services.job_store import TERMINAL_STATUSES, BaseJobStore, JobRecord
+
+
+class RedisJobStore(BaseJobStore):
+    """Job store on any Redis-protocol server.
+
+    Records are JSON strings under ``<prefix>job:<id>``; ``<prefix>output:<filename>`` maps
+    outputs back to ids, the ``<prefix>finished`` sorted set (scored by update time) drives
+    retention and the ``<prefix>jobs`` set of ids makes counting O(1).
+    """
+
+    def __init__(self, client: Any, prefix: str = "stt:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def create(self, job: JobRecord) -> JobRecord:
+        pipe = self.client.pipeline()
+        pipe.set(self._job_key(job.transcription_id), json.dumps(job.to_dict()))
+        pipe.sadd(self._ids_key, job.transcription_id)
+        pipe.execute()
+        return job
+
+    def get(self, transcription_id: str) -> Optional[JobRecord]:
+        raw = self.client.get(self._job_key(transcription_id))
+        return JobRecord.from_dict(json.loads(raw)) if raw else None
+
+    def _update(self, transcription_id: str, changes: Dict[str, Any]) -> Optional[JobRecord]:
+        key = self._job_key(transcription_id)
+        result: Dict[str, Optional[JobRecord]] = {"job": None}
+
+        def apply(pipe: Any) -> None:
+            raw = pipe.get(key)
+            if not raw:
+                return
+            job = JobRecord.from_dict(json.loads(raw))
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.touch()
+            pipe.multi()
+            pipe.set(key, json.dumps(job.to_dict()))
+            if job.output_filename:
+                pipe.set(self._output_key(job.output_filename), transcription_id)
+            if job.status in TERMINAL_STATUSES:
+                pipe.zadd(self._finished_key, {transcription_id: job.updated_at.timestamp()})
+            result["job"] = job
+
+        self.client.transaction(apply, key)
+        return result["job"]
+
+    def delete(self, transcription_id: str) -> None:
+        job = self.get(transcription_id)
+        pipe = self.client.pipeline()
+        pipe.delete(self._job_key(transcription_id))
+        pipe.srem(self._ids_key, transcription_id)
+        pipe.zrem(self._finished_key, transcription_id)
+        if job and job.output_filename:
+            pipe.delete(self._output_key(job.output_filename))
+        pipe.execute()
+
+    def find_by_output_filename(self, filename: str) -> Optional[JobRecord]:
+        transcription_id = self.client.get(self._output_key(filename))
+        return self.get(_text(transcription_id)) if transcription_id else None
+
+    def purge_finished_before(self, cutoff: datetime) -> List[JobRecord]:
+        expired: List[JobRecord] = []
+        for transcription_id in self.client.zrangebyscore(self._finished_key, "-inf", cutoff.timestamp()):
+            transcription_id = _text(transcription_id)
+            if not self.client.zrem(self._finished_key, transcription_id):
+                continue  # another node purged it first
+            job = self.get(transcription_id)
+            if job:
+                self.delete(transcription_id)
+                expired.append(job)
+        return expired
+
+    def fail_unfinished(self, error: str, *, stale_seconds: Optional[float] = None) -> int:
+        # Workers requeue abandoned jobs through the broker, so there is nothing to reset here.
+        return 0
+
+    def __len__(self) -> int:
+        return int(self.client.scard(self._ids_key))
+
+    @property
+    def _finished_key(self) -> str:
+        return f"{self.prefix}finished"
+
+    @property
+    def _ids_key(self) -> str:
+        return f"{self.prefix}jobs"
+
+    def _job_key(self, transcription_id: str) -> str:
+        return f"{self.prefix}job:{transcription_id}"
+
+    def _output_key(self, filename: str) -> str:
+        return f"{self.prefix}output:{filename}"
+
+
+# Moves the head of the queue to ``processing`` and records its claim and first heartbeat in
+# one atomic step, so a worker dying mid-claim cannot strand a job without a heartbeat.
+# KEYS: queue, processing, claims, workers, heartbeats; ARGV: worker id, now.
+_CLAIM_SCRIPT = """
+local raw = redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT')
+if not raw then
+    return false
+end
+local id = cjson.decode(raw)['transcription_id']
+redis.call('HSET', KEYS[3], id, raw)
+redis.call('HSET', KEYS[4], id, ARGV[1])
+redis.call('ZADD', KEYS[5], ARGV[2], id)
+return raw
+"""
+
+# Removes a finished job's claim only if ``ARGV[2]`` still holds it; returns 1 when it did.
+# KEYS: processing, claims, workers, heartbeats; ARGV: transcription id, worker id.
+_ACK_SCRIPT = """
+if redis.call('HGET', KEYS[3], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+local raw = redis.call('HGET', KEYS[2], ARGV[1])
+if raw then
+    redis.call('LREM', KEYS[1], 1, raw)
+end
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+redis.call('ZREM', KEYS[4], ARGV[1])
+return 1
+"""
+
+
+class RedisBroker(Broker):
+    """Broker on any Redis-protocol server (Redis >= 6.2, Valkey, KeyDB, ...).
+
+    Pending jobs live in the ``queue`` list; ``claim`` moves one atomically to ``processing``
+    and records the raw payload in ``claims``, the claiming worker in ``workers`` and its heartbeat
+    in the ``heartbeats`` sorted set, all in one Lua script; ``ack`` checks ``workers`` and clears
+    them in another. Waiting for work uses a same-list ``BLMOVE``, which blocks until
+    the queue is non-empty without taking anything off it.
+    """
+
+    def __init__(self, url: str, prefix: str = "stt:") -> None:
+        import redis  # type: ignore[import-not-found]
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._store = RedisJobStore(self.client, prefix)
+        self._claim = self.client.register_script(_CLAIM_SCRIPT)
+        self._ack = self.client.register_script(_ACK_SCRIPT)
+
+    def job_store(self) -> BaseJobStore:
+        return self._store
+
+    def enqueue(self, job: BrokerJob, *, max_depth: int) -> None:
+        if self.client.llen(self._key("queue")) >= max_depth:
+            raise QueueFullError("Job queue is full")
+        self.client.rpush(self._key("queue"), job.to_json())
+
+    def claim(self, worker_id: str, timeout: float) -> Optional[BrokerJob]:
+        keys = [self._key(name) for name in ("queue", "processing", "claims", "workers", "heartbeats")]
+        raw = self._claim(keys=keys, args=[worker_id, time.time()])
+        if raw is None:
+            # Block until a job arrives (rotating the head back onto the same list), then race
+            # the other workers for it; the loser simply gets ``None`` and claims again.
+            if self.client.blmove(keys[0], keys[0], timeout, "LEFT", "LEFT") is None:
+                return None
+            raw = self._claim(keys=keys, args=[worker_id, time.time()])
+            if raw is None:
+                return None
+        return BrokerJob.from_json(_text(raw))
+
+    def heartbeat(self, worker_id: str, transcription_id: str) -> None:
+        self.client.zadd(self._key("heartbeats"), {transcription_id: time.time()}, xx=True)
+
+    def owns(self, worker_id: str, transcription_id: str) -> bool:
+        owner = self.client.hget(self._key("workers"), transcription_id)
+        return owner is not None and _text(owner) == worker_id
+
+    def ack(self, worker_id: str, transcription_id: str) -> bool:
+        keys = [self._key(name) for name in ("processing", "claims", "workers", "heartbeats")]
+        return bool(self._ack(keys=keys, args=[transcription_id, worker_id]))
+
+    def requeue_stale(self, stale_after: float, *, max_attempts: int) -> List[BrokerJob]:
+        exhausted: List[BrokerJob] = []
+        stale = self.client.zrangebyscore(self._key("heartbeats"), "-inf", time.time() - stale_after)
+        for transcription_id in stale:
+            transcription_id = _text(transcription_id)
+            if not self.client.zrem(self._key("heartbeats"), transcription_id):
+                continue  # another node requeued it first
+            raw = self.client.hget(self._key("claims"), transcription_id)
+            if raw is None:
+                continue
+            job = BrokerJob.from_json(_text(raw))
+            job.attempts += 1
+            pipe = self.client.pipeline()
+            pipe.lrem(self._key("processing"), 1, raw)
+            pipe.hdel(self._key("claims"), transcription_id)
+            pipe.hdel(self._key("workers"), transcription_id)
+            if job.attempts < max_attempts:
+                pipe.rpush(self._key("queue"), job.to_json())
+            pipe.execute()
+            if job.attempts < max_attempts:
+                self._store.update(transcription_id, status="queued")
+            else:
+                self._store.update(transcription_id, status="failed", error="Inference worker lost")
+                exhausted.append(job)
+        return exhausted
+
+    def depth(self) -> int:
+        return int(self.client.llen(self._key("queue")))
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionSweeper:
+    """Runs a purge callback every ``interval_seconds`` on a daemon thread.
+
+    The callback returns how many jobs it removed (or failed); ``name`` labels the thread and logs.
+    """
+
+    def __init__(self, purge: Callable[[], int], *, interval_seconds: float, name: str = "retention-sweeper") -> None:
+        self.purge = purge
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                removed = self.purge()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("%s failed", self.name)
+                continue
+            if removed:
+                logger.info("%s handled %d jobs", self.name, removed)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Container, Deque, Dict, Optional, Tuple
+
+# Strict priority order: every queued ``high`` job is dispatched before any ``normal`` one.
+PRIORITY_CLASSES = ("high", "normal", "low")
+DEFAULT_PRIORITY = "normal"
+
+# Rough CPU inference seconds per audio second by checkpoint family; refined by ``CostModel.observe``.
+BASELINE_RTF: Dict[str, float] = {
+    "tiny": 0.05,
+    "base": 0.08,
+    "small": 0.2,
+    "medium": 0.5,
+    "large-v1": 1.0,
+    "large-v2": 1.0,
+    "large-v3": 1.0,
+}
+
+# When the container reports no duration, assume a ~128 kbit/s compressed stream.
+FALLBACK_BYTES_PER_SECOND = 16_000
+
+
+def client_label(api_key: Optional[str], host: Optional[str], known_keys: Container[str] = ()) -> str:
+    """Stable, non-secret client identifier: a digest of the API key, else the peer address.
+
+    Only keys in ``known_keys`` (the configured clients) count as identities; any other header
+    value could be changed per request to dodge fair sharing and quotas, so it falls back to
+    the peer address.
+    """
+
+    if api_key and api_key in known_keys:
+        return "key-" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+    return f"ip-{host or 'unknown'}"
+
+
+def priority_rank(name: str) -> int:
+    return PRIORITY_CLASSES.index(name)
+
+
+class CostModel:
+    """Expected inference wall time of a job: audio seconds times a real-time factor.
+
+    Factors are kept per (model size, preset), start from ``BASELINE_RTF`` and follow finished
+    jobs through an exponential moving average, so estimates track the actual hardware.
+    """
+
+    def __init__(self, *, smoothing: float = 0.2) -> None:
+        self.smoothing = smoothing
+        self._factors: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def factor(self, model_size: str, preset: str = "") -> float:
+        with self._lock:
+            learned = self._factors.get((model_size, preset))
+        if learned is not None:
+            return learned
+        return BASELINE_RTF.get(model_size.split(".", 1)[0], BASELINE_RTF["large-v2"])
+
+    def estimate(self, model_size: str, audio_seconds: float, preset: str = "") -> float:
+        return max(audio_seconds, 0.0) * self.factor(model_size, preset)
+
+    def observe(self, model_size: str, audio_seconds: float, inference_seconds: float, preset: str = "") -> None:
+        if audio_seconds <= 0 or inference_seconds <= 0:
+            return
+        sample = inference_seconds / audio_seconds
+        key = (model_size, preset)
+        with self._lock:
+            previous = self._factors.get(key)
+            self._factors[key] = sample if previous is None else previous + self.smoothing * (sample - previous)
+
+
+@dataclass(eq=False)
+class QuotaCharge:
+    """One recorded submission; ``AudioQuota.refund`` takes back exactly this entry."""
+
+    client_id: str
+    at: float
+    minutes: float
+
+
+class AudioQuota:
+    """Rolling per-client budget of submitted audio minutes (``limit_minutes`` 0 disables it).
+
+    Entries leave the window on every ``charge``/``refund`` of their client, and ``sweep`` drops
+    clients whose window emptied, so idle clients do not accumulate.
+    """
+
+    def __init__(self, *, limit_minutes: float, window_seconds: float) -> None:
+        self.limit_minutes = limit_minutes
+        self.window_seconds = window_seconds
+        self._usage: Dict[str, Deque[QuotaCharge]] = {}
+        self._lock = threading.Lock()
+
+    def charge(self, client_id: str, minutes: float) -> Optional[QuotaCharge]:
+        """Record ``minutes`` for ``client_id``; ``None`` (and nothing recorded) when over budget."""
+
+        now = time.monotonic()
+        charge = QuotaCharge(client_id, now, minutes)
+        if self.limit_minutes <= 0:
+            return charge
+        with self._lock:
+            usage = self._expire(client_id, now)
+            if sum(item.minutes for item in usage) + minutes > self.limit_minutes:
+                return None
+            self._usage[client_id] = usage
+            usage.append(charge)
+            return charge
+
+    def refund(self, charge: QuotaCharge) -> None:
+        with self._lock:
+            usage = self._expire(charge.client_id, time.monotonic())
+            if charge in usage:
+                usage.remove(charge)
+            if not usage:
+                self._usage.pop(charge.client_id, None)
+
+    def sweep(self) -> int:
+        """Drop expired entries of every client; returns how many clients are still tracked."""
+
+        now = time.monotonic()
+        with self._lock:
+            for client_id in list(self._usage):
+                self._expire(client_id, now)
+            return len(self._usage)
+
+    def _expire(self, client_id: str, now: float) -> Deque[QuotaCharge]:
+        # Caller holds the lock. A client left without entries is removed from ``_usage``.
+        usage = self._usage.get(client_id, deque())
+        while usage and usage[0].at <= now - self.window_seconds:
+            usage.popleft()
+        if not usage:
+            self._usage.pop(client_id, None)
+        return usage
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import html
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.inference.whisper_runner import TranscriptionResult
+from app.services.formatters import SegmentColumns
+
+# Segment rowids are ``doc_id << DOC_SHIFT | segment index``, so a transcript's segments form one
+# rowid range that FTS5 can delete or join without scanning (up to 16M segments per transcript).
+DOC_SHIFT = 24
+
+HIGHLIGHT_OPEN = "<mark>"
+HIGHLIGHT_CLOSE = "</mark>"
+# FTS5 wraps matches in these control characters; the text is HTML-escaped before they become tags.
+_MATCH_OPEN = "\x02"
+_MATCH_CLOSE = "\x03"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transcription_id TEXT NOT NULL UNIQUE,
+    output_filename TEXT,
+    input_filename TEXT,
+    language TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    text,
+    start UNINDEXED,
+    "end" UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+# ``"a phrase"``, ``prefix*`` or a bare term.
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class InvalidQueryError(ValueError):
+    """Raised for search queries without any searchable term."""
+
+
+@dataclass
+class SearchHit:
+    transcription_id: str
+    output_filename: Optional[str]
+    input_filename: Optional[str]
+    start: float
+    end: float
+    text: str
+    highlighted: str
+
+
+def render_highlight(marked: str) -> str:
+    """HTML-escape ``marked`` and turn its match delimiters into ``<mark>`` tags.
+
+    Transcript text is user-controlled audio content, so only the tags added here are markup.
+    """
+
+    return html.escape(marked).replace(_MATCH_OPEN, HIGHLIGHT_OPEN).replace(_MATCH_CLOSE, HIGHLIGHT_CLOSE)
+
+
+def build_match_query(query: str) -> str:
+    """Translate user input into an FTS5 expression: quoted phrases and terms, all required.
+
+    Every token is quoted, so FTS5 operators and punctuation in user input are matched as text
+    instead of being parsed; a trailing ``*`` on a bare term keeps prefix matching.
+    """
+
+    parts: List[str] = []
+    for phrase, term in _QUERY_TOKEN.findall(query):
+        text = (phrase or term).strip()
+        prefix = bool(term) and text.endswith("*")
+        text = text.rstrip("*") if prefix else text
+        if not re.search(r"\w", text):
+            continue
+        parts.append('"' + text.replace('"', '""') + '"' + ("*" if prefix else ""))
+    if not parts:
+        raise InvalidQueryError(query)
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """SQLite FTS5 index of finished transcripts, one row per segment.
+
+    ``add`` indexes a result when its job completes and ``remove`` drops it when retention
+    deletes the outputs, so the index only ever covers downloadable transcripts. Hits carry the
+    segment's start/end time. Connections are per thread, like ``SQLiteJobStore``.
+
+    The database runs in WAL mode, which needs shared memory between its users: keep it on a
+    local disk of one host, never on a network share.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def add(
+        self,
+        transcription_id: str,
+        result: TranscriptionResult,
+        *,
+        output_filename: Optional[str] = None,
+        input_filename: Optional[str] = None,
+    ) -> None:
+        columns = SegmentColumns.from_segments(result.segments)
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._delete(conn, transcription_id)
+            cursor = conn.execute(
+                "INSERT INTO transcripts (transcription_id, output_filename, input_filename, language, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (transcription_id, output_filename, input_filename, result.language, time.time()),
+            )
+            base = int(cursor.lastrowid) << DOC_SHIFT
+            conn.executemany(
+                'INSERT INTO segments (rowid, text, start, "end") VALUES (?, ?, ?, ?)',
+                (
+                    (base + index, text, start, end)
+                    for index, (start, end, text) in enumerate(
+                        zip(columns.starts.tolist(), columns.ends.tolist(), columns.texts)
+                    )
+                ),
+            )
+
+    def remove(self, transcription_id: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._delete(conn, transcription_id)
+
+    def search(
+        self, query: str, *, limit: int = 20, offset: int = 0, order: str = "recent"
+    ) -> Tuple[List[SearchHit], bool]:
+        """Matching segments and whether more follow.
+
+        ``recent`` walks the index newest transcript first and stops after the page, so it stays
+        fast for common terms; ``relevance`` ranks every match by BM25.
+        """
+
+        match = build_match_query(query)
+        ordering = "ORDER BY segments.rowid DESC" if order == "recent" else "ORDER BY rank"
+        rows = self._connect().execute(
+            "SELECT t.transcription_id, t.output_filename, t.input_filename, segments.start, segments.\"end\", "
+            "segments.text, highlight(segments, 0, ?, ?) "
+            f"FROM segments JOIN transcripts AS t ON t.doc_id = (segments.rowid >> {DOC_SHIFT}) "
+            f"WHERE segments MATCH ? {ordering} LIMIT ? OFFSET ?",
+            (_MATCH_OPEN, _MATCH_CLOSE, match, limit + 1, offset),
+        ).fetchall()
+        hits = [SearchHit(*row[:-1], render_highlight(row[-1])) for row in rows[:limit]]
+        return hits, len(rows) > limit
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, transcription_id: str) -> None:
+        row = conn.execute("SELECT doc_id FROM transcripts WHERE transcription_id = ?", (transcription_id,)).fetchone()
+        if row is None:
+            return
+        first = row[0] << DOC_SHIFT
+        conn.execute("DELETE FROM segments WHERE rowid >= ? AND rowid < ?", (first, first + (1 << DOC_SHIFT)))
+        conn.execute("DELETE FROM transcripts WHERE doc_id = ?", (row[0],))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
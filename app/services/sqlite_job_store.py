@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.services.job_store import TERMINAL_STATUSES, BaseJobStore, JobRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    transcription_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    output_filename TEXT,
+    updated_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_output_filename ON jobs (output_filename);
+CREATE INDEX IF NOT EXISTS jobs_status_updated_at ON jobs (status, updated_at);
+CREATE TABLE IF NOT EXISTS job_store_owners (
+    owner TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteJobStore(BaseJobStore):
+    """Persistent job store backed by SQLite in WAL mode.
+
+    The full record lives in a JSON ``payload`` column; the columns used for lookups
+    (id, output filename, status, update time) are stored alongside it and indexed.
+
+    Several processes may share the file, so each job records the ``owner`` process that
+    created (and runs) it, and owners ``heartbeat`` into ``job_store_owners``. Recovery only
+    fails unfinished jobs whose owner has stopped heartbeating.
+    """
+
+    def __init__(self, path: str, *, owner: Optional[str] = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    def create(self, job: JobRecord) -> JobRecord:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (transcription_id, status, output_filename, updated_at, payload, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._row(job) + (self.owner,),
+            )
+        return job
+
+    def get(self, transcription_id: str) -> Optional[JobRecord]:
+        row = self._connect().execute(
+            "SELECT payload FROM jobs WHERE transcription_id = ?", (transcription_id,)
+        ).fetchone()
+        return JobRecord.from_dict(json.loads(row[0])) if row else None
+
+    def _update(self, transcription_id: str, changes: Dict[str, Any]) -> Optional[JobRecord]:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT payload FROM jobs WHERE transcription_id = ?", (transcription_id,)
+            ).fetchone()
+            if not row:
+                return None
+            job = JobRecord.from_dict(json.loads(row[0]))
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.touch()
+            conn.execute(
+                "UPDATE jobs SET status = ?, output_filename = ?, updated_at = ?, payload = ? "
+                "WHERE transcription_id = ?",
+                self._row(job)[1:] + (transcription_id,),
+            )
+        return job
+
+    def delete(self, transcription_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE transcription_id = ?", (transcription_id,))
+
+    def find_by_output_filename(self, filename: str) -> Optional[JobRecord]:
+        row = self._connect().execute(
+            "SELECT payload FROM jobs WHERE output_filename = ?", (filename,)
+        ).fetchone()
+        return JobRecord.from_dict(json.loads(row[0])) if row else None
+
+    def purge_finished_before(self, cutoff: datetime) -> List[JobRecord]:
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        params = (*TERMINAL_STATUSES, cutoff.timestamp())
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"SELECT payload FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?", params
+            ).fetchall()
+            conn.execute(f"DELETE FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?", params)
+        return [JobRecord.from_dict(json.loads(row[0])) for row in rows]
+
+    def heartbeat(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO job_store_owners (owner, heartbeat_at) VALUES (?, ?)",
+                (self.owner, time.time()),
+            )
+
+    def fail_unfinished(self, error: str, *, stale_seconds: Optional[float] = None) -> int:
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        query = f"SELECT transcription_id FROM jobs WHERE status NOT IN ({placeholders})"
+        params: tuple = TERMINAL_STATUSES
+        conn = self._connect()
+        if stale_seconds is not None:
+            # Skip our own jobs and those of owners that heartbeated recently; rows without an
+            # owner predate ownership tracking and are recovered as before.
+            cutoff = time.time() - stale_seconds
+            query += (
+                " AND (owner IS NULL OR (owner != ? AND owner NOT IN "
+                "(SELECT owner FROM job_store_owners WHERE heartbeat_at >= ?)))"
+            )
+            params = (*TERMINAL_STATUSES, self.owner, cutoff)
+            with conn:
+                conn.execute("DELETE FROM job_store_owners WHERE heartbeat_at < ? AND owner != ?", (cutoff, self.owner))
+        rows = conn.execute(query, params).fetchall()
+        for (transcription_id,) in rows:
+            self._update(transcription_id, {"status": "failed", "error": error})
+        return len(rows)
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    @staticmethod
+    def _row(job: JobRecord) -> tuple:
+        updated_at = job.updated_at.astimezone(timezone.utc).timestamp()
+        return (job.transcription_id, job.status, job.output_filename, updated_at, json.dumps(job.to_dict()))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
@@ -1,93 +1,671 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+import os
+import re
+import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from contextlib import ExitStack
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 
 from app.config import Settings
-from app.schemas import OutputMode, TranscriptionAcceptedResponse, TranscriptionStatusResponse
-from app.services.job_store import JobRecord, JobStore
-from app.storage.local import LocalStorage
-from app.inference.whisper_runner import TranscriptionResult, WhisperRunner
+from app.schemas import (
+    OutputMode,
+    SearchHitResponse,
+    SearchResponse,
+    TranscriptionAcceptedResponse,
+    TranscriptionStatusResponse,
+)
+from app.services import formatters
+from app.services.broker import Broker, BrokerJob, ClaimLostError
+from app.services.ingest import UnsupportedMediaError, UploadIngestor, UploadTooLargeError
+from app.services.job_events import JobEvents
+from app.services.job_queue import JobQueue, QueuedJob, QueueFullError
+from app.services.job_store import TERMINAL_STATUSES, BaseJobStore, JobRecord
+from app.services.live_feed import LiveFeed
+from app.services.metrics import PipelineMetrics, StageTimer
+from app.services.search_index import InvalidQueryError, SearchIndex
+from app.services.scheduling import (
+    DEFAULT_PRIORITY,
+    FALLBACK_BYTES_PER_SECOND,
+    PRIORITY_CLASSES,
+    AudioQuota,
+    CostModel,
+    client_label,
+    priority_rank,
+)
+from app.services.transcript_cache import TranscriptCache
+from app.services.webhooks import WebhookDispatcher
+from app.storage.base import Storage
+from app.inference.model_registry import ModelRegistry
+from app.inference.audio import DecodePool, is_pcm, load_pcm
+from app.inference.batching import BatchScheduler
+from app.inference.whisper_runner import (
+    RESULT_SUFFIX,
+    SAMPLE_RATE,
+    DecodeOptions,
+    Segment,
+    SegmentTableBuilder,
+    TranscriptionResult,
+    TranscriptionStream,
+    WhisperRunner,
+    load_result,
+    write_result,
+)
 from app.utils import filenames
 
+logger = logging.getLogger(__name__)
+
+# ISO 639-1 codes, plus the few three-letter codes Whisper knows (e.g. ``haw``, ``yue``).
+LANGUAGE_CODE = re.compile(r"^[a-z]{2,3}$")
+
 
 class TranscriberService:
     """Coordinates uploads, inference, and artifact generation."""
 
+    STREAM_POLL_SECONDS = 0.5
+    # Behind a broker, job changes happen in other processes; waiters re-read the store this often.
+    BROKER_RECHECK_SECONDS = 1.0
+    # Progress is written to the job store at most this often per job.
+    PROGRESS_INTERVAL_SECONDS = 1.0
+    # Comment lines keep idle progress streams open through proxies.
+    KEEPALIVE_SECONDS = 15.0
+
     def __init__(
         self,
         *,
         settings: Settings,
-        job_store: JobStore,
-        storage: LocalStorage,
-        runner: WhisperRunner,
+        job_store: BaseJobStore,
+        storage: Storage,
+        registry: ModelRegistry,
+        job_queue: Optional[JobQueue] = None,
+        broker: Optional[Broker] = None,
+        live_feed: Optional[LiveFeed] = None,
+        cache: Optional[TranscriptCache] = None,
+        batcher: Optional[BatchScheduler] = None,
+        ingestor: Optional[UploadIngestor] = None,
+        decoder: Optional[DecodePool] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        search_index: Optional[SearchIndex] = None,
+        events: Optional[JobEvents] = None,
+        webhooks: Optional[WebhookDispatcher] = None,
     ) -> None:
         self.settings = settings
         self.job_store = job_store
         self.storage = storage
-        self.runner = runner
+        self.registry = registry
+        self.job_queue = job_queue
+        self.broker = broker
+        self.live_feed = live_feed or LiveFeed()
+        self.cache = cache
+        self.batcher = batcher
+        self.decoder = decoder
+        self.metrics = metrics
+        self.search_index = search_index
+        self.events = events or JobEvents()
+        self.webhooks = webhooks
+        self.cost_model = CostModel()
+        self.quota = AudioQuota(
+            limit_minutes=settings.client_quota_audio_minutes,
+            window_seconds=settings.client_quota_window_hours * 3600,
+        )
+        self.ingestor = ingestor or UploadIngestor(
+            storage,
+            max_bytes=settings.max_upload_mb * 1024 * 1024,
+            decode_pcm=settings.ingest_decode_pcm,
+        )
+
+    async def transcribe(
+        self,
+        upload: UploadFile,
+        modes: Sequence[OutputMode],
+        *,
+        model: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        word_timestamps: bool = False,
+        preset: Optional[str] = None,
+        language: Optional[str] = None,
+        priority: Optional[str] = None,
+        api_key: Optional[str] = None,
+        client_host: Optional[str] = None,
+        callback_url: Optional[str] = None,
+    ) -> TranscriptionAcceptedResponse:
+        """Queue a job that renders every format in ``modes`` from one inference pass.
+
+        The first format is the primary ``output_type``; JSON segments are always kept so
+        further formats can be rendered later without re-running inference. ``preset`` picks
+        decoding settings from ``Settings.decode_presets``; a ``language`` hint skips detection.
+        ``priority`` may lower, but never raise, the class configured for ``api_key``.
+        ``callback_url`` receives the final status as a webhook once the job finishes.
+        """
+
+        modes = list(dict.fromkeys(modes)) or [OutputMode.txt]
+        model_size = model or self.settings.model_size
+        if model_size not in self.settings.allowed_models:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_MODEL")
+        preset = preset or self.settings.default_preset
+        if preset not in self.settings.decode_presets:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_PRESET")
+        language = language.strip().lower() if language else None
+        if language is not None and not LANGUAGE_CODE.match(language):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_LANGUAGE")
+        compute_type = compute_type or self.settings.decode_presets[preset].compute_type
+        if compute_type is not None and compute_type not in self.settings.allowed_compute_types:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_COMPUTE_TYPE")
+        allowed_priority = self.settings.client_priorities.get(api_key or "", DEFAULT_PRIORITY)
+        if priority is not None and priority not in PRIORITY_CLASSES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_PRIORITY")
+        priority = PRIORITY_CLASSES[max(priority_rank(priority or allowed_priority), priority_rank(allowed_priority))]
+        if callback_url and (self.webhooks is None or not await run_in_threadpool(self.webhooks.allows, callback_url)):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_CALLBACK_URL")
+        client_id = client_label(
+            api_key, client_host, self.settings.client_priorities.keys() | self.settings.client_weights.keys()
+        )
+        weight = self.settings.client_weights.get(api_key or "", 1.0)
 
-    async def transcribe(self, upload: UploadFile, mode: OutputMode) -> TranscriptionAcceptedResponse:
         job_id = str(uuid.uuid4())
-        safe_stem = filenames.sanitize_stem(upload.filename or "audio")
         source_suffix = Path(upload.filename or "audio.mp3").suffix
         upload_name = filenames.build_upload_filename(job_id, source_suffix)
-        upload_path = await self.storage.save_upload(upload, upload_name)
+        started = time.perf_counter()
+        try:
+            ingested = await self.ingestor.ingest(upload, upload_name)
+        except UploadTooLargeError as exc:
+            raise HTTPException(status_code=413, detail="FILE_TOO_LARGE") from exc
+        except UnsupportedMediaError as exc:
+            raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="UNSUPPORTED_FORMAT") from exc
+        ingest_seconds = time.perf_counter() - started
+        audio_seconds = ingested.duration_seconds or ingested.size_bytes / FALLBACK_BYTES_PER_SECOND
+        charge = self.quota.charge(client_id, audio_seconds / 60)
+        if charge is None:
+            await run_in_threadpool(self.storage.delete_file, ingested.path)
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="QUOTA_EXCEEDED")
+        if self.metrics is not None:
+            self.metrics.stage_seconds.observe(ingest_seconds, stage="save_upload", model=model_size)
 
         job = JobRecord(
             transcription_id=job_id,
-            status="processing",
+            status="queued",
             input_filename=upload.filename or upload_name,
-            output_type=mode,
+            output_type=modes[0],
+            formats=[item.value for item in modes],
+            word_timestamps=word_timestamps,
+            model_size=model_size,
+            compute_type=compute_type,
+            preset=preset,
+            language=language,
+            client_id=client_id,
+            priority=priority,
+            callback_url=callback_url or None,
+            duration_seconds=ingested.duration_seconds,
+            timings={"save_upload": round(ingest_seconds, 4)},
+        )
+        # Store and broker calls are blocking I/O (SQLite may wait on a write lock), so keep
+        # them off the event loop.
+        await run_in_threadpool(self.job_store.create, job)
+
+        try:
+            await run_in_threadpool(
+                self._dispatch,
+                job,
+                ingested.path,
+                ingested.sha256,
+                cost_seconds=self.cost_model.estimate(model_size, audio_seconds, preset),
+                weight=weight,
+            )
+        except QueueFullError as exc:
+            self.quota.refund(charge)
+            await run_in_threadpool(self.job_store.delete, job_id)
+            await run_in_threadpool(self.storage.delete_file, ingested.path)
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="QUEUE_FULL") from exc
+
+        return TranscriptionAcceptedResponse(
+            transcription_id=job_id,
+            status=job.status,
+            started_at=job.created_at,
+            output_type=job.output_type,
+            output_types=modes,
+            input_filename=job.input_filename,
+        )
+
+    def _dispatch(
+        self, job: JobRecord, upload_path: Path, audio_sha256: str, *, cost_seconds: float, weight: float
+    ) -> None:
+        """Hand a job to the shared broker when configured, else to the in-process scheduler."""
+
+        job_id = job.transcription_id
+        if self.broker is not None:
+            self.broker.enqueue(
+                BrokerJob(
+                    transcription_id=job_id,
+                    upload_path=str(upload_path),
+                    audio_sha256=audio_sha256,
+                ),
+                max_depth=self.settings.max_queue_size,
+            )
+            return
+        if self.job_queue is None:
+            raise RuntimeError("TranscriberService has neither a job queue nor a broker")
+        self.job_queue.submit(
+            QueuedJob(
+                transcription_id=job_id,
+                handler=partial(self.process_job, job_id, upload_path, audio_sha256),
+                client_id=job.client_id or "anonymous",
+                priority=priority_rank(job.priority or DEFAULT_PRIORITY),
+                cost_seconds=cost_seconds,
+                weight=weight,
+            )
         )
-        self.job_store.create(job)
+        if self.decoder is not None:
+            self.decoder.prefetch(upload_path)
+
+    def process_job(
+        self, job_id: str, upload_path: Path, audio_sha256: str, *, owned: Optional[Callable[[], bool]] = None
+    ) -> None:
+        """Run inference for a queued job; executed on a background or broker worker.
+
+        Broker workers pass ``owned``, which says whether they still hold the job's claim. A job
+        that already finished or whose claim is gone is skipped, and one whose claim is lost while
+        it runs (requeued to another worker) is abandoned without writing a final status. With
+        ``owned`` the upload is left to the caller, which releases it once its ``ack`` succeeds.
+        """
 
+        current = self.job_store.get(job_id)
+        if current is None or current.status in TERMINAL_STATUSES or (owned is not None and not owned()):
+            if owned is None:
+                self.release_upload(upload_path)
+            return
+        job = self._update(job_id, status="processing")
+        if job is None:
+            if owned is None:
+                self.release_upload(upload_path)
+            return
+        self.live_feed.open(job_id)
+        timer = StageTimer()
+        leases = ExitStack()
+        lost = False
         try:
-            result = self.runner.run(str(upload_path))
-            output_filename = filenames.build_output_filename(upload.filename or "audio", mode)
-            if mode is OutputMode.txt:
-                payload = self._segments_to_text(result)
+            runner = leases.enter_context(self.registry.lease(job.model_size, job.compute_type))
+            options = runner.resolve_options(self._decode_options(job))
+            cache_key: Optional[str] = None
+            cached: Optional[TranscriptionResult] = None
+            if self.cache is not None:
+                cache_key = self.cache.build_key(audio_sha256, runner.model_size, options, job.word_timestamps)
+                cached = self.cache.get(cache_key)
+            if cached is not None:
+                stream = self._result_to_stream(cached)
             else:
-                payload = self._segments_to_srt(result)
-            output_path = self.storage.write_output(output_filename, payload)
+                with timer.stage("decode"):
+                    audio_path = self.decoder.decoded(upload_path) if self.decoder is not None else upload_path
+                with timer.stage("inference"):
+                    stream = self._start_inference(runner, audio_path, job.word_timestamps, options)
+            self._update(job_id, duration_seconds=stream.duration_seconds, progress_percent=0.0)
+            output_filename = filenames.build_output_filename(job.input_filename, job.output_type, job_id)
+            stem = Path(output_filename).stem
+            streamed = [fmt for fmt in job.formats if fmt in formatters.STREAM_FORMATS]
+            decoded = SegmentTableBuilder()
+            last_end = 0.0
+            reported = time.monotonic()
+            with ExitStack() as stack:
+                handles = {fmt: stack.enter_context(self.storage.open_output(f"{stem}.{fmt}")) for fmt in streamed}
+                for fmt, handle in handles.items():
+                    handle.write(formatters.STREAM_FORMATS[fmt].header)
+                for index, segment in enumerate(_timed(stream.segments, timer, "inference"), start=1):
+                    with timer.stage("render"):
+                        blocks = {}
+                        for fmt in handles:
+                            spec = formatters.STREAM_FORMATS[fmt]
+                            blocks[fmt] = (spec.separator if index > 1 else "") + spec.block(index, segment)
+                    with timer.stage("write_output"):
+                        for fmt, handle in handles.items():
+                            handle.write(blocks[fmt])
+                            handle.flush()
+                    decoded.append(segment)
+                    last_end = segment.end
+                    self.live_feed.publish(job_id, segment)
+                    if stream.duration_seconds and time.monotonic() - reported >= self.PROGRESS_INTERVAL_SECONDS:
+                        reported = time.monotonic()
+                        self._update(job_id, progress_percent=_percent(last_end, stream.duration_seconds))
+                    else:
+                        self.events.notify(job_id)
+            result = TranscriptionResult(
+                segments=decoded.build(),
+                language=stream.language,
+                language_probability=stream.language_probability,
+                duration_seconds=stream.duration_seconds or last_end,
+            )
+            with timer.stage("write_output"):
+                with self.storage.open_output(f"{stem}{RESULT_SUFFIX}", binary=True) as handle:
+                    write_result(handle, result)
+                rendered = list(streamed)
+                if OutputMode.json.value in job.formats:
+                    with self.storage.open_output(f"{stem}.{OutputMode.json.value}") as handle:
+                        formatters.write_transcript(handle, OutputMode.json.value, result)
+                    rendered.append(OutputMode.json.value)
+                self._precompress([f"{stem}.{fmt}" for fmt in rendered])
+            if owned is not None and not owned():
+                for name in [f"{stem}{RESULT_SUFFIX}", *(f"{stem}.{fmt}" for fmt in rendered)]:
+                    self.storage.delete_output(name)
+                raise ClaimLostError(job_id)
+            if cached is None and self.cache is not None and cache_key is not None:
+                self.cache.put(cache_key, result)
+            self._index(job, result, output_filename)
             download_url = self.storage.build_download_url(output_filename, self.settings)
-            self.job_store.update(
+            self._update(
                 job_id,
                 status="completed",
-                duration_seconds=result.duration_seconds,
+                progress_percent=100.0,
                 output_filename=output_filename,
                 download_url=download_url,
+                timings={**job.timings, **timer.rounded()},
             )
-            return TranscriptionAcceptedResponse(
-                transcription_id=job_id,
-                status="processing",
-                started_at=job.created_at,
-                output_type=mode,
-                input_filename=job.input_filename,
-            )
+            self._evict_outputs()
+            if cached is None:
+                # Only the model's own time: upload, decode and rendering do not scale with the RTF.
+                self.cost_model.observe(
+                    runner.model_size, result.duration_seconds, timer.seconds.get("inference", 0.0), job.preset or ""
+                )
+            if self.metrics is not None:
+                if cached is not None:
+                    timer.seconds.pop("inference", None)  # a cache hit says nothing about model speed
+                self.metrics.observe_job(
+                    timer.seconds,
+                    model=runner.model_size,
+                    device=getattr(runner, "device", "unknown"),
+                    audio_seconds=result.duration_seconds,
+                )
+                self.metrics.jobs.inc(status="completed")
+        except ClaimLostError:
+            lost = True
+            logger.warning("Lost the claim on %s; leaving it to the worker it was requeued to", job_id)
         except Exception as exc:  # pylint: disable=broad-except
-            self.job_store.update(job_id, status="failed", error=str(exc))
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="TRANSCRIPTION_FAILED") from exc
+            logger.exception("Transcription %s failed", job_id)
+            lost = owned is not None and not owned()
+            if not lost:
+                self._update(job_id, status="failed", error=str(exc), timings={**job.timings, **timer.rounded()})
+                if self.metrics is not None:
+                    self.metrics.jobs.inc(status="failed")
         finally:
-            self.storage.delete_file(upload_path)
+            leases.close()
+            self.live_feed.close(job_id)
+            self.events.notify(job_id)
+            if owned is None:
+                self.release_upload(upload_path)
+            if not lost:
+                self.send_callback(job_id)
+
+    def _update(self, job_id: str, **changes: Any) -> Optional[JobRecord]:
+        job = self.job_store.update(job_id, **changes)
+        self.events.notify(job_id)
+        return job
+
+    def send_callback(self, transcription_id: str) -> None:
+        """Queue the webhook of a finished job that asked for one."""
+
+        job = self.job_store.get(transcription_id)
+        if self.webhooks is None or job is None or not job.callback_url or job.status not in TERMINAL_STATUSES:
+            return
+        payload = {
+            "event": f"transcription.{job.status}",
+            "transcription_id": job.transcription_id,
+            "status": job.status,
+            "duration_seconds": job.duration_seconds,
+            "download_url": job.download_url,
+            "download_urls": self._download_urls(job),
+            "error": job.error,
+            "updated_at": job.updated_at.isoformat(),
+        }
+        self.webhooks.submit(job.callback_url, job.transcription_id, payload)
+
+    def release_upload(self, upload_path: Path) -> None:
+        if self.decoder is not None:
+            self.decoder.discard(upload_path)
+        self.storage.delete_file(upload_path)
+
+    def _decode_options(self, job: JobRecord) -> DecodeOptions:
+        # Jobs queued before presets existed (or with a since-removed preset) use the default one.
+        preset = self.settings.decode_presets.get(job.preset or "") or self.settings.decode_presets[
+            self.settings.default_preset
+        ]
+        return DecodeOptions(
+            beam_size=preset.beam_size,
+            best_of=preset.best_of,
+            temperature=tuple(preset.temperatures),
+            condition_on_previous_text=preset.condition_on_previous_text,
+            vad_filter=preset.vad_filter,
+            language=job.language,
+        )
+
+    def _start_inference(
+        self, runner: WhisperRunner, upload_path: Path, word_timestamps: bool, options: DecodeOptions
+    ) -> TranscriptionStream:
+        """Route short clips through the batch scheduler, everything else straight to the runner."""
+
+        pcm = is_pcm(upload_path)
+        if self.batcher is None or word_timestamps or not self.batcher.accepts(runner, 0.0, options):
+            audio_input = load_pcm(upload_path) if pcm else str(upload_path)
+            return runner.stream(audio_input, word_timestamps=word_timestamps, options=options)
+        if pcm:
+            audio = load_pcm(upload_path)
+        else:
+            from faster_whisper import decode_audio  # type: ignore[import-not-found]
+
+            audio = decode_audio(str(upload_path), sampling_rate=SAMPLE_RATE)
+        if not self.batcher.accepts(runner, len(audio) / SAMPLE_RATE, options):
+            return runner.stream(audio, options=options)
+        return self._result_to_stream(self.batcher.submit(runner, audio, options).result())
+
+    @staticmethod
+    def _result_to_stream(result: TranscriptionResult) -> TranscriptionStream:
+        return TranscriptionStream(
+            segments=iter(result.segments),
+            language=result.language,
+            language_probability=result.language_probability,
+            duration_seconds=result.duration_seconds,
+        )
+
+    def stream_segments(self, transcription_id: str) -> AsyncIterator[str]:
+        """Yield Server-Sent Events with partial segments until the job finishes."""
+
+        if not self.job_store.get(transcription_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid transcription ID.")
+        return self._segment_events(transcription_id)
+
+    async def _segment_events(self, transcription_id: str) -> AsyncIterator[str]:
+        offset = 0
+        while True:
+            chunk = self.live_feed.read(transcription_id, offset)
+            if chunk is not None:
+                offset, segments, pending = chunk
+                for segment in segments:
+                    offset += 1
+                    data = json.dumps({"index": offset, "start": segment.start, "end": segment.end, "text": segment.text})
+                    yield f"event: segment\ndata: {data}\n\n"
+                if pending:
+                    await self.events.wait(transcription_id, self.STREAM_POLL_SECONDS)
+                    continue
+            job = await run_in_threadpool(self.job_store.get, transcription_id)
+            if job is None:
+                return
+            if job.status in ("queued", "processing") and chunk is None:
+                await self.events.wait(transcription_id, self.STREAM_POLL_SECONDS)
+                continue
+            data = json.dumps({"status": job.status, "download_url": job.download_url, "error": job.error})
+            yield f"event: done\ndata: {data}\n\n"
+            return
+
+    def stream_progress(self, transcription_id: str) -> AsyncIterator[str]:
+        """Yield Server-Sent Events with the percent of audio decoded until the job finishes."""
+
+        if not self.job_store.get(transcription_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid transcription ID.")
+        return self._progress_events(transcription_id)
+
+    async def _progress_events(self, transcription_id: str) -> AsyncIterator[str]:
+        last: Optional[Dict[str, Any]] = None
+        while True:
+            job = await self._wait_for_job(
+                transcription_id,
+                self.KEEPALIVE_SECONDS,
+                lambda current: current is None or _progress(current) != last,
+            )
+            if job is None:
+                return
+            progress = _progress(job)
+            if progress == last:
+                yield ": keep-alive\n\n"
+                continue
+            last = progress
+            yield f"event: progress\ndata: {json.dumps(progress)}\n\n"
+            if job.status in TERMINAL_STATUSES:
+                data = json.dumps({"status": job.status, "download_url": job.download_url, "error": job.error})
+                yield f"event: done\ndata: {data}\n\n"
+                return
+
+    async def wait_status(self, transcription_id: str, *, wait: float) -> TranscriptionStatusResponse:
+        """Long-poll: return once the job's status changes or it is finished, or after ``wait`` seconds.
+
+        ``wait`` is capped at ``STATUS_MAX_WAIT_SECONDS``. A waiting request holds no thread and,
+        without a broker, is woken by the job update itself rather than by re-reading the store.
+        """
+
+        job = await run_in_threadpool(self.job_store.get, transcription_id)
+        if wait > 0 and job is not None and job.status not in TERMINAL_STATUSES:
+            initial = job.status
+            job = await self._wait_for_job(
+                transcription_id,
+                min(wait, self.settings.status_max_wait_seconds),
+                lambda current: current is None or current.status != initial,
+            )
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid transcription ID.")
+        return self._status_response(job)
+
+    async def _wait_for_job(
+        self, transcription_id: str, timeout: float, done: Callable[[Optional[JobRecord]], bool]
+    ) -> Optional[JobRecord]:
+        """The job once ``done(job)`` holds or ``timeout`` expires, whichever comes first."""
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            # Subscribe before reading, so an update between the read and the wait still wakes us.
+            future = self.events.subscribe(transcription_id)
+            try:
+                job = await run_in_threadpool(self.job_store.get, transcription_id)
+                remaining = deadline - loop.time()
+                if done(job) or remaining <= 0:
+                    return job
+                if self.broker is not None:
+                    remaining = min(remaining, self.BROKER_RECHECK_SECONDS)
+                try:
+                    await asyncio.wait_for(future, remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                self.events.unsubscribe(transcription_id, future)
 
     def get_status(self, transcription_id: str) -> TranscriptionStatusResponse:
         job = self.job_store.get(transcription_id)
         if not job:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invalid transcription ID.")
+        return self._status_response(job)
+
+    def _status_response(self, job: JobRecord) -> TranscriptionStatusResponse:
+        position: Optional[int] = None
+        eta: Optional[float] = None
+        if self.job_queue is not None and job.status in ("queued", "processing"):
+            estimate = self.job_queue.estimate(job.transcription_id)
+            if estimate is not None:
+                position, eta = estimate[0], round(estimate[1], 1)
         return TranscriptionStatusResponse(
             transcription_id=job.transcription_id,
             status=job.status,
             created_at=job.created_at,
             updated_at=job.updated_at,
             duration_seconds=job.duration_seconds,
+            progress_percent=job.progress_percent,
             output_type=job.output_type,
+            model_size=job.model_size,
+            preset=job.preset,
+            language=job.language,
+            priority=job.priority,
+            queue_position=position,
+            eta_seconds=eta,
             download_url=job.download_url,
+            download_urls=self._download_urls(job),
             error=job.error,
+            timings=job.timings,
+        )
+
+    def purge_expired(self) -> int:
+        """Drop finished jobs past the retention window together with their output files.
+
+        Afterwards the output tree is brought back under ``OUTPUT_MAX_MB``; jobs whose outputs
+        that evicts are dropped too, and clients with no audio left in the quota window are
+        forgotten. Returns how many jobs were removed.
+        """
+
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.settings.job_retention_hours)
+        expired = self.job_store.purge_finished_before(cutoff)
+        self.quota.sweep()
+        for job in expired:
+            if self.search_index is not None:
+                self.search_index.remove(job.transcription_id)
+            for filename in self._artifact_filenames(job):
+                self.storage.delete_output(filename)
+        return len(expired) + self._evict_outputs(rescan=True)
+
+    def _evict_outputs(self, *, rescan: bool = False) -> int:
+        evicted = 0
+        try:
+            stems = self.storage.enforce_quota(rescan=rescan)
+        except OSError:
+            logger.warning("Output quota sweep failed", exc_info=True)
+            return 0
+        for stem in stems:
+            job = self._job_for_stem(stem)
+            if job is None:
+                continue
+            self.job_store.delete(job.transcription_id)
+            if self.search_index is not None:
+                self.search_index.remove(job.transcription_id)
+            evicted += 1
+        return evicted
+
+    def search(self, query: str, *, limit: int, offset: int, order: str) -> SearchResponse:
+        if self.search_index is None:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="SEARCH_DISABLED")
+        try:
+            hits, more = self.search_index.search(query, limit=limit, offset=offset, order=order)
+        except InvalidQueryError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_QUERY") from exc
+        return SearchResponse(
+            query=query,
+            hits=[
+                SearchHitResponse(
+                    transcription_id=hit.transcription_id,
+                    start=hit.start,
+                    end=hit.end,
+                    text=hit.text,
+                    highlighted=hit.highlighted,
+                    input_filename=hit.input_filename,
+                    download_url=(
+                        self.storage.build_download_url(hit.output_filename, self.settings)
+                        if hit.output_filename
+                        else None
+                    ),
+                )
+                for hit in hits
+            ],
+            next_offset=offset + len(hits) if more else None,
         )
 
     def ensure_job_ready(self, transcription_id: str) -> JobRecord:
@@ -102,24 +680,120 @@ class TranscriberService:
         return self.storage.resolve_output_path(output_filename)
 
     def ensure_file_available(self, filename: str) -> JobRecord:
-        job = self.job_store.find_by_output_filename(filename)
+        """Find the completed job owning ``filename`` (any format sharing its output stem)."""
+
+        stem, _, _ = filename.rpartition(".")
+        job = self.job_store.find_by_output_filename(filename) or (self._job_for_stem(stem) if stem else None)
         if not job:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
         if job.status != "completed":
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Transcription not ready")
         return job
 
+    def _job_for_stem(self, stem: str) -> Optional[JobRecord]:
+        for mode in OutputMode:
+            job = self.job_store.find_by_output_filename(f"{stem}.{mode.value}")
+            if job is not None:
+                return job
+        return None
+
+    def resolve_download(self, filename: str) -> Tuple[Path, os.stat_result]:
+        """Return the path and stat for ``filename``, rendering it from stored segments if it was not requested."""
+
+        stem, _, extension = filename.rpartition(".")
+        if extension not in formatters.RENDERERS:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+        self.ensure_file_available(filename)
+        path = self.resolve_output_path(filename)
+        stat = self.storage.stat_output(filename)
+        if stat is not None:
+            self.storage.touch_output(filename)
+            return path, stat
+        try:
+            result = load_result(self.resolve_output_path(f"{stem}{RESULT_SUFFIX}"))
+        except FileNotFoundError:
+            result = self._load_legacy_json(stem)
+        with self.storage.open_output(filename) as handle:
+            formatters.write_transcript(handle, extension, result)
+        self._precompress([filename])
+        return path, path.stat()
+
+    def _load_legacy_json(self, stem: str) -> TranscriptionResult:
+        """Jobs finished before the binary segment file existed only kept ``<stem>.json``."""
+
+        try:
+            payload = json.loads(self.resolve_output_path(f"{stem}.{OutputMode.json.value}").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found") from None
+        return TranscriptionResult.from_dict(payload)
+
+    def _index(self, job: JobRecord, result: TranscriptionResult, output_filename: str) -> None:
+        """Add a finished transcript to the search index; a failure here never fails the job."""
+
+        if self.search_index is None:
+            return
+        try:
+            self.search_index.add(
+                job.transcription_id, result, output_filename=output_filename, input_filename=job.input_filename
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Could not index transcription %s", job.transcription_id)
+
+    def _precompress(self, filenames: Sequence[str]) -> None:
+        if not self.settings.precompress_outputs:
+            return
+        for filename in filenames:
+            try:
+                self.storage.compress_output(filename, min_bytes=self.settings.precompress_min_bytes)
+            except OSError:
+                logger.warning("Could not pre-compress %s", filename, exc_info=True)
+
+    def _artifact_filenames(self, job: JobRecord) -> List[str]:
+        if not job.output_filename:
+            return []
+        stem = Path(job.output_filename).stem
+        return [f"{stem}.{mode.value}" for mode in OutputMode] + [f"{stem}{RESULT_SUFFIX}"]
+
+    def _download_urls(self, job: JobRecord) -> Dict[str, str]:
+        if job.status != "completed" or not job.output_filename:
+            return {}
+        stem = Path(job.output_filename).stem
+        return {
+            fmt: self.storage.build_download_url(f"{stem}.{fmt}", self.settings)
+            for fmt in dict.fromkeys([*job.formats, OutputMode.json.value])
+        }
+
     @staticmethod
     def _segments_to_text(result: TranscriptionResult) -> str:
-        lines = [f"[{seg.start:.2f} - {seg.end:.2f}] {seg.text}" for seg in result.segments]
-        return "\n".join(lines)
+        return formatters.segments_to_text(result)
 
     @staticmethod
     def _segments_to_srt(result: TranscriptionResult) -> str:
-        rows = []
-        for idx, seg in enumerate(result.segments, start=1):
-            rows.append(str(idx))
-            rows.append(f"{filenames.format_timestamp(seg.start)} --> {filenames.format_timestamp(seg.end)}")
-            rows.append(seg.text)
-            rows.append("")
-        return "\n".join(rows)
+        return formatters.segments_to_srt(result)
+
+
+def _timed(segments: Iterable[Segment], timer: StageTimer, stage: str) -> Iterator[Segment]:
+    """Charge the time spent producing each segment (lazy decoding) to ``stage``."""
+
+    iterator = iter(segments)
+    while True:
+        with timer.stage(stage):
+            segment = next(iterator, None)
+        if segment is None:
+            return
+        yield segment
+
+
+def _percent(position: float, duration: float) -> float:
+    return round(min(max(position / duration, 0.0), 1.0) * 100, 1)
+
+
+def _progress(job: JobRecord) -> Dict[str, Any]:
+    percent = 100.0 if job.status == "completed" else job.progress_percent or 0.0
+    processed = round(job.duration_seconds * percent / 100, 3) if job.duration_seconds else None
+    return {
+        "status": job.status,
+        "percent": percent,
+        "processed_seconds": processed,
+        "duration_seconds": job.duration_seconds,
+    }
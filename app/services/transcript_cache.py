@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from app.config import Settings
+from app.inference.whisper_runner import RESULT_SUFFIX, DecodeOptions, TranscriptionResult, load_result, save_result
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    """Content-addressed on-disk cache of transcription results.
+
+    Entries are binary segment files (``whisper_runner.save_result``) named after a digest of the
+    audio hash and decoding options, memory-mapped on a hit.
+    Eviction drops entries older than ``max_age_seconds`` and then the least recently
+    used entries until the cache fits in ``max_bytes``. Inserts only add to a running size
+    estimate; the directory is scanned when the estimate exceeds ``max_bytes`` or the last scan
+    is ``SWEEP_SECONDS`` old, which also picks up other processes' writes and expired entries.
+    """
+
+    SWEEP_SECONDS = 300.0
+
+    def __init__(self, cache_dir: str, *, max_bytes: int, max_age_seconds: float) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._sweep_lock = Lock()
+        # Bytes as of the last scan plus what was written since; ``None`` until a scan ran.
+        self._usage_bytes: Optional[int] = None
+        self._swept_at = 0.0
+
+    @staticmethod
+    def build_key(
+        audio_sha256: str,
+        model_size: str,
+        options: DecodeOptions,
+        word_timestamps: bool = False,
+    ) -> str:
+        raw = f"{audio_sha256}|{model_size}|{options.cache_token()}|{int(word_timestamps)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[TranscriptionResult]:
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age_seconds:
+                raise FileNotFoundError(path)
+            result = load_result(path)
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: TranscriptionResult) -> None:
+        path = self._path(key)
+        save_result(path, result)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        with self._lock:
+            if self._usage_bytes is not None:
+                self._usage_bytes += size
+        self.evict()
+
+    def evict(self, *, rescan: bool = False) -> None:
+        """Scan the directory and evict, unless the running estimate says nothing is due."""
+
+        with self._sweep_lock:
+            now = time.time()
+            with self._lock:
+                usage = self._usage_bytes
+            due = usage is None or usage > self.max_bytes or now - self._swept_at >= self.SWEEP_SECONDS
+            if not rescan and not due:
+                return
+            entries = []
+            # ``*.json`` entries predate the binary format and are swept like any other.
+            for path in [*self.cache_dir.glob(f"*{RESULT_SUFFIX}"), *self.cache_dir.glob("*.json")]:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.max_age_seconds:
+                    path.unlink(missing_ok=True)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            # Temp files of writers that crashed mid-save.
+            for path in self.cache_dir.glob("*.part"):
+                try:
+                    if now - path.stat().st_mtime > self.max_age_seconds:
+                        path.unlink(missing_ok=True)
+                except OSError:
+                    continue
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+            with self._lock:
+                self._usage_bytes = total
+            self._swept_at = now
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{RESULT_SUFFIX}"
+
+
+def build_transcript_cache(settings: Settings) -> Optional[TranscriptCache]:
+    if not settings.cache_enabled:
+        return None
+    return TranscriptCache(
+        settings.cache_dir,
+        max_bytes=settings.cache_max_mb * 1024 * 1024,
+        max_age_seconds=settings.cache_max_age_hours * 3600,
+    )
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import hmac
+import http.client
+import ipaddress
+import itertools
+import json
+import logging
+import random
+import socket
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from app.config import Settings
+from app.services.metrics import PipelineMetrics
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+MAX_BACKOFF_SECONDS = 300.0
+# Client errors other than these mean the receiver rejected the payload; retrying cannot help.
+RETRYABLE_CLIENT_ERRORS = (408, 425, 429)
+
+# ``(url, address, body, headers, timeout)`` -> HTTP status; connects to ``address`` (the IP
+# that passed the checks) and raises ``OSError`` on network failures.
+Sender = Callable[[str, str, bytes, Dict[str, str], float], int]
+
+
+# ``host`` -> every address it resolves to; raises ``OSError`` when it does not resolve.
+Resolver = Callable[[str], List[str]]
+
+
+def _resolve(host: str) -> List[str]:
+    return [info[4][0] for info in socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)]
+
+
+def resolve_callback(
+    url: str, allowed_hosts: Iterable[str] = (), resolver: Optional[Resolver] = None
+) -> Optional[str]:
+    """The address the server may POST ``url`` to, or ``None`` when it must not.
+
+    With ``allowed_hosts`` only those hosts pass. Otherwise the host must resolve, and only to
+    public addresses: loopback, private, link-local (cloud metadata), reserved and multicast
+    targets are refused so a callback cannot reach the server's own network. Deliveries
+    connect to the returned address, so a later DNS answer cannot redirect them.
+    """
+
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower().rstrip(".")
+    if parsed.scheme not in ("http", "https") or not host:
+        return None
+    allowed = {item.lower() for item in allowed_hosts}
+    if allowed and host not in allowed:
+        return None
+    try:
+        addresses = (resolver or _resolve)(host)
+    except (OSError, UnicodeError):
+        return None
+    if not addresses:
+        return None
+    if not allowed:
+        for address in addresses:
+            ip = ipaddress.ip_address(address.split("%", 1)[0])
+            if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+                ip = ip.ipv4_mapped
+            if not ip.is_global or ip.is_multicast:
+                return None
+    return addresses[0]
+
+
+def is_valid_callback_url(
+    url: str, allowed_hosts: Iterable[str] = (), resolver: Optional[Resolver] = None
+) -> bool:
+    """Whether the server may POST to ``url`` (see ``resolve_callback``)."""
+
+    return resolve_callback(url, allowed_hosts, resolver) is not None
+
+
+_sequence = itertools.count()
+
+
+@dataclass
+class _Delivery:
+    url: str
+    body: bytes
+    transcription_id: str
+    host: str = ""
+    attempt: int = 0
+    sequence: int = field(default_factory=lambda: next(_sequence))
+
+
+class WebhookDispatcher:
+    """Delivers job completion callbacks from a small thread pool, retrying with backoff.
+
+    Each callback is a JSON ``POST``; any 2xx answer counts as delivered. Network errors, 5xx
+    and the retryable 4xx codes are retried with a delay doubling from ``backoff_seconds`` (with
+    jitter, capped at ``MAX_BACKOFF_SECONDS``) up to ``max_attempts`` tries. With ``secret`` the body is
+    signed with HMAC-SHA256 in ``X-Webhook-Signature``. Pending deliveries live in memory, so a
+    restart drops them; receivers can always fall back to ``GET /status``.
+
+    ``workers`` threads share the due-time heap, but each host gets at most one request in
+    flight, so a slow receiver ties up one thread rather than every client's callbacks. The URL
+    is re-checked against ``allowed_hosts`` and the address rules before every attempt because
+    DNS may have changed since the job was accepted, and the request goes to the address that
+    was checked. Redirects are never followed; a 3xx answer is a failed delivery.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int,
+        backoff_seconds: float,
+        timeout_seconds: float,
+        workers: int = 4,
+        secret: str = "",
+        allowed_hosts: Iterable[str] = (),
+        metrics: Optional[PipelineMetrics] = None,
+        sender: Optional[Sender] = None,
+        resolver: Optional[Resolver] = None,
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self.workers = max(1, workers)
+        self.secret = secret
+        self.allowed_hosts = list(allowed_hosts)
+        self.metrics = metrics
+        self._send = sender or _post
+        self._resolve = resolver
+        self._due: List[Tuple[float, int, _Delivery]] = []
+        self._busy_hosts: Set[str] = set()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping = False
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"webhook-dispatcher-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        self._threads = []
+
+    def allows(self, url: str) -> bool:
+        """Whether ``url`` is an acceptable callback target right now (resolves DNS; blocking)."""
+
+        return is_valid_callback_url(url, self.allowed_hosts, self._resolve)
+
+    def submit(self, url: str, transcription_id: str, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        host = (urlparse(url).hostname or "").lower()
+        self._schedule(_Delivery(url, body, transcription_id, host), time.monotonic())
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._due) + len(self._busy_hosts)
+
+    def _schedule(self, delivery: _Delivery, due: float) -> None:
+        with self._cond:
+            heapq.heappush(self._due, (due, delivery.sequence, delivery))
+            self._cond.notify()
+
+    def _next_ready(self) -> Tuple[Optional[_Delivery], Optional[float]]:
+        """Take the earliest due delivery whose host is idle, else say how long to wait."""
+
+        now = time.monotonic()
+        wait: Optional[float] = None
+        for index, (due, _, delivery) in enumerate(self._due):
+            if delivery.host in self._busy_hosts:
+                continue
+            if due <= now:
+                self._due[index] = self._due[-1]
+                self._due.pop()
+                heapq.heapify(self._due)
+                return delivery, None
+            wait = due - now if wait is None else min(wait, due - now)
+        return None, wait
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    delivery, wait = self._next_ready()
+                    if delivery is not None:
+                        break
+                    self._cond.wait(wait)
+                self._busy_hosts.add(delivery.host)
+            try:
+                self._attempt(delivery)
+            finally:
+                with self._cond:
+                    self._busy_hosts.discard(delivery.host)
+                    self._cond.notify_all()
+
+    def _attempt(self, delivery: _Delivery) -> None:
+        delivery.attempt += 1
+        address = resolve_callback(delivery.url, self.allowed_hosts, self._resolve)
+        if address is None:
+            self._count("blocked")
+            logger.warning("Dropping webhook for %s: callback host is not allowed", delivery.transcription_id)
+            return
+        headers = {"Content-Type": "application/json", "User-Agent": "stt-webhooks"}
+        if self.secret:
+            digest = hmac.new(self.secret.encode("utf-8"), delivery.body, hashlib.sha256).hexdigest()
+            headers[SIGNATURE_HEADER] = f"sha256={digest}"
+        try:
+            status_code = self._send(delivery.url, address, delivery.body, headers, self.timeout_seconds)
+        except Exception as exc:  # pylint: disable=broad-except
+            # http.client raises OSError, socket timeouts, SSL or HTTPException errors.
+            status_code, reason = 0, str(exc)
+        else:
+            reason = f"HTTP {status_code}"
+        if 200 <= status_code < 300:
+            self._count("delivered")
+            return
+        retryable = status_code == 0 or status_code >= 500 or status_code in RETRYABLE_CLIENT_ERRORS
+        if not retryable or delivery.attempt >= self.max_attempts:
+            self._count("failed")
+            logger.warning(
+                "Giving up on webhook for %s after %d attempts (%s)", delivery.transcription_id, delivery.attempt, reason
+            )
+            return
+        self._count("retried")
+        delay = min(self.backoff_seconds * 2 ** (delivery.attempt - 1), MAX_BACKOFF_SECONDS)
+        self._schedule(delivery, time.monotonic() + delay * random.uniform(0.8, 1.2))
+
+    def _count(self, outcome: str) -> None:
+        if self.metrics is not None:
+            self.metrics.webhooks.inc(outcome=outcome)
+
+
+def build_webhook_dispatcher(settings: Settings, *, metrics: Optional[PipelineMetrics] = None) -> WebhookDispatcher:
+    return WebhookDispatcher(
+        max_attempts=settings.webhook_max_attempts,
+        backoff_seconds=settings.webhook_backoff_seconds,
+        timeout_seconds=settings.webhook_timeout_seconds,
+        workers=settings.webhook_workers,
+        secret=settings.webhook_secret,
+        allowed_hosts=settings.webhook_allowed_hosts,
+        metrics=metrics,
+    )
+
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection to a fixed, already validated IP; ``Host`` still names the original host."""
+
+    def __init__(self, host: str, port: int, *, address: str, timeout: float) -> None:
+        super().__init__(host, port, timeout=timeout)
+        self.address = address
+
+    def connect(self) -> None:
+        self.sock = socket.create_connection((self.address, self.port), self.timeout)
+
+
+class _PinnedHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPS counterpart of ``_PinnedHTTPConnection``; the certificate is checked against the host name."""
+
+    def __init__(self, host: str, port: int, *, address: str, timeout: float) -> None:
+        super().__init__(host, port, timeout=timeout, context=ssl.create_default_context())
+        self.address = address
+
+    def connect(self) -> None:
+        sock = socket.create_connection((self.address, self.port), self.timeout)
+        self.sock = self._context.wrap_socket(sock, server_hostname=self.host)
+
+
+def _post(url: str, address: str, body: bytes, headers: Dict[str, str], timeout: float) -> int:
+    # http.client never follows redirects, so the validated address is the only one contacted.
+    parsed = urlparse(url)
+    secure = parsed.scheme == "https"
+    connection_class = _PinnedHTTPSConnection if secure else _PinnedHTTPConnection
+    connection = connection_class(
+        parsed.hostname or "", parsed.port or (443 if secure else 80), address=address, timeout=timeout
+    )
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    try:
+        connection.request("POST", path, body=body, headers=headers)
+        return connection.getresponse().status
+    finally:
+        connection.close()
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional
+
+from app.config import Settings
+from app.inference.audio import DecodePool
+from app.inference.batching import build_batch_scheduler
+from app.inference.model_registry import ModelRegistry
+from app.routers.metrics import CONTENT_TYPE
+from app.services.broker import Broker, BrokerJob, build_broker
+from app.services.metrics import PipelineMetrics
+from app.services.search_index import SearchIndex
+from app.services.transcriber import TranscriberService
+from app.services.transcript_cache import build_transcript_cache
+from app.services.webhooks import build_webhook_dispatcher
+from app.storage.local import build_storage
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceWorker:
+    """Claims jobs from a shared broker and runs them through ``TranscriberService``.
+
+    Each of ``concurrency`` threads processes one job at a time and heartbeats it every
+    ``worker_heartbeat_seconds``. A maintenance thread requeues jobs whose worker stopped
+    heartbeating for ``worker_stale_seconds`` (e.g. a crashed process on another node). A
+    worker that was only slow notices it lost the claim, drops its result and leaves the upload
+    to the job's new worker.
+    """
+
+    CLAIM_TIMEOUT_SECONDS = 1.0
+
+    def __init__(
+        self,
+        *,
+        settings: Settings,
+        broker: Broker,
+        service: TranscriberService,
+        concurrency: int,
+        worker_id: Optional[str] = None,
+    ) -> None:
+        self.settings = settings
+        self.broker = broker
+        self.service = service
+        self.concurrency = max(1, concurrency)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "InferenceWorker":
+        broker = build_broker(settings)
+        if broker is None:
+            raise RuntimeError("BROKER_BACKEND must be 'sqlite' or 'redis' to run inference workers")
+        registry = ModelRegistry.from_settings(settings)
+        metrics = PipelineMetrics()
+        service = TranscriberService(
+            settings=settings,
+            job_store=broker.job_store(),
+            storage=build_storage(settings),
+            registry=registry,
+            # Jobs only run here in broker mode, so the worker owns the cache and batching.
+            cache=build_transcript_cache(settings),
+            batcher=build_batch_scheduler(settings),
+            decoder=(
+                DecodePool(settings.decode_workers, max_pending=settings.inference_workers)
+                if settings.decode_workers > 0
+                else None
+            ),
+            # Workers finish jobs, so they feed the index; it is per host (see SearchIndex).
+            search_index=SearchIndex(settings.search_index_path) if settings.search_enabled else None,
+            metrics=metrics,
+            webhooks=build_webhook_dispatcher(settings, metrics=metrics),
+        )
+        return cls(settings=settings, broker=broker, service=service, concurrency=settings.inference_workers)
+
+    def run_forever(self) -> None:
+        self.service.registry.warm_up(self.settings.warmup_models)
+        if self.service.batcher is not None:
+            self.service.batcher.start()
+        metrics_server = self._serve_metrics() if self.settings.worker_metrics_port > 0 else None
+        threads: List[threading.Thread] = [
+            threading.Thread(target=self._claim_loop, name=f"broker-worker-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        threads.append(threading.Thread(target=self._maintenance_loop, name="broker-maintenance", daemon=True))
+        for thread in threads:
+            thread.start()
+        if self.service.webhooks is not None:
+            self.service.webhooks.start()
+        logger.info("Inference worker %s started with %d slots", self.worker_id, self.concurrency)
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            self.stop()
+        for thread in threads:
+            thread.join()
+        if self.service.webhooks is not None:
+            self.service.webhooks.stop(timeout=5.0)
+        if self.service.batcher is not None:
+            self.service.batcher.stop(timeout=5.0)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        self.service.registry.close()
+        if self.service.decoder is not None:
+            self.service.decoder.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _serve_metrics(self) -> ThreadingHTTPServer:
+        """Expose this worker's ``PipelineMetrics`` on ``WORKER_METRICS_PORT`` (any path)."""
+
+        metrics = self.service.metrics
+        assert metrics is not None
+        cache = self.service.cache
+        metrics.gauge("stt_loaded_models", "Whisper runners resident in memory.", lambda: len(list(self.service.registry.loaded())))
+        if cache is not None:
+            metrics.gauge("stt_cache_hit_rate", "Transcript cache hits per lookup.", lambda: cache.hit_rate)
+            metrics.gauge("stt_cache_hits", "Transcript cache hits since start.", lambda: cache.hits)
+            metrics.gauge("stt_cache_misses", "Transcript cache misses since start.", lambda: cache.misses)
+        if self.service.webhooks is not None:
+            webhooks = self.service.webhooks
+            metrics.gauge("stt_webhooks_pending", "Webhook deliveries queued or awaiting a retry.", lambda: webhooks.pending)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:  # pylint: disable=redefined-builtin
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", self.settings.worker_metrics_port), Handler)
+        threading.Thread(target=server.serve_forever, name="worker-metrics", daemon=True).start()
+        logger.info("Worker metrics on :%d", self.settings.worker_metrics_port)
+        return server
+
+    def _claim_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.broker.claim(self.worker_id, self.CLAIM_TIMEOUT_SECONDS)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Failed to claim job")
+                self._stop.wait(self.CLAIM_TIMEOUT_SECONDS)
+                continue
+            if job is not None:
+                self._run(job)
+
+    def _run(self, job: BrokerJob) -> None:
+        done = threading.Event()
+
+        def beat() -> None:
+            while not done.wait(self.settings.worker_heartbeat_seconds):
+                try:
+                    self.broker.heartbeat(self.worker_id, job.transcription_id)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Heartbeat failed for %s", job.transcription_id)
+
+        heartbeat = threading.Thread(target=beat, name=f"heartbeat-{job.transcription_id}", daemon=True)
+        heartbeat.start()
+        try:
+            self.service.process_job(
+                job.transcription_id,
+                Path(job.upload_path),
+                job.audio_sha256,
+                owned=lambda: self.broker.owns(self.worker_id, job.transcription_id),
+            )
+        finally:
+            done.set()
+            heartbeat.join()
+            # A requeued job belongs to another worker now, and so does its upload.
+            if self.broker.ack(self.worker_id, job.transcription_id):
+                self.service.release_upload(Path(job.upload_path))
+
+    def _maintenance_loop(self) -> None:
+        while not self._stop.wait(self.settings.worker_heartbeat_seconds):
+            try:
+                exhausted = self.broker.requeue_stale(
+                    self.settings.worker_stale_seconds, max_attempts=self.settings.worker_max_attempts
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Stale job sweep failed")
+                continue
+            for job in exhausted:
+                self.service.storage.delete_file(Path(job.upload_path))
+                self.service.send_callback(job.transcription_id)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from app.config import Settings
+from app.utils.http_files import ENCODING_SUFFIXES
+
+# Suffix of in-progress writes; they are never served and the quota sweep skips them.
+PART_SUFFIX = ".part"
+
+
+def artifact_stem(filename: str) -> str:
+    """The job stem of an artifact: ``talk`` for ``talk.srt``, ``talk.seg`` or ``talk.srt.gz``."""
+
+    for _, suffix in ENCODING_SUFFIXES:
+        if filename.endswith(suffix):
+            filename = filename[: -len(suffix)]
+            break
+    return filename.rpartition(".")[0] or filename
+
+
+def shard_path(root: Path, filename: str) -> Path:
+    """``root/ab/cd/filename``, where ``abcd`` starts the SHA-1 of the artifact's job stem.
+
+    All artifacts of a job share one directory, and 65536 shards keep directories small
+    however many jobs are stored.
+    """
+
+    digest = hashlib.sha1(artifact_stem(filename).encode("utf-8")).hexdigest()
+    return root / digest[:2] / digest[2:4] / filename
+
+
+class AtomicWriter:
+    """File handle that writes to a private temp file and renames it over ``path`` on commit.
+
+    Leaving the ``with`` block normally (or ``close``) commits; an exception inside it discards
+    the temp file, so readers only ever see complete files.
+    """
+
+    def __init__(self, path: Path, mode: str, on_commit: Optional[Callable[[Path], None]] = None) -> None:
+        self.path = path
+        self._tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}{PART_SUFFIX}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self._tmp_path.open(mode, encoding=None if "b" in mode else "utf-8")
+        self._on_commit = on_commit
+        self._done = False
+
+    def write(self, data: Any) -> int:
+        return self._handle.write(data)
+
+    def __getattr__(self, name: str) -> Any:
+        # flush, seek, tell, truncate, ...
+        return getattr(self._handle, name)
+
+    def commit(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        self._handle.close()
+        os.replace(self._tmp_path, self.path)
+        if self._on_commit is not None:
+            self._on_commit(self.path)
+
+    def discard(self) -> None:
+        if self._done:
+            return
+        self._done = True
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    close = commit
+
+    def __enter__(self) -> "AtomicWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class Storage(ABC):
+    """Interface shared by the storage backends.
+
+    Uploads are inference scratch files and always live on local disk; outputs go through the
+    backend. Methods block, so async handlers call them through ``run_in_threadpool``.
+    """
+
+    @property
+    @abstractmethod
+    def usage_bytes(self) -> Optional[int]:
+        """Output bytes held locally, ``None`` until the quota has scanned them."""
+
+    @abstractmethod
+    def resolve_upload_path(self, filename: str) -> Path:
+        ...
+
+    @abstractmethod
+    def open_upload(self, filename: str) -> AtomicWriter:
+        """Open an upload destination for streamed binary writes; the caller commits it."""
+
+    @abstractmethod
+    def open_output(self, filename: str, *, binary: bool = False) -> AtomicWriter:
+        """Open an output for incremental writes; it becomes visible once committed."""
+
+    def write_output(self, filename: str, payload: str) -> Path:
+        with self.open_output(filename) as handle:
+            handle.write(payload)
+        return handle.path
+
+    @abstractmethod
+    def resolve_output_path(self, filename: str) -> Path:
+        """Local path to read an output from (remote backends fetch it first)."""
+
+    @abstractmethod
+    def stat_output(self, filename: str) -> Optional[os.stat_result]:
+        ...
+
+    @abstractmethod
+    def compress_output(self, filename: str, *, min_bytes: int = 0) -> List[str]:
+        ...
+
+    @abstractmethod
+    def touch_output(self, filename: str) -> None:
+        """Mark an output as just used, so the quota evicts it last."""
+
+    @abstractmethod
+    def delete_output(self, filename: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete_file(self, file_path: Optional[Path]) -> None:
+        ...
+
+    @abstractmethod
+    def enforce_quota(self, *, rescan: bool = False) -> List[str]:
+        """Evict least recently used outputs over the quota; returns the job stems now gone for good."""
+
+    def build_download_url(self, filename: str, settings: Settings) -> str:
+        return f"{settings.api_prefix}/download/{filename}"
@@ -1,45 +1,121 @@
 from __future__ import annotations
 
+import gzip
+import logging
+import os
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Optional
-
-from fastapi import UploadFile
+from typing import Dict, List, Optional, Tuple
 
 from app.config import Settings
+from app.storage.base import PART_SUFFIX, AtomicWriter, Storage, artifact_stem, shard_path
+from app.utils.http_files import ENCODING_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+# Temp files untouched for this long belong to a crashed writer; the quota sweep removes them.
+STALE_PART_SECONDS = 24 * 3600
 
 
-class LocalStorage:
-    """File-system backed storage for uploads and generated transcripts."""
+class LocalStorage(Storage):
+    """File-system backed storage for uploads and generated transcripts.
 
-    def __init__(self, upload_dir: str, output_dir: str) -> None:
+    Files sit in hash-prefixed shard directories (``shard_path``) and are written atomically.
+    Outputs written before sharding stay readable from the flat ``output_dir``. With
+    ``max_output_bytes`` the output tree is held under a disk quota: ``enforce_quota`` deletes
+    whole jobs' outputs, least recently used first. Use is tracked in the files' atime, so the
+    mtime behind download validators never changes.
+    """
+
+    def __init__(self, upload_dir: str, output_dir: str, *, max_output_bytes: int = 0) -> None:
         self.upload_dir = Path(upload_dir)
         self.output_dir = Path(output_dir)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.max_output_bytes = max_output_bytes
+        # Output bytes as of the last sweep plus what was written since; ``None`` until a sweep ran.
+        self._usage_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
 
-    async def save_upload(self, file: UploadFile, filename: str) -> Path:
-        destination = self.upload_dir / filename
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        with destination.open("wb") as buffer:
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
-                buffer.write(chunk)
-        await file.seek(0)
-        return destination
-
-    def write_output(self, filename: str, payload: str) -> Path:
-        path = self.output_dir / filename
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(payload, encoding="utf-8")
-        return path
+    @property
+    def usage_bytes(self) -> Optional[int]:
+        with self._lock:
+            return self._usage_bytes
+
+    def resolve_upload_path(self, filename: str) -> Path:
+        return shard_path(self.upload_dir, filename)
+
+    def open_upload(self, filename: str) -> AtomicWriter:
+        return AtomicWriter(self.resolve_upload_path(filename), "wb")
+
+    def open_output(self, filename: str, *, binary: bool = False) -> AtomicWriter:
+        return AtomicWriter(shard_path(self.output_dir, filename), "wb" if binary else "w", self._published)
 
-    def build_download_url(self, filename: str, settings: Settings) -> str:
-        return f"{settings.api_prefix}/download/{filename}"
+    def compress_output(self, filename: str, *, min_bytes: int = 0) -> List[str]:
+        """Write gzip (and brotli, when installed) siblings of ``filename`` for download negotiation.
+
+        Variants are written atomically and inherit the source mtime, so validators stay stable.
+        Returns the encodings written.
+        """
+
+        source = self.resolve_output_path(filename)
+        data = source.read_bytes()
+        if len(data) < min_bytes:
+            return []
+        stat = source.stat()
+        written = []
+        for encoding, suffix in ENCODING_SUFFIXES:
+            compressed = _compress(encoding, data)
+            if compressed is None or len(compressed) >= len(data):
+                continue
+            target = source.with_name(source.name + suffix)
+            # A private temp name, like ``AtomicWriter``: workers compressing the same output
+            # concurrently must not write into each other's temp file.
+            tmp_path = target.with_name(f"{target.name}.{uuid.uuid4().hex[:8]}{PART_SUFFIX}")
+            try:
+                tmp_path.write_bytes(compressed)
+                os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                os.replace(tmp_path, target)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            self._published(target)
+            written.append(encoding)
+        return written
 
     def resolve_output_path(self, filename: str) -> Path:
-        return self.output_dir / filename
+        path = shard_path(self.output_dir, filename)
+        if not path.exists():
+            legacy = self.output_dir / filename
+            if legacy.exists():
+                return legacy
+        return path
+
+    def stat_output(self, filename: str) -> Optional[os.stat_result]:
+        try:
+            return self.resolve_output_path(filename).stat()
+        except OSError:
+            return None
+
+    def touch_output(self, filename: str) -> None:
+        path = self.resolve_output_path(filename)
+        try:
+            os.utime(path, ns=(time.time_ns(), path.stat().st_mtime_ns))
+        except OSError:
+            pass
+
+    def delete_output(self, filename: str) -> None:
+        for path in (shard_path(self.output_dir, filename), self.output_dir / filename):
+            for candidate in [path, *(path.with_name(path.name + suffix) for _, suffix in ENCODING_SUFFIXES)]:
+                try:
+                    size = candidate.stat().st_size
+                except OSError:
+                    continue
+                self.delete_file(candidate)
+                self._count(-size)
 
     def delete_file(self, file_path: Optional[Path]) -> None:
         if file_path is None:
@@ -50,3 +126,103 @@ class LocalStorage:
             # Python<3.8 compatibility fallback
             if Path(file_path).exists():
                 Path(file_path).unlink()
+
+    def enforce_quota(self, *, rescan: bool = False) -> List[str]:
+        """Delete the least recently used jobs' outputs until the tree fits ``max_output_bytes``.
+
+        Without ``rescan`` nothing is scanned while the running usage estimate is under the
+        quota; the periodic sweep rescans to pick up other processes' writes.
+        """
+
+        if self.max_output_bytes <= 0:
+            return []
+        with self._sweep_lock:
+            usage = self.usage_bytes
+            if not rescan and usage is not None and usage <= self.max_output_bytes:
+                return []
+            groups, total = self._scan_outputs()
+            evicted = []
+            for _, size, stem, paths in sorted(groups, key=lambda group: group[0]):
+                if total <= self.max_output_bytes:
+                    break
+                for path in paths:
+                    self.delete_file(path)
+                total -= size
+                evicted.append(stem)
+            with self._lock:
+                self._usage_bytes = total
+        if evicted:
+            logger.info("Output quota evicted %d jobs", len(evicted))
+        return evicted
+
+    def _published(self, path: Path) -> None:
+        """Called once a file is committed under ``output_dir``."""
+
+        try:
+            self._count(path.stat().st_size)
+        except OSError:
+            pass
+
+    def _count(self, delta: int) -> None:
+        with self._lock:
+            if self._usage_bytes is not None:
+                self._usage_bytes = max(self._usage_bytes + delta, 0)
+
+    def _scan_outputs(self) -> Tuple[List[Tuple[float, int, str, List[Path]]], int]:
+        """Outputs grouped per job as ``(last used, bytes, stem, paths)``, and the tree's total bytes."""
+
+        now = time.time()
+        groups: Dict[Tuple[str, str], Tuple[float, int, List[Path]]] = {}
+        total = 0
+        for directory, _, names in os.walk(self.output_dir):
+            for name in names:
+                path = Path(directory, name)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if name.endswith(PART_SUFFIX):
+                    if now - stat.st_mtime > STALE_PART_SECONDS:
+                        self.delete_file(path)
+                    else:
+                        total += stat.st_size
+                    continue
+                total += stat.st_size
+                stem = artifact_stem(name)
+                last_used, size, paths = groups.get((directory, stem), (0.0, 0, []))
+                paths.append(path)
+                groups[(directory, stem)] = (
+                    max(last_used, stat.st_atime, stat.st_mtime),
+                    size + stat.st_size,
+                    paths,
+                )
+        return [(last_used, size, stem, paths) for (_, stem), (last_used, size, paths) in groups.items()], total
+
+
+def build_storage(settings: Settings) -> Storage:
+    max_output_bytes = settings.output_max_mb * 1024 * 1024
+    if settings.storage_backend == "s3":
+        from app.storage.s3 import S3Storage
+
+        return S3Storage(
+            settings.upload_dir,
+            settings.output_dir,
+            bucket=settings.s3_bucket,
+            prefix=settings.s3_prefix,
+            endpoint_url=settings.s3_endpoint_url,
+            region=settings.s3_region,
+            max_output_bytes=max_output_bytes,
+        )
+    return LocalStorage(settings.upload_dir, settings.output_dir, max_output_bytes=max_output_bytes)
+
+
+def _compress(encoding: str, data: bytes) -> Optional[bytes]:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if encoding == "br":
+        try:
+            import brotli  # type: ignore[import-not-found]
+        except ImportError:
+            return None
+        return brotli.compress(data, quality=9)
+    return None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional
+
+from app.storage.base import PART_SUFFIX, shard_path
+from app.storage.local import LocalStorage
+from app.utils.http_files import ENCODING_SUFFIXES
+
+# Object metadata key holding the source mtime, so a refilled cache keeps the same validators.
+MTIME_METADATA = "mtime-ns"
+MISSING_CODES = ("NoSuchKey", "404", "NotFound")
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class S3Storage(LocalStorage):
+    """Outputs in an S3-compatible bucket, with ``output_dir`` as a local read-through cache.
+
+    Every committed output is uploaded under ``prefix`` plus its shard path; reads fetch a
+    missing output (and its pre-compressed variants) into the cache first. The disk quota only
+    evicts cache copies, so nothing is lost for good. ``endpoint_url`` points at MinIO or any
+    other S3 stand-in; ``client`` injects a ready boto3-style client instead of creating one.
+    """
+
+    def __init__(
+        self,
+        upload_dir: str,
+        output_dir: str,
+        *,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str = "",
+        region: str = "",
+        max_output_bytes: int = 0,
+        client: Any = None,
+    ) -> None:
+        super().__init__(upload_dir, output_dir, max_output_bytes=max_output_bytes)
+        if client is None:
+            import boto3  # type: ignore[import-not-found]
+
+            client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region or None)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+
+    def resolve_output_path(self, filename: str) -> Path:
+        path = shard_path(self.output_dir, filename)
+        if not path.exists() and self._fetch(path):
+            for _, suffix in ENCODING_SUFFIXES:
+                self._fetch(path.with_name(path.name + suffix))
+        return path
+
+    def delete_output(self, filename: str) -> None:
+        super().delete_output(filename)
+        for name in [filename, *(filename + suffix for _, suffix in ENCODING_SUFFIXES)]:
+            self.client.delete_object(Bucket=self.bucket, Key=self._key(name))
+
+    def enforce_quota(self, *, rescan: bool = False) -> List[str]:
+        super().enforce_quota(rescan=rescan)
+        return []
+
+    def _published(self, path: Path) -> None:
+        super()._published(path)
+        self.client.upload_file(
+            str(path),
+            self.bucket,
+            self._key(path.name),
+            ExtraArgs={"Metadata": {MTIME_METADATA: str(path.stat().st_mtime_ns)}},
+        )
+
+    def _fetch(self, path: Path) -> bool:
+        """Download the object behind ``path`` into the cache; False when the bucket lacks it."""
+
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(path.name))
+        except Exception as exc:  # pylint: disable=broad-except
+            # botocore raises ``ClientError`` with the S3 error code in ``response``.
+            if _error_code(exc) in MISSING_CODES:
+                return False
+            raise
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}{PART_SUFFIX}")
+        with tmp_path.open("wb") as handle:
+            shutil.copyfileobj(response["Body"], handle, COPY_CHUNK_BYTES)
+        mtime_ns = (response.get("Metadata") or {}).get(MTIME_METADATA)
+        if mtime_ns:
+            os.utime(tmp_path, ns=(time.time_ns(), int(mtime_ns)))
+        os.replace(tmp_path, path)
+        self._count(path.stat().st_size)
+        return True
+
+    def _key(self, filename: str) -> str:
+        return self.prefix + shard_path(Path(), filename).as_posix()
+
+
+def _error_code(exc: Exception) -> Optional[str]:
+    response = getattr(exc, "response", None) or {}
+    return str(response.get("Error", {}).get("Code", "")) or None
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Sequence
+
+from fastapi import HTTPException
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing re-raises it instead of reporting a 400.
+    def __init__(self) -> None:
+        super().__init__(status_code=413, detail="FILE_TOO_LARGE")
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware that answers 413 as soon as a request body passes ``max_bytes``.
+
+    Starlette spools a whole multipart body before the endpoint runs, so the limit has to be
+    enforced while the body is received: declared ``Content-Length`` values are rejected up
+    front and chunked bodies are counted as they arrive.
+    """
+
+    def __init__(self, app: Any, *, max_bytes: int, methods: Sequence[str] = ("POST", "PUT")) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+        self.methods = tuple(methods)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+        headers: Dict[bytes, bytes] = dict(scope.get("headers") or [])
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except _BodyTooLarge:
+            if started:
+                raise
+            await self._reject(send)
+
+    @staticmethod
+    async def _reject(send: Send) -> None:
+        body = json.dumps({"detail": "FILE_TOO_LARGE"}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"connection", b"close"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
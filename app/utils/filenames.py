@@ -20,16 +20,18 @@ def build_upload_filename(job_id: str, suffix: str) -> str:
     return f"{job_id}{suffix}"
 
 
-def build_output_filename(original_name: str, mode: OutputMode) -> str:
+def build_output_filename(original_name: str, mode: OutputMode, job_id: str) -> str:
+    # The suffix of the first 8 job id hex digits keeps same-named uploads finishing in the same
+    # second apart.
     safe_stem = sanitize_stem(original_name)
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    return f"{safe_stem}_{timestamp}.{mode.value}"
+    return f"{safe_stem}_{timestamp}_{job_id.replace('-', '')[:8]}.{mode.value}"
 
 
 def format_timestamp(seconds: float) -> str:
-    milliseconds = int((seconds - int(seconds)) * 1000)
-    total_seconds = int(seconds)
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
+    # Round to the nearest millisecond; truncating the fraction turned 1.001 into 1.000.
+    total_ms = max(0, round(seconds * 1000))
+    hours, rest = divmod(total_ms, 3_600_000)
+    minutes, rest = divmod(rest, 60_000)
+    secs, milliseconds = divmod(rest, 1000)
     return f"{hours:02}:{minutes:02}:{secs:02},{milliseconds:03}"
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import os
+import re
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Pre-compressed variants sit next to the original as ``<name><suffix>``, in preference order.
+ENCODING_SUFFIXES: Sequence[Tuple[str, str]] = (("br", ".br"), ("gzip", ".gz"))
+
+RANGE_CHUNK_BYTES = 64 * 1024
+
+
+def build_etag(stat: os.stat_result, encoding: Optional[str] = None) -> str:
+    tag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def is_not_modified(headers: Mapping[str, str], etag: str, stat: os.stat_result) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [item.strip() for item in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(stat.st_mtime) <= since
+    return False
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Return the encodings from ``ENCODING_SUFFIXES`` the client accepts, most preferred first."""
+
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.replace(" ", "")
+        if quality.startswith("q=") and _as_float(quality[2:]) <= 0:
+            continue
+        accepted.add(name.strip().lower())
+    return [encoding for encoding, _ in ENCODING_SUFFIXES if encoding in accepted or "*" in accepted]
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into an inclusive ``(start, end)``.
+
+    Returns ``None`` for absent or multi-range headers (answered with the full body) and
+    raises ``ValueError`` when the range cannot be satisfied.
+    """
+
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if size == 0:
+        raise ValueError("Empty representation has no satisfiable range")  # e.g. a silent clip
+    if not first:
+        if int(last) == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def build_file_response(
+    request: Request,
+    path: Path,
+    stat: os.stat_result,
+    *,
+    media_type: str,
+    filename: str,
+) -> Response:
+    """Serve ``path`` with validators, conditional 304s, single byte ranges and pre-compressed variants.
+
+    Full bodies go through ``FileResponse`` so servers offering the zero-copy send extension
+    use ``sendfile``. Range requests are always answered from the identity encoding.
+    """
+
+    headers = request.headers
+    range_header = headers.get("range")
+    encoding: Optional[str] = None
+    if not range_header:
+        for candidate in accepted_encodings(headers.get("accept-encoding", "")):
+            variant = path.with_name(path.name + dict(ENCODING_SUFFIXES)[candidate])
+            try:
+                stat = variant.stat()
+            except OSError:
+                continue
+            path, encoding = variant, candidate
+            break
+
+    etag = build_etag(stat, encoding)
+    common = {
+        "etag": etag,
+        "last-modified": formatdate(stat.st_mtime, usegmt=True),
+        "accept-ranges": "bytes",
+        "cache-control": "private, no-cache",
+        "vary": "Accept-Encoding",
+    }
+    if is_not_modified(headers, etag, stat):
+        return Response(status_code=304, headers=common)
+
+    if_range = headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            return Response(status_code=416, headers={**common, "content-range": f"bytes */{stat.st_size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            partial = {
+                **common,
+                "content-range": f"bytes {start}-{end}/{stat.st_size}",
+                "content-length": str(end - start + 1),
+                "content-disposition": f'attachment; filename="{filename}"',
+            }
+            return StreamingResponse(
+                _iter_file_range(path, start, end), status_code=206, media_type=media_type, headers=partial
+            )
+
+    if encoding:
+        common["content-encoding"] = encoding
+    return FileResponse(path, media_type=media_type, filename=filename, headers=common, stat_result=stat)
+
+
+def _iter_file_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(RANGE_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _as_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 1.0
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+from typing import Iterator, List, Optional, Sequence
+
+from app.inference.whisper_runner import (
+    AudioInput,
+    DecodeOptions,
+    Segment,
+    TranscriptionResult,
+    TranscriptionStream,
+    Word,
+)
+
+PHRASES = (
+    "the quick brown fox jumps over the lazy dog",
+    "we will review the quarterly numbers next week",
+    "please remember to update the shared calendar",
+    "the meeting is adjourned until further notice",
+)
+
+
+class FakeWhisperRunner:
+    """Deterministic stand-in for ``WhisperRunner`` that needs no model or audio decoding.
+
+    Every call yields ``segments`` segments of ``segment_seconds`` each, cycling through
+    ``PHRASES``, and sleeps ``latency_ms`` in total spread evenly across the segments so the
+    streaming write path sees realistic pacing.
+    """
+
+    def __init__(
+        self,
+        model_size: str,
+        *,
+        segments: int = 20,
+        segment_seconds: float = 3.0,
+        latency_ms: float = 0.0,
+        compute_type: Optional[str] = None,
+        beam_size: int = 5,
+        language: Optional[str] = "en",
+    ) -> None:
+        self.model_size = model_size
+        self.beam_size = beam_size
+        self.language = language
+        self.device = "cpu"
+        self.compute_type = compute_type or "int8"
+        self.segments = segments
+        self.segment_seconds = segment_seconds
+        self.latency_ms = latency_ms
+
+    @property
+    def default_options(self) -> DecodeOptions:
+        return DecodeOptions(beam_size=self.beam_size, language=self.language)
+
+    def resolve_options(self, options: Optional[DecodeOptions]) -> DecodeOptions:
+        return options or self.default_options
+
+    def run(
+        self, audio_path: AudioInput, *, word_timestamps: bool = False, options: Optional[DecodeOptions] = None
+    ) -> TranscriptionResult:
+        stream = self.stream(audio_path, word_timestamps=word_timestamps, options=options)
+        return TranscriptionResult(
+            segments=list(stream.segments),
+            language=stream.language,
+            language_probability=stream.language_probability,
+            duration_seconds=stream.duration_seconds,
+        )
+
+    def stream(
+        self, audio_path: AudioInput, *, word_timestamps: bool = False, options: Optional[DecodeOptions] = None
+    ) -> TranscriptionStream:
+        return TranscriptionStream(
+            segments=self._generate(word_timestamps),
+            language=self.resolve_options(options).language or "en",
+            language_probability=1.0,
+            duration_seconds=self.segments * self.segment_seconds,
+        )
+
+    def run_batch(
+        self, audios: Sequence[AudioInput], *, options: Optional[DecodeOptions] = None
+    ) -> List[TranscriptionResult]:
+        return [self.run(audio, options=options) for audio in audios]
+
+    def _generate(self, word_timestamps: bool) -> Iterator[Segment]:
+        delay = self.latency_ms / 1000 / self.segments if self.segments else 0.0
+        for index in range(self.segments):
+            if delay:
+                time.sleep(delay)
+            yield build_segment(index, self.segment_seconds, word_timestamps)
+
+
+def build_segment(index: int, segment_seconds: float, word_timestamps: bool = False) -> Segment:
+    start = index * segment_seconds
+    text = PHRASES[index % len(PHRASES)]
+    words = None
+    if word_timestamps:
+        tokens = text.split()
+        step = segment_seconds / len(tokens)
+        words = [
+            Word(start=start + i * step, end=start + (i + 1) * step, word=f" {token}", probability=0.9)
+            for i, token in enumerate(tokens)
+        ]
+    return Segment(start=start, end=start + segment_seconds, text=f" {text}", words=words)
+
+
+def build_result(segments: int, segment_seconds: float = 3.0) -> TranscriptionResult:
+    return TranscriptionResult(
+        segments=[build_segment(index, segment_seconds) for index in range(segments)],
+        language="en",
+        language_probability=1.0,
+        duration_seconds=segments * segment_seconds,
+    )
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import io
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from benchmarks.fake_runner import FakeWhisperRunner
+from benchmarks.report import percentiles
+
+TERMINAL = ("completed", "failed")
+
+
+def make_wav(seconds: float, seed: int, sample_rate: int = 16000) -> bytes:
+    """Deterministic low-level noise; the seed keeps uploads distinct so the cache cannot serve them."""
+
+    rng = random.Random(seed)
+    frames = b"".join(struct.pack("<h", rng.randint(-256, 256)) for _ in range(int(seconds * sample_rate)))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(frames)
+    return buffer.getvalue()
+
+
+def run_load(
+    *,
+    jobs: int = 200,
+    concurrency: int = 16,
+    segments: int = 50,
+    latency_ms: float = 200.0,
+    inference_workers: int = 4,
+    job_store_backend: str = "memory",
+    poll_interval: float = 0.05,
+    status_wait: float = 0.0,
+    mode: str = "srt",
+    audio_seconds: float = 1.0,
+) -> Dict[str, Any]:
+    """Drive the FastAPI app end to end: upload, poll status until terminal, download.
+
+    With ``status_wait`` the clients long-poll (``?wait=``) instead of polling every ``poll_interval``.
+
+    The app runs in-process behind Starlette's ``TestClient`` with ``FakeWhisperRunner`` as
+    the model, so the numbers reflect the service, store, storage and formatter overhead.
+    """
+
+    from fastapi.testclient import TestClient
+
+    with tempfile.TemporaryDirectory() as root:
+        os.environ.update(
+            {
+                "UPLOAD_DIR": f"{root}/uploads",
+                "OUTPUT_DIR": f"{root}/outputs",
+                "CACHE_DIR": f"{root}/cache",
+                "JOB_STORE_PATH": f"{root}/jobs.db",
+                "SEARCH_INDEX_PATH": f"{root}/search.db",
+                "JOB_STORE_BACKEND": job_store_backend,
+                "BROKER_BACKEND": "none",
+                "INFERENCE_WORKERS": str(inference_workers),
+                "MAX_QUEUE_SIZE": str(max(jobs, 1)),
+                "DECODE_WORKERS": "0",
+                "BATCH_MAX_SIZE": "1",
+                "LONG_AUDIO_WORKERS": "0",
+                "WARMUP_MODELS": "",
+            }
+        )
+        from app.config import get_settings
+
+        get_settings.cache_clear()
+        from app.main import create_app
+
+        def factory(model_size: str, compute_type: Any) -> FakeWhisperRunner:
+            return FakeWhisperRunner(model_size, segments=segments, latency_ms=latency_ms, compute_type=compute_type)
+
+        app = create_app(runner_factory=factory)
+        prefix = get_settings().api_prefix
+        payloads = [make_wav(audio_seconds, seed) for seed in range(jobs)]
+        samples: Dict[str, List[float]] = {"upload": [], "status": [], "download": [], "job": []}
+        failures = {"upload": 0, "job": 0, "download": 0}
+        lock = threading.Lock()
+
+        def record(kind: str, value: float) -> None:
+            with lock:
+                samples[kind].append(value)
+
+        def fail(kind: str) -> None:
+            with lock:
+                failures[kind] += 1
+
+        with TestClient(app) as client:
+
+            def one(index: int) -> None:
+                job_started = time.perf_counter()
+                response = client.post(
+                    f"{prefix}/transcribe",
+                    files={"file": (f"bench-{index}.wav", payloads[index], "audio/wav")},
+                    data={"mode": mode},
+                )
+                record("upload", time.perf_counter() - job_started)
+                if response.status_code != 202:
+                    fail("upload")
+                    return
+                transcription_id = response.json()["transcription_id"]
+                while True:
+                    started = time.perf_counter()
+                    params = {"wait": status_wait} if status_wait else None
+                    body = client.get(f"{prefix}/status/{transcription_id}", params=params).json()
+                    record("status", time.perf_counter() - started)
+                    if body["status"] in TERMINAL:
+                        break
+                    if not status_wait:
+                        time.sleep(poll_interval)
+                if body["status"] != "completed":
+                    fail("job")
+                    return
+                started = time.perf_counter()
+                download = client.get(body["download_url"])
+                record("download", time.perf_counter() - started)
+                if download.status_code != 200:
+                    fail("download")
+                record("job", time.perf_counter() - job_started)
+
+            wall_started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(one, range(jobs)))
+            wall = time.perf_counter() - wall_started
+
+    completed = len(samples["job"])
+    return {
+        "config": {
+            "jobs": jobs,
+            "concurrency": concurrency,
+            "segments": segments,
+            "latency_ms": latency_ms,
+            "inference_workers": inference_workers,
+            "job_store_backend": job_store_backend,
+            "mode": mode,
+            "status_wait": status_wait,
+        },
+        "wall_seconds": wall,
+        "status_requests": len(samples["status"]),
+        "jobs_per_second": completed / wall if wall else 0.0,
+        "completed": completed,
+        "failures": failures,
+        "latency": {kind: percentiles(values) for kind, values in samples.items()},
+    }
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+from app.schemas import OutputMode
+from app.services import formatters
+from app.services.job_store import JobRecord, JobStore
+from app.services.transcriber import TranscriberService
+from app.storage.local import LocalStorage
+from app.utils.filenames import format_timestamp
+from benchmarks.fake_runner import build_result
+
+
+def measure(func: Callable[[], Any], *, repeat: int, operations: int = 1) -> Dict[str, float]:
+    """Time ``func`` ``repeat`` times; ``operations`` is how many units one call processes."""
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "best_s": best,
+        "median_s": statistics.median(timings),
+        "ops_per_s": operations / best if best else 0.0,
+    }
+
+
+def run_micro(*, segments: int = 100_000, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    result = build_result(segments)
+    stamps = [index * 1.237 for index in range(segments)]
+    results: Dict[str, Dict[str, float]] = {
+        "format_timestamp": measure(
+            lambda: [format_timestamp(value) for value in stamps], repeat=repeat, operations=segments
+        ),
+        "segments_to_srt": measure(
+            lambda: TranscriberService._segments_to_srt(result),  # pylint: disable=protected-access
+            repeat=repeat,
+            operations=segments,
+        ),
+        "segments_to_text": measure(
+            lambda: TranscriberService._segments_to_text(result),  # pylint: disable=protected-access
+            repeat=repeat,
+            operations=segments,
+        ),
+    }
+    for fmt in ("vtt", "tsv", "json"):
+        results[f"segments_to_{fmt}"] = measure(
+            lambda fmt=fmt: formatters.RENDERERS[fmt](result), repeat=repeat, operations=segments
+        )
+
+    jobs = min(segments, 10_000)
+
+    def job_store_cycle() -> None:
+        store = JobStore()
+        for index in range(jobs):
+            job_id = f"job-{index}"
+            store.create(
+                JobRecord(
+                    transcription_id=job_id,
+                    status="queued",
+                    input_filename="bench.wav",
+                    output_type=OutputMode.txt,
+                    model_size="bench",
+                )
+            )
+            store.update(job_id, status="completed", output_filename=f"bench-{index}.txt")
+            store.get(job_id)
+            store.find_by_output_filename(f"bench-{index}.txt")
+
+    results["job_store_cycle"] = measure(job_store_cycle, repeat=repeat, operations=jobs)
+
+    srt = formatters.segments_to_srt(result)
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalStorage(f"{root}/uploads", f"{root}/outputs")
+        results["write_output_srt"] = measure(
+            lambda: storage.write_output("bench.srt", srt), repeat=repeat, operations=segments
+        )
+
+        def write_transcript_srt() -> None:
+            with storage.open_output("streamed.srt") as handle:
+                formatters.write_transcript(handle, "srt", result)
+
+        results["write_transcript_srt"] = measure(write_transcript_srt, repeat=repeat, operations=segments)
+    return results
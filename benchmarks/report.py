@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """Summarize latencies in seconds as milliseconds (nearest-rank percentiles)."""
+
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": rank(0.50),
+        "p95_ms": rank(0.95),
+        "p99_ms": rank(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def peak_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def write_report(path: str, report: Dict[str, Any]) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Describe the relative change of every numeric metric present in both reports."""
+
+    lines = []
+    for key, before, after in _numeric_pairs(baseline, current, ""):
+        if before:
+            lines.append(f"{key}: {before:.3f} -> {after:.3f} ({(after - before) / before * 100:+.1f}%)")
+    return lines
+
+
+def _numeric_pairs(before: Any, after: Any, prefix: str) -> Iterable[tuple]:
+    if isinstance(before, dict) and isinstance(after, dict):
+        for key in sorted(set(before) & set(after)):
+            if key in ("environment", "config"):
+                continue
+            yield from _numeric_pairs(before[key], after[key], f"{prefix}{key}.")
+    elif isinstance(before, (int, float)) and isinstance(after, (int, float)) and not isinstance(before, bool):
+        yield prefix.rstrip("."), float(before), float(after)
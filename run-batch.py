@@ -0,0 +1,50 @@
+import argparse
+import logging
+import sys
+
+from app.services.batch import RENDERERS, BatchTranscriber, discover_audio
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe directories or globs of audio files in parallel.")
+    parser.add_argument("inputs", nargs="+", help="Audio files, directories (searched recursively) or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="output-batch", help="Where transcripts and the manifest go")
+    parser.add_argument("-f", "--formats", default="txt,srt", help=f"Comma-separated subset of {','.join(RENDERERS)}")
+    parser.add_argument("-m", "--model", default="medium", help="Whisper model size")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Parallel model processes")
+    parser.add_argument("--compute-type", default=None, help="CTranslate2 compute type (default: per device)")
+    parser.add_argument("--beam-size", type=int, default=5)
+    parser.add_argument("--language", default=None, help="Language hint; skips detection")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    files = discover_audio(args.inputs)
+    if not files:
+        print("No audio files found.")
+        return 1
+
+    batch = BatchTranscriber(
+        output_dir=args.output_dir,
+        model_size=args.model,
+        workers=args.workers,
+        formats=[fmt.strip() for fmt in args.formats.split(",") if fmt.strip()],
+        compute_type=args.compute_type,
+        beam_size=args.beam_size,
+        language=args.language,
+    )
+    stats = batch.run(files)
+
+    print(f"Transcribed: {stats.files}  Skipped (already done): {stats.skipped}  Failed: {stats.failed}")
+    print(f"Audio: {stats.audio_seconds:.1f}s  Wall: {stats.wall_seconds:.1f}s  "
+          f"Throughput: {stats.realtime_factor:.2f} audio-seconds per wall-second")
+    for failure in stats.failures:
+        print(f"  failed: {failure}")
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import argparse
+import json
+import logging
+import sys
+
+from benchmarks.report import compare, environment, peak_rss_mb, write_report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the transcription pipeline with a deterministic fake model.")
+    parser.add_argument("--suite", default="load,micro", help="Comma-separated subset of load,micro")
+    parser.add_argument("-o", "--output", default="benchmarks/results/latest.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", default=None, help="Earlier report to diff against")
+    parser.add_argument("--jobs", type=int, default=200, help="Load test: jobs to submit")
+    parser.add_argument("--concurrency", type=int, default=16, help="Load test: concurrent clients")
+    parser.add_argument("--segments", type=int, default=50, help="Load test: segments per fake transcript")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Load test: fake inference time per job")
+    parser.add_argument("--inference-workers", type=int, default=4)
+    parser.add_argument("--job-store", default="memory", choices=["memory", "sqlite"])
+    parser.add_argument("--mode", default="srt", help="Load test: output format requested")
+    parser.add_argument("--status-wait", type=float, default=0.0, help="Load test: long-poll status for this many seconds")
+    parser.add_argument("--micro-segments", type=int, default=100_000, help="Micro: transcript size")
+    parser.add_argument("--repeat", type=int, default=5, help="Micro: repetitions per measurement")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    suites = {item.strip() for item in args.suite.split(",") if item.strip()}
+
+    report = {"environment": environment()}
+    if "micro" in suites:
+        from benchmarks.micro import run_micro
+
+        report["micro"] = run_micro(segments=args.micro_segments, repeat=args.repeat)
+    if "load" in suites:
+        from benchmarks.load import run_load
+
+        report["load"] = run_load(
+            jobs=args.jobs,
+            concurrency=args.concurrency,
+            segments=args.segments,
+            latency_ms=args.latency_ms,
+            inference_workers=args.inference_workers,
+            job_store_backend=args.job_store,
+            mode=args.mode,
+            status_wait=args.status_wait,
+        )
+    report["peak_rss_mb"] = peak_rss_mb()
+    write_report(args.output, report)
+
+    if "load" in report:
+        load = report["load"]
+        job = load["latency"]["job"]
+        print(f"Load: {load['completed']} jobs in {load['wall_seconds']:.1f}s ({load['jobs_per_second']:.1f} jobs/s), "
+              f"job p50/p95/p99 {job.get('p50_ms', 0):.0f}/{job.get('p95_ms', 0):.0f}/{job.get('p99_ms', 0):.0f} ms, "
+              f"{load['status_requests']} status requests")
+    for name, result in report.get("micro", {}).items():
+        print(f"Micro: {name:<20} best {result['best_s'] * 1000:8.1f} ms  ({result['ops_per_s']:,.0f} ops/s)")
+    print(f"Peak RSS: {report['peak_rss_mb']:.1f} MiB  Report: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        for line in compare(baseline, report):
+            print(f"  {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
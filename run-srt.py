@@ -4,6 +4,9 @@ import os
 # Configuration parameters
 audio_path = "audio/thedetail-20240810-0500-the_business_of_tradwives-256.mp3"
 model_size = "medium"
+# Set >1 to split long audio at pauses and transcribe the chunks in parallel processes
+chunk_workers = int(os.getenv("CHUNK_WORKERS", "0"))
+chunk_seconds = 600
 
 # Generate output filename: original filename - transcript.srt
 audio_filename = os.path.splitext(os.path.basename(audio_path))[0]
@@ -11,34 +14,53 @@ output_filename = f"{audio_filename} - transcript.srt"
 output_dir = "output-srt"
 srt_path = os.path.join(output_dir, output_filename)
 
-# Create output directory if it doesn't exist
-os.makedirs(output_dir, exist_ok=True)
-
-# Initialize model
-model = WhisperModel(model_size, device="cuda", compute_type="int8")
-
-# Transcribe audio
-segments, info = model.transcribe(audio_path, beam_size=5)
-
-print("Detected language '%s' with probability %f" % (info.language, info.language_probability))
 
 # Utility function: Convert seconds to SRT timestamp format
 def format_timestamp(seconds):
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    ms = int((seconds - int(seconds)) * 1000)
+    total_ms = max(0, round(seconds * 1000))
+    h, rest = divmod(total_ms, 3600000)
+    m, rest = divmod(rest, 60000)
+    s, ms = divmod(rest, 1000)
     return f"{h:02}:{m:02}:{s:02},{ms:03}"
 
-# Write SRT file
-with open(srt_path, "w", encoding="utf-8") as f:
-    for i, segment in enumerate(segments, start=1):
-        start = format_timestamp(segment.start)
-        end = format_timestamp(segment.end)
-        text = segment.text.strip()
 
-        f.write(f"{i}\n")
-        f.write(f"{start} --> {end}\n")
-        f.write(f"{text}\n\n")
+def main():
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    if chunk_workers > 1:
+        from app.inference.chunked import ChunkedWhisperRunner
+        from app.inference.whisper_runner import WhisperRunner
+
+        runner = ChunkedWhisperRunner(WhisperRunner(model_size), workers=chunk_workers, chunk_seconds=chunk_seconds)
+        stream = runner.stream(audio_path)
+        segments, language, probability = stream.segments, stream.language, stream.language_probability
+    else:
+        # Initialize model
+        model = WhisperModel(model_size, device="cuda", compute_type="int8")
+
+        # Transcribe audio
+        segments, info = model.transcribe(audio_path, beam_size=5)
+        language, probability = info.language, info.language_probability
+
+    print("Detected language '%s' with probability %f" % (language, probability))
+
+    # Write SRT file
+    with open(srt_path, "w", encoding="utf-8") as f:
+        for i, segment in enumerate(segments, start=1):
+            start = format_timestamp(segment.start)
+            end = format_timestamp(segment.end)
+            text = segment.text.strip()
+
+            f.write(f"{i}\n")
+            f.write(f"{start} --> {end}\n")
+            f.write(f"{text}\n\n")
+
+    if chunk_workers > 1:
+        runner.close()
+
+    print(f"SRT subtitle saved to: {srt_path}")
+
 
-print(f"SRT subtitle saved to: {srt_path}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ import os
 # Configuration parameters
 audio_path = "audio/thedetail-20240810-0500-the_business_of_tradwives-256.mp3"
 model_size = "medium"
+# Set >1 to split long audio at pauses and transcribe the chunks in parallel processes
+chunk_workers = int(os.getenv("CHUNK_WORKERS", "0"))
+chunk_seconds = 600
 
 # Generate output filename: original filename - transcript.txt
 audio_filename = os.path.splitext(os.path.basename(audio_path))[0]
@@ -11,20 +14,38 @@ output_filename = f"{audio_filename} - transcript.txt"
 output_dir = "output-text"
 output_path = os.path.join(output_dir, output_filename)
 
-# Create output directory if it doesn't exist
-os.makedirs(output_dir, exist_ok=True)
 
-# Initialize model (using int8 precision to save GPU memory)
-model = WhisperModel(model_size, device="cuda", compute_type="int8")
+def main():
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
 
-# Transcribe audio
-segments, info = model.transcribe(audio_path, beam_size=5)
+    if chunk_workers > 1:
+        from app.inference.chunked import ChunkedWhisperRunner
+        from app.inference.whisper_runner import WhisperRunner
 
-print("Detected language '%s' with probability %f" % (info.language, info.language_probability))
+        runner = ChunkedWhisperRunner(WhisperRunner(model_size), workers=chunk_workers, chunk_seconds=chunk_seconds)
+        stream = runner.stream(audio_path)
+        segments, language, probability = stream.segments, stream.language, stream.language_probability
+    else:
+        # Initialize model (using int8 precision to save GPU memory)
+        model = WhisperModel(model_size, device="cuda", compute_type="int8")
 
-# Save transcription result as .txt file
-with open(output_path, "w", encoding="utf-8") as f:
-    for segment in segments:
-        f.write(f"[{segment.start:.2f} - {segment.end:.2f}] {segment.text}\n")
+        # Transcribe audio
+        segments, info = model.transcribe(audio_path, beam_size=5)
+        language, probability = info.language, info.language_probability
 
-print(f"Transcription saved to: {output_path}")
\ No newline at end of file
+    print("Detected language '%s' with probability %f" % (language, probability))
+
+    # Save transcription result as .txt file
+    with open(output_path, "w", encoding="utf-8") as f:
+        for segment in segments:
+            f.write(f"[{segment.start:.2f} - {segment.end:.2f}] {segment.text}\n")
+
+    if chunk_workers > 1:
+        runner.close()
+
+    print(f"Transcription saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import logging
+
+from app.config import get_settings
+from app.services.worker import InferenceWorker
+
+# Standalone inference worker: claims jobs queued by API nodes through BROKER_BACKEND
+# ("sqlite" for a single host, "redis" for several nodes) and writes transcripts to OUTPUT_DIR.
+# UPLOAD_DIR and OUTPUT_DIR must be shared with the API nodes.
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    InferenceWorker.from_settings(get_settings()).run_forever()
+
+
+if __name__ == "__main__":
+    main()